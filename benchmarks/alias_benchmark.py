@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Times parsing a large synthetic yaml file full of anchors and aliases with jconfigure's loaders, where tags refer to
+the aliases, and with PyYAML's own loaders, as a library in the same process as jconfigure would.
+
+Usage: python -m benchmarks.alias_benchmark [number of top level keys]
+"""
+import io
+import sys
+import timeit
+
+import yaml
+
+from jconfigure.yaml_tags import ContextPassingYamlLoader, ContextPassingCYamlLoader, load_yaml_with_context
+
+
+def generate_yaml(num_keys):
+    lines = []
+
+    for i in range(num_keys):
+        lines.extend([
+            "service_{}:".format(i),
+            "  defaults: &defaults_{}".format(i),
+            "    host: host-{}.example.com".format(i),
+            "    ports: &ports_{} [{}, {}]".format(i, 8000 + i, 9000 + i),
+            "    options: {retries: 3, timeout: 10}",
+            "  primary: *defaults_{}".format(i),
+            "  all_ports: !Chain [*ports_{}, [80, 443]]".format(i),
+            "  url: !StringFormat {{string: \"http://{{host}}\", format_args: *defaults_{}}}".format(i),
+        ])
+
+    return "\n".join(lines)
+
+
+def time_jconfigure(document, loader_class, repeat):
+    context = {"_parsing_filename": "benchmark.yaml"}
+    return min(timeit.repeat(
+        lambda: load_yaml_with_context(io.StringIO(document), context, loader_class),
+        number=1,
+        repeat=repeat,
+    ))
+
+
+def time_pyyaml(document, loader_class, repeat):
+    return min(timeit.repeat(lambda: yaml.load(io.StringIO(document), Loader=loader_class), number=1, repeat=repeat))
+
+
+def main():
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    jconfigure_document = generate_yaml(num_keys)
+    pyyaml_document = "\n".join(l for l in jconfigure_document.splitlines() if "!" not in l)
+    print("Document size: {:.1f} MB".format(len(jconfigure_document) / 1024 / 1024))
+
+    loaders = [
+        ("ContextPassingYamlLoader", time_jconfigure, jconfigure_document, ContextPassingYamlLoader),
+        ("ContextPassingCYamlLoader", time_jconfigure, jconfigure_document, ContextPassingCYamlLoader),
+        ("yaml.Loader", time_pyyaml, pyyaml_document, yaml.Loader),
+        ("yaml.CLoader", time_pyyaml, pyyaml_document, getattr(yaml, "CLoader", None)),
+    ]
+
+    for name, time_loader, document, loader_class in loaders:
+        if loader_class is None:
+            print("libyaml is not available, skipping {}".format(name))
+            continue
+
+        print("{:<26} {:.3f}s".format(name + ":", time_loader(document, loader_class, repeat=3)))
+
+
+if __name__ == "__main__":
+    main()
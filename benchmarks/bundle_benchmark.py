@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Compares building the configuration of a synthetic configuration tree with configure and loading it from a compiled
+bundle with load_bundle, and checks that both return the same configuration.
+
+Usage: python -m benchmarks.bundle_benchmark [generator options]
+"""
+import argparse
+import logging
+import os
+import tempfile
+import timeit
+
+import jconfigure
+
+from .generator import DEFAULT_PARAMETERS, add_generator_arguments, generate_config_tree
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares configure with load_bundle")
+    parser.add_argument("--repeat", type=int, default=10)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    # Keep configure from logging every run
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tree = generate_config_tree(output_dir, **{name: getattr(args, name) for name in DEFAULT_PARAMETERS})
+        bundle_path = os.path.join(output_dir, "config.bundle")
+
+        def run_configure():
+            return jconfigure.configure(
+                configuration_dirs=tree.configuration_dirs,
+                active_profiles=tree.active_profiles,
+                context=tree.context,
+            )
+
+        def run_load_bundle():
+            return jconfigure.load_bundle(bundle_path, context=tree.context)
+
+        jconfigure.compile_bundle(
+            bundle_path,
+            configuration_dirs=tree.configuration_dirs,
+            active_profiles=tree.active_profiles,
+            context=tree.context,
+        )
+
+        if run_configure() != run_load_bundle():
+            raise AssertionError("The bundle holds a different configuration")
+
+        configure_time = min(timeit.repeat(run_configure, number=1, repeat=args.repeat))
+        load_time = min(timeit.repeat(run_load_bundle, number=1, repeat=args.repeat))
+
+        print("configure: {:.4f}s  load_bundle: {:.4f}s ({} bytes)".format(
+            configure_time,
+            load_time,
+            os.path.getsize(bundle_path),
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+"""
+Generates synthetic configuration trees for benchmarking jconfigure.
+
+Usage: python -m benchmarks.generator <output directory> [options]
+"""
+import argparse
+import json
+import os
+import random
+from collections import namedtuple
+
+GeneratedTree = namedtuple("GeneratedTree", ["configuration_dirs", "active_profiles", "config_files", "include_files", "context"])
+
+DEFAULT_PARAMETERS = {
+    "num_files": 12,
+    "num_directories": 2,
+    "num_profiles": 3,
+    "depth": 3,
+    "width": 8,
+    "include_fanout": 2,
+    "tag_density": 0.1,
+    "seed": 0,
+}
+
+_LOGGING_CONFIG = "version: 1\ndisable_existing_loggers: false\n"
+_ENV_VAR_NAME = "_JCONFIGURE_BENCHMARK_VALUE"
+_CONTEXT_KEY = "benchmark_value"
+
+
+def _yaml_scalar(value):
+    return json.dumps(value)
+
+
+def _generate_tag(rng, include_files):
+    """
+    :return: The yaml source of a random tag invocation
+    """
+    choices = [
+        lambda: "!EnvVar {{name: {}, default: fallback}}".format(_ENV_VAR_NAME),
+        lambda: "!ContextValue {{key: {}, default: fallback}}".format(_CONTEXT_KEY),
+        lambda: "!StringFormat [\"{{}}-{{}}\", [a{}, b{}]]".format(rng.randint(0, 99), rng.randint(0, 99)),
+        lambda: "!JoinFilePaths [/etc, app, file{}.conf]".format(rng.randint(0, 99)),
+        lambda: "!Chain [[1, 2], [{}]]".format(rng.randint(0, 99)),
+        lambda: "!JsonString {{object: {{value: {}}}}}".format(rng.randint(0, 99)),
+        lambda: "!YamlString {{object: {{value: {}}}}}".format(rng.randint(0, 99)),
+    ]
+
+    if include_files:
+        choices.append(lambda: _include_tag(rng.choice(include_files)))
+
+    return rng.choice(choices)()
+
+
+def _include_tag(include_file):
+    tag = {".yaml": "!IncludeYaml", ".json": "!IncludeJson", ".txt": "!IncludeText"}[os.path.splitext(include_file)[1]]
+    return "{} ../includes/{}".format(tag, os.path.basename(include_file))
+
+
+def _generate_tree(rng, depth, width):
+    """
+    :return: A random nested dict of plain values. Keys are drawn from a small set, so that trees generated for
+             different files overlap and have to be merged
+    """
+    tree = {}
+
+    for i in rng.sample(range(width * 2), width):
+        key = "key_{}".format(i)
+        choice = rng.random()
+
+        if depth > 0 and choice < 0.3:
+            tree[key] = _generate_tree(rng, depth - 1, width)
+        elif choice < 0.4:
+            tree[key] = [rng.randint(0, 1000) for _ in range(rng.randint(0, 4))]
+        elif choice < 0.7:
+            tree[key] = "value-{}".format(rng.randint(0, 1000))
+        else:
+            tree[key] = rng.randint(0, 1000)
+
+    return tree
+
+
+def _write_yaml_tree(lines, tree, indent, rng, tag_density, include_files):
+    for key, value in tree.items():
+        prefix = "{}{}:".format("  " * indent, key)
+
+        if type(value) is dict and value:
+            lines.append(prefix)
+            _write_yaml_tree(lines, value, indent + 1, rng, tag_density, include_files)
+        elif rng.random() < tag_density:
+            lines.append("{} {}".format(prefix, _generate_tag(rng, include_files)))
+        else:
+            lines.append("{} {}".format(prefix, _yaml_scalar(value)))
+
+
+def _write_file(path, contents):
+    with open(path, "w") as f:
+        f.write(contents)
+
+
+def _generate_include_files(rng, includes_dir, count, depth, width):
+    include_files = []
+
+    for i in range(count):
+        extension = [".yaml", ".json", ".txt"][i % 3]
+        path = os.path.join(includes_dir, "include_{}{}".format(i, extension))
+
+        if extension == ".txt":
+            _write_file(path, "included-text-{}".format(i))
+        elif extension == ".json":
+            _write_file(path, json.dumps(_generate_tree(rng, depth, width)))
+        else:
+            lines = []
+            _write_yaml_tree(lines, _generate_tree(rng, depth, width), 0, rng, 0, [])
+            _write_file(path, "\n".join(lines) + "\n")
+
+        include_files.append(path)
+
+    return include_files
+
+
+def generate_config_tree(
+    output_dir,
+    num_files=DEFAULT_PARAMETERS["num_files"],
+    num_directories=DEFAULT_PARAMETERS["num_directories"],
+    num_profiles=DEFAULT_PARAMETERS["num_profiles"],
+    depth=DEFAULT_PARAMETERS["depth"],
+    width=DEFAULT_PARAMETERS["width"],
+    include_fanout=DEFAULT_PARAMETERS["include_fanout"],
+    tag_density=DEFAULT_PARAMETERS["tag_density"],
+    seed=DEFAULT_PARAMETERS["seed"],
+):
+    """
+    Writes a synthetic configuration tree to output_dir, which is the same for the same arguments
+
+    :param num_files: The number of defaults and profile config files. They are spread over the directories and the
+                      defaults and profile basenames round robin, as a .yaml file and then as a .json file, so at most
+                      2 * num_directories * (num_profiles + 1) files are created
+    :param num_directories: The number of configuration directories
+    :param num_profiles: The number of active profiles
+    :param depth: How deeply the config in each file is nested
+    :param width: The number of keys in each dict
+    :param include_fanout: The number of files each yaml config file includes with !Include* tags
+    :param tag_density: The fraction of the values in yaml config files which are other yaml tags
+    :param seed: The random seed
+    :return: A GeneratedTree, with the arguments to pass to configure and the files that were created
+    """
+    rng = random.Random(seed)
+    active_profiles = ["profile_{}".format(i) for i in range(num_profiles)]
+    basenames = ["defaults", *active_profiles]
+    configuration_dirs = [os.path.join(output_dir, "config_{}".format(i)) for i in range(num_directories)]
+    includes_dir = os.path.join(output_dir, "includes")
+
+    for directory in [*configuration_dirs, includes_dir]:
+        os.makedirs(directory, exist_ok=True)
+
+    _write_file(os.path.join(configuration_dirs[0], "logging.yaml"), _LOGGING_CONFIG)
+
+    include_files = _generate_include_files(rng, includes_dir, max(include_fanout * 3, 3), depth, width)
+
+    config_files = []
+    num_files = min(num_files, 2 * num_directories * len(basenames))
+
+    for i in range(num_files):
+        directory = configuration_dirs[i % num_directories]
+        basename = basenames[(i // num_directories) % len(basenames)]
+        extension = ".yaml" if i < num_directories * len(basenames) else ".json"
+        path = os.path.join(directory, "{}{}".format(basename, extension))
+        tree = _generate_tree(rng, depth, width)
+
+        if extension == ".json":
+            _write_file(path, json.dumps(tree, indent=2))
+        else:
+            lines = []
+            _write_yaml_tree(lines, tree, 0, rng, tag_density, include_files)
+            lines.extend(
+                "included_{}: {}".format(j, _include_tag(f))
+                for j, f in enumerate(rng.sample(include_files, min(include_fanout, len(include_files))))
+            )
+            _write_file(path, "\n".join(lines) + "\n")
+
+        config_files.append(path)
+
+    return GeneratedTree(
+        configuration_dirs=configuration_dirs,
+        active_profiles=active_profiles,
+        config_files=config_files,
+        include_files=include_files,
+        context={_CONTEXT_KEY: "from-context"},
+    )
+
+
+def add_generator_arguments(parser):
+    for name, default in DEFAULT_PARAMETERS.items():
+        parser.add_argument("--{}".format(name.replace("_", "-")), dest=name, type=type(default), default=default)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates a synthetic configuration tree")
+    parser.add_argument("output_dir")
+    add_generator_arguments(parser)
+    args = vars(parser.parse_args())
+
+    tree = generate_config_tree(**args)
+    print("Generated {} config files and {} included files".format(len(tree.config_files), len(tree.include_files)))
+    print("JCONFIGURE_CONFIG_DIRECTORIES={}".format(",".join(tree.configuration_dirs)))
+    print("JCONFIGURE_ACTIVE_PROFILES={}".format(",".join(tree.active_profiles)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Compares the retained size and the time of configure on a synthetic configuration tree with and without intern, for
+both mutable and frozen configurations.
+
+Usage: python -m benchmarks.intern_benchmark [generator options]
+"""
+import argparse
+import logging
+import tempfile
+import timeit
+
+import jconfigure
+from jconfigure.memory import deep_getsizeof
+
+from .generator import DEFAULT_PARAMETERS, add_generator_arguments, generate_config_tree
+
+
+def compare(tree, frozen, repeat):
+    for intern in (False, True):
+        def run():
+            return jconfigure.configure(
+                configuration_dirs=tree.configuration_dirs,
+                active_profiles=tree.active_profiles,
+                context=tree.context,
+                frozen=frozen,
+                intern=intern,
+            )
+
+        size = deep_getsizeof(run())
+        duration = min(timeit.repeat(run, number=1, repeat=repeat))
+
+        print("frozen={:<6} intern={:<6} retained: {:>10} bytes  configure: {:.4f}s".format(
+            str(frozen),
+            str(intern),
+            size,
+            duration,
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares configure with and without intern")
+    parser.add_argument("--repeat", type=int, default=5)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    # Keep configure from logging every run
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tree = generate_config_tree(output_dir, **{name: getattr(args, name) for name in DEFAULT_PARAMETERS})
+
+        compare(tree, False, args.repeat)
+        compare(tree, True, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
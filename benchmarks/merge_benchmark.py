@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Compares the recursive merge jconfigure used to have with merge_configurations: merging a first file into an empty
+configuration, merging wide and deep configurations, and merging without aliasing the overrides, which used to
+require a deepcopy of them. merge_configurations is timed both with plain set, as configure merges files which only
+hold plain values, and checking for DeferredValues and other Mappings.
+
+Usage: python -m benchmarks.merge_benchmark
+"""
+import copy
+import gc
+import sys
+import time
+
+from jconfigure.merge import copy_containers, merge_configurations
+
+
+def recursive_merge(base_config, overrides):
+    for k, v in overrides.items():
+        if type(v) is dict and type(base_config.get(k)) is dict:
+            recursive_merge(base_config[k], v)
+        else:
+            base_config[k] = v
+
+
+def generate_wide_config(num_keys, offset):
+    return {
+        "service_{}".format(i): {
+            "host": "host-{}.example.com".format(i + offset),
+            "port": 8000 + i + offset,
+            "enabled": True,
+            "tags": ["a", "b", "c"],
+            "limits": {"cpu": i % 4, "memory": "{}Mi".format(128 * (i % 8 + 1))},
+        }
+        for i in range(num_keys)
+    }
+
+
+def generate_deep_config(depth, offset):
+    config = {"leaf": offset}
+
+    for i in range(depth):
+        config = {"level": config, "value_{}".format(i): i + offset}
+
+    return config
+
+
+def time_merges(merges, base_config, overrides, repeat):
+    """
+    Runs each merge repeat times, taking turns so that the machine getting faster or slower during the benchmark
+    affects every merge equally. The copies are made up front, so only the merges themselves are timed
+
+    :return: The fastest time of each merge, or None for merges which raised a RecursionError
+    """
+    times = [[] for _ in merges]
+
+    for _ in range(repeat):
+        for i, (merge, merge_times) in enumerate(zip(merges, times)):
+            if merge_times is None:
+                continue
+
+            base, over = copy_containers(base_config), copy_containers(overrides)
+            start = time.perf_counter()
+
+            try:
+                merge(base, over)
+            except RecursionError:
+                times[i] = None
+                continue
+
+            merge_times.append(time.perf_counter() - start)
+
+    return [min(merge_times) if merge_times is not None else None for merge_times in times]
+
+
+def compare(name, base_config, overrides, repeat=25, copy_overrides=False):
+    if copy_overrides:
+        def old_merge(base, over):
+            recursive_merge(base, copy.deepcopy(over))
+    else:
+        old_merge = recursive_merge
+
+    def plain_merge(base, over):
+        merge_configurations(base, over, copy_overrides=copy_overrides, plain=True)
+
+    def checked_merge(base, over):
+        merge_configurations(base, over, copy_overrides=copy_overrides)
+
+    gc.disable()
+
+    try:
+        old_time, plain_time, checked_time = time_merges(
+            [old_merge, plain_merge, checked_merge],
+            base_config,
+            overrides,
+            repeat,
+        )
+    finally:
+        gc.enable()
+
+    old_result = "{:.4f}s".format(old_time) if old_time is not None else "RecursionError"
+    print("{:<8} recursive merge: {:<16} plain: {:.4f}s    checked: {:.4f}s".format(
+        name,
+        old_result,
+        plain_time,
+        checked_time,
+    ))
+
+
+def main():
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    wide_base, wide_overrides = generate_wide_config(num_keys, 0), generate_wide_config(num_keys, 1)
+
+    compare("first", {}, wide_overrides)
+    compare("wide", wide_base, wide_overrides)
+    compare("copying", wide_base, wide_overrides, copy_overrides=True)
+    compare("deep", generate_deep_config(500, 0), generate_deep_config(500, 1), repeat=200)
+
+    # Deeper than the recursion limit
+    depth = sys.getrecursionlimit() * 2
+    compare("deeper", generate_deep_config(depth, 0), generate_deep_config(depth, 1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Compares configure with and without streaming on a synthetic configuration tree: the peak memory traced by tracemalloc
+while building the configuration, and the time it takes. Both are checked to build the same configuration.
+
+Usage: python -m benchmarks.streaming_benchmark [generator options]
+"""
+import argparse
+import logging
+import tempfile
+import timeit
+import tracemalloc
+
+import jconfigure
+
+from .generator import DEFAULT_PARAMETERS, add_generator_arguments, generate_config_tree
+
+
+def measure_peak(run):
+    tracemalloc.start()
+
+    try:
+        config = run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return config, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compares configure with and without streaming")
+    parser.add_argument("--repeat", type=int, default=5)
+    add_generator_arguments(parser)
+    parser.set_defaults(depth=4, width=12, tag_density=0)
+    args = parser.parse_args()
+
+    # Keep configure from logging every run
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tree = generate_config_tree(output_dir, **{name: getattr(args, name) for name in DEFAULT_PARAMETERS})
+        configs = []
+
+        for streaming in (False, True):
+            def run():
+                return jconfigure.configure(
+                    configuration_dirs=tree.configuration_dirs,
+                    active_profiles=tree.active_profiles,
+                    context=tree.context,
+                    streaming=streaming,
+                )
+
+            config, peak = measure_peak(run)
+            configs.append(config)
+            duration = min(timeit.repeat(run, number=1, repeat=args.repeat))
+
+            print("streaming={:<6} peak: {:>10} bytes  configure: {:.4f}s".format(str(streaming), peak, duration))
+
+    if configs[0] != configs[1]:
+        raise AssertionError("Streaming built a different configuration")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""
+Benchmarks configure, the file parsers, every yaml tag and the merge on a synthetic configuration tree, and writes the
+results as JSON. Passing the results of an earlier run with --baseline reports every benchmark which got slower by
+more than --threshold, and exits with status 1 if there are any.
+
+Usage: python -m benchmarks.suite [--output results.json] [--baseline baseline.json] [generator options]
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import jconfigure
+from jconfigure.parsers import JsonConfigFileParser, YamlConfigFileParser
+from jconfigure.utils import merge_configuration_from_dict_root
+from jconfigure.yaml_tags import (
+    Chain,
+    ContextValue,
+    EnvVar,
+    IncludeJson,
+    IncludeText,
+    IncludeYaml,
+    JoinFilePaths,
+    JsonString,
+    StringFormat,
+    Timestamp,
+    YamlString,
+    load_yaml_with_context,
+)
+
+from .generator import DEFAULT_PARAMETERS, add_generator_arguments, generate_config_tree
+
+RESULTS_FORMAT_VERSION = 1
+
+# The yaml source of one invocation of each tag, relative to a file in a configuration directory of the tree
+TAG_SOURCES = {
+    Chain: "!Chain [[1, 2], [3, 4]]",
+    ContextValue: "!ContextValue {key: benchmark_value, default: fallback}",
+    EnvVar: "!EnvVar {name: _JCONFIGURE_BENCHMARK_VALUE, default: fallback}",
+    IncludeJson: "!IncludeJson ../includes/include_1.json",
+    IncludeText: "!IncludeText ../includes/include_2.txt",
+    IncludeYaml: "!IncludeYaml ../includes/include_0.yaml",
+    JoinFilePaths: "!JoinFilePaths [/etc, app, file.conf]",
+    JsonString: "!JsonString {object: {value: 1}}",
+    StringFormat: "!StringFormat [\"{}-{}\", [a, b]]",
+    Timestamp: "!Timestamp {format: \"%Y-%m-%d\"}",
+    YamlString: "!YamlString {object: {value: 1}}",
+}
+TAG_INVOCATIONS = 200
+
+
+def _summarize(timings, operations):
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "repeat": len(timings),
+        "operations": operations,
+    }
+
+
+def _time(function, repeat, setup=None):
+    """
+    Times function, after running setup outside of the timing if passed, once for each of repeat runs
+    """
+    timings = []
+
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        function(argument)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def benchmark_configure(tree, repeat):
+    def run(_):
+        jconfigure.configure(
+            configuration_dirs=tree.configuration_dirs,
+            active_profiles=tree.active_profiles,
+            context=tree.context,
+        )
+
+    return _summarize(_time(run, repeat), len(tree.config_files))
+
+
+def benchmark_parser(parser, files, context, repeat):
+    def run(_):
+        for f in files:
+            parser.parse(f, context)
+
+    return _summarize(_time(run, repeat), len(files))
+
+
+def benchmark_tag(tag_class, source, tree, repeat):
+    document = "\n".join("value_{}: {}".format(i, source) for i in range(TAG_INVOCATIONS))
+    context = {
+        **tree.context,
+        "_parsing_filename": os.path.join(tree.configuration_dirs[0], "tags.yaml"),
+    }
+
+    def run(_):
+        load_yaml_with_context(io.StringIO(document), context)
+
+    return _summarize(_time(run, repeat), TAG_INVOCATIONS)
+
+
+def benchmark_merge(tree, repeat):
+    files = sorted(tree.config_files, key=lambda f: (f.endswith(".yaml"), f))
+    context = dict(tree.context)
+
+    def setup():
+        return [
+            (YamlConfigFileParser if f.endswith(".yaml") else JsonConfigFileParser).parse(f, context)
+            for f in files
+        ]
+
+    def run(parsed_files):
+        base_config = {}
+        for parsed_file in parsed_files:
+            merge_configuration_from_dict_root(base_config, parsed_file)
+
+    return _summarize(_time(run, repeat, setup), len(files))
+
+
+def run_suite(tree, repeat):
+    """
+    :return: The results of every benchmark keyed by benchmark name
+    """
+    yaml_files = [f for f in tree.config_files if f.endswith(".yaml")]
+    json_files = [f for f in tree.config_files if f.endswith(".json")]
+
+    results = {
+        "configure": benchmark_configure(tree, repeat),
+        "merge_configuration_from_dict_root": benchmark_merge(tree, repeat),
+    }
+
+    if yaml_files:
+        results["YamlConfigFileParser.parse"] = benchmark_parser(YamlConfigFileParser, yaml_files, tree.context, repeat)
+
+    if json_files:
+        results["JsonConfigFileParser.parse"] = benchmark_parser(JsonConfigFileParser, json_files, tree.context, repeat)
+
+    for tag_class, source in TAG_SOURCES.items():
+        results["tag.{}".format(tag_class.__name__)] = benchmark_tag(tag_class, source, tree, repeat)
+
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    :return: (name, baseline median, median) for every benchmark whose median is more than threshold slower than in
+             baseline
+    """
+    regressions = []
+
+    for name, result in results.items():
+        baseline_result = baseline.get("results", {}).get(name)
+
+        if baseline_result is not None and result["median"] > baseline_result["median"] * (1 + threshold):
+            regressions.append((name, baseline_result["median"], result["median"]))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks jconfigure on a synthetic configuration tree")
+    parser.add_argument("--output", help="File to write the JSON results to, printed to stdout if not set")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown reported as a regression, 0.2 is 20%%")
+    parser.add_argument("--repeat", type=int, default=10)
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    parameters = {name: getattr(args, name) for name in DEFAULT_PARAMETERS}
+
+    # Keep configure from logging every run
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        tree = generate_config_tree(output_dir, **parameters)
+        results = run_suite(tree, args.repeat)
+
+    report = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timer": "time.perf_counter",
+        "parameters": parameters,
+        "results": results,
+    }
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.threshold)
+
+        for name, baseline_median, median in regressions:
+            print("Regression in {}: {:.6f}s -> {:.6f}s".format(name, baseline_median, median), file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
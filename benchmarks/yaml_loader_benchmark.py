@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+"""
+Compares parsing a large synthetic yaml file using the pure python and libyaml context passing loaders.
+
+Usage: python -m benchmarks.yaml_loader_benchmark [number of top level keys]
+"""
+import io
+import sys
+import timeit
+
+from jconfigure.yaml_tags import ContextPassingYamlLoader, ContextPassingCYamlLoader, load_yaml_with_context
+
+
+def generate_yaml(num_keys):
+    lines = []
+
+    for i in range(num_keys):
+        lines.extend([
+            "service_{}:".format(i),
+            "  host: host-{}.example.com".format(i),
+            "  port: {}".format(8000 + i),
+            "  enabled: true",
+            "  tags: [a, b, c, d]",
+            "  user: !EnvVar {name: _BENCHMARK_USER, default: nobody}",
+            "  url: !StringFormat [\"http://{}:{}\", [host-%d, %d]]" % (i, 8000 + i),
+        ])
+
+    return "\n".join(lines)
+
+
+def time_loader(document, loader_class, repeat):
+    context = {"_parsing_filename": "benchmark.yaml"}
+    return min(timeit.repeat(
+        lambda: load_yaml_with_context(io.StringIO(document), context, loader_class),
+        number=1,
+        repeat=repeat,
+    ))
+
+
+def main():
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    document = generate_yaml(num_keys)
+    print("Document size: {:.1f} MB".format(len(document) / 1024 / 1024))
+
+    python_time = time_loader(document, ContextPassingYamlLoader, repeat=3)
+    print("ContextPassingYamlLoader:  {:.3f}s".format(python_time))
+
+    if ContextPassingCYamlLoader is None:
+        print("libyaml is not available, skipping ContextPassingCYamlLoader")
+        return
+
+    c_time = time_loader(document, ContextPassingCYamlLoader, repeat=3)
+    print("ContextPassingCYamlLoader: {:.3f}s ({:.1f}x faster)".format(c_time, python_time / c_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,27 @@
 #!/usr/bin/env python
 import json
 import logging
-import logging.config
 import os
-
-from .exceptions import FilesNotFoundException, FileParsingException
-from .parsers import SUPPORTED_FILE_EXTENSIONS, CONFIG_FILENAME_FORMAT
-from .utils import merge_configuration_from_dict_root, parse_file
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import Snapshot, SnapshotCache
+from .deferred import DeferredValue, resolve_deferred_values
+from .dependencies import DependencyManifest
+from .frozen import FrozenDict, freeze, thaw
+from .include_cache import IncludeCache
+from .intern import Interner
+from .lazy import LazyMergedView
+from .logconfig import apply_logging_config, reset_applied_logging_config
+from .memory import MemoryReport, deep_getsizeof, measure_memory, tracing_memory
+from .merge import APPEND, REPLACE, UNIQUE, _is_mapping, merge_configurations, normalize_merge_strategies
+from .shared import SharedConfiguration, publish_configuration
+from .streaming import StreamingMerge
+from .tag_registry import TagRegistry
+from .exceptions import ConfigurationRootException, FilesNotFoundException, FileParsingException
+from .tracing import ConfigurationTracer, RecordingTracer, TraceEvent, trace
+from .parsers import SUPPORTED_FILE_EXTENSIONS, CONFIG_FILENAME_FORMAT, FILE_EXTENSION_TO_PARSERS
+from .utils import merge_configuration_from_dict_root, parse_file, stream_merge_file
+from .yaml_tags import LAZY_TAGS, TAG_REGISTRY, ArgListAcceptingYamlTag
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,9 +40,22 @@ def _get_configuration_dirs(configuration_dirs_arg):
     return configuration_dirs_arg
 
 
+def _get_active_profiles(active_profiles_arg):
+    return (
+        active_profiles_arg or
+        (os.environ.get("JCONFIGURE_ACTIVE_PROFILES").split(",") if "JCONFIGURE_ACTIVE_PROFILES" in os.environ else [])
+    )
+
+
 def _parse_file_handle_exceptions(filename, fail_on_parse_error, context):
     try:
-        return parse_file(filename, context)
+        with trace(context.get("_tracer"), "file", filename, filename) as trace_span, \
+                measure_memory(context.get("_memory_report"), "file", filename):
+            trace_span.add_files([filename])
+            config = parse_file(filename, context)
+
+        interner = context.get("_interner")
+        return interner.intern(config) if interner is not None else config
     except Exception as e:
         if fail_on_parse_error:
             _LOGGER.error("Exception thrown while parsing file {}!".format(filename))
@@ -40,12 +68,69 @@ def _parse_file_handle_exceptions(filename, fail_on_parse_error, context):
             return {}
 
 
-def _merge_configuration_from_file(base_config, filename, fail_on_parse_error, context):
-    overrides = _parse_file_handle_exceptions(filename, fail_on_parse_error, context)
-    merge_configuration_from_dict_root(base_config, overrides)
+def _stream_file_handle_exceptions(streaming_merge, filename, fail_on_parse_error, context):
+    try:
+        with trace(context.get("_tracer"), "file", filename, filename) as trace_span, \
+                measure_memory(context.get("_memory_report"), "file", filename), \
+                streaming_merge.merging_file():
+            trace_span.add_files([filename])
+            stream_merge_file(filename, streaming_merge, context)
+    except ConfigurationRootException:
+        # Merging a file whose root isn't a mapping fails regardless of fail_on_parse_error, the same as without
+        # streaming, where the file is parsed successfully and only fails to merge
+        raise
+    except Exception as e:
+        if fail_on_parse_error:
+            _LOGGER.error("Exception thrown while parsing file {}!".format(filename))
+            raise FileParsingException(filename) from e
+        else:
+            _LOGGER.warn("Exception thrown while parsing file {}. fail_on_parse_error is not set, continuing".format(
+                filename
+            ))
+
+
+def _parse_config_files(config_files, fail_on_parse_error, context, executor):
+    """
+    Yields the parsed contents of each config file in order. If an executor is passed all of the files are submitted
+    to it up front and parsed concurrently, otherwise each file is parsed as it is requested
+    """
+    if executor is None:
+        for f in config_files:
+            yield _parse_file_handle_exceptions(f, fail_on_parse_error, context)
+
+        return
+
+    futures = [executor.submit(_parse_file_handle_exceptions, f, fail_on_parse_error, context) for f in config_files]
+
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _merge_configuration_from_file(base_config, filename, overrides, context, lazy):
+    # In lazy mode the parsed files are collected in a list and merged on access by a LazyMergedView
+    if lazy:
+        # Checked up front, as the eager merge does, rather than failing once the config is accessed
+        if not _is_mapping(overrides):
+            raise ConfigurationRootException(overrides)
+
+        base_config.append(overrides)
+        return
+
+    # While no tag which may produce DeferredValues or other Mappings has been constructed, the files parsed so far only
+    # hold dicts, lists and plain values
+    non_plain_tags = context.get("_non_plain_tags")
+    plain = non_plain_tags is not None and not non_plain_tags
 
+    with trace(context.get("_tracer"), "merge", filename, filename) as trace_span:
+        trace_span.add_files([filename])
+        merge_configuration_from_dict_root(base_config, overrides, context.get("_merge_strategies"), plain)
 
-def _find_available_config_files_in_directory(directory, basename):
+
+def _probe_config_files_in_directory(directory, basename):
     possible_config_files = (
         os.path.join(directory, CONFIG_FILENAME_FORMAT.format(basename=basename, extension=extension))
         for extension in SUPPORTED_FILE_EXTENSIONS
@@ -54,56 +139,162 @@ def _find_available_config_files_in_directory(directory, basename):
     return [config_file for config_file in possible_config_files if os.path.isfile(config_file)]
 
 
-def _handle_available_files_in_directories(
-    base_config,
-    file_basenames,
-    configuration_dirs,
-    fail_on_parse_error,
-    fail_on_missing_files,
-    context,
-):
+def _index_configuration_dirs(configuration_dirs):
+    """
+    Lists every configuration directory once, and builds an index of directory -> basename -> config files, where the
+    config files for each basename are ordered the same way as SUPPORTED_FILE_EXTENSIONS
+    """
+    config_file_index = {}
+
+    for directory in configuration_dirs:
+        if directory in config_file_index:
+            continue
+
+        extensions_by_basename = {}
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    basename, extension = os.path.splitext(entry.name)
+
+                    if extension in FILE_EXTENSION_TO_PARSERS and entry.is_file():
+                        extensions_by_basename.setdefault(basename, set()).add(extension)
+        except OSError:
+            _LOGGER.debug("Failed to list configuration directory {}".format(directory))
+
+        config_file_index[directory] = {
+            basename: [
+                os.path.join(directory, CONFIG_FILENAME_FORMAT.format(basename=basename, extension=extension))
+                for extension in SUPPORTED_FILE_EXTENSIONS if extension in extensions
+            ]
+            for basename, extensions in extensions_by_basename.items()
+        }
+
+    return config_file_index
+
+
+def _find_available_config_files_in_directory(config_file_index, directory, basename):
+    # basenames pointing into subdirectories aren't covered by the index
+    if os.path.dirname(basename) or directory not in config_file_index:
+        return _probe_config_files_in_directory(directory, basename)
+
+    return config_file_index[directory].get(basename, [])
+
+
+def _find_config_files(config_file_index, file_basenames, configuration_dirs):
+    """
+    :return: The config files found for each basename in each directory, in the order they are merged, and the list of
+             basenames for which no files were found in any directory
+    """
     basename_found = {b: False for b in file_basenames}
+    config_files = []
 
     for basename in file_basenames:
         for directory in configuration_dirs:
-            config_files_in_dir = _find_available_config_files_in_directory(directory, basename)
+            config_files_in_dir = _find_available_config_files_in_directory(config_file_index, directory, basename)
 
             if len(config_files_in_dir) == 0:
                 _LOGGER.debug("No config files for basename {} found in directory {}".format(basename, directory))
             else:
                 basename_found[basename] = True
 
-            for f in config_files_in_dir:
-                _LOGGER.debug("Parsing file {} and merging with config".format(f))
-                _merge_configuration_from_file(
-                    base_config=base_config,
-                    filename=f,
-                    fail_on_parse_error=fail_on_parse_error,
-                    context=context,
-                )
-
-    for basename, found in basename_found.items():
-        if fail_on_missing_files and not found:
+            config_files.extend(config_files_in_dir)
+
+    return config_files, [basename for basename, found in basename_found.items() if not found]
+
+
+def _check_missing_basenames(missing_basenames, fail_on_missing_files):
+    for basename in missing_basenames:
+        if fail_on_missing_files:
             _LOGGER.error("No files found for basename {} in any directory and fail_on_missing_files is set, exiting".format(basename))
             raise FilesNotFoundException("No files found for basename {} in any directory".format(basename))
 
 
+def _handle_available_files_in_directories(
+    base_config,
+    file_basenames,
+    configuration_dirs,
+    config_file_index,
+    fail_on_parse_error,
+    fail_on_missing_files,
+    context,
+    executor,
+    lazy,
+):
+    handled_config_files, missing_basenames = _find_config_files(config_file_index, file_basenames, configuration_dirs)
+    parsed_config_files = _parse_config_files(handled_config_files, fail_on_parse_error, context, executor)
+
+    for f, overrides in zip(handled_config_files, parsed_config_files):
+        _LOGGER.debug("Merging file {} with config".format(f))
+        _merge_configuration_from_file(
+            base_config=base_config,
+            filename=f,
+            overrides=overrides,
+            context=context,
+            lazy=lazy,
+        )
+
+    _check_missing_basenames(missing_basenames, fail_on_missing_files)
+    return handled_config_files
+
+
+def _stream_config_files(streaming_merge, config_files, fail_on_parse_error, context):
+    # Files are merged from the last to the first, so values overridden by a later file are never constructed
+    for f in reversed(config_files):
+        _LOGGER.debug("Streaming file {} into config".format(f))
+        _stream_file_handle_exceptions(streaming_merge, f, fail_on_parse_error, context)
+
+
+def _stream_defaults_and_profiles_files(
+    base_config,
+    defaults_basename,
+    active_profiles,
+    configuration_dirs,
+    config_file_index,
+    fail_on_parse_error,
+    fail_on_missing_files,
+    context,
+):
+    tracer = context.get("_tracer")
+    streaming_merge = StreamingMerge(base_config, context.get("_interner"))
+
+    _LOGGER.debug("Searching for defaults and active profile config files...")
+    defaults_files, missing_basenames = _find_config_files(config_file_index, [defaults_basename], configuration_dirs)
+    _check_missing_basenames(missing_basenames, fail_on_missing_files)
+    profiles_files, missing_basenames = _find_config_files(config_file_index, active_profiles, configuration_dirs)
+    _check_missing_basenames(missing_basenames, fail_on_missing_files)
+
+    with trace(tracer, "phase", "profiles") as trace_span:
+        _stream_config_files(streaming_merge, profiles_files, fail_on_parse_error, context)
+        trace_span.add_files(profiles_files)
+
+    with trace(tracer, "phase", "defaults") as trace_span:
+        _stream_config_files(streaming_merge, defaults_files, fail_on_parse_error, context)
+        trace_span.add_files(defaults_files)
+
+
 def _handle_available_defaults_files(
     base_config,
     defaults_basename,
     configuration_dirs,
+    config_file_index,
     fail_on_parse_error,
     fail_on_missing_files,
     context,
+    executor,
+    lazy,
 ):
     _LOGGER.debug("Searching for defaults config files...")
-    _handle_available_files_in_directories(
+    return _handle_available_files_in_directories(
         base_config=base_config,
         file_basenames=[defaults_basename],
         configuration_dirs=configuration_dirs,
+        config_file_index=config_file_index,
         fail_on_parse_error=fail_on_parse_error,
         fail_on_missing_files=fail_on_missing_files,
         context=context,
+        executor=executor,
+        lazy=lazy,
     )
 
 
@@ -111,40 +302,159 @@ def _handle_active_profiles_files(
     base_config,
     active_profiles,
     configuration_dirs,
+    config_file_index,
     fail_on_parse_error,
     fail_on_missing_files,
     context,
+    executor,
+    lazy,
 ):
     _LOGGER.debug("Searching for active profile config files...")
-    _handle_available_files_in_directories(
+    return _handle_available_files_in_directories(
         base_config=base_config,
         file_basenames=active_profiles,
         configuration_dirs=configuration_dirs,
+        config_file_index=config_file_index,
         fail_on_parse_error=fail_on_parse_error,
         fail_on_missing_files=fail_on_missing_files,
         context=context,
+        executor=executor,
+        lazy=lazy,
     )
 
 
 def _configure_logging(
     configuration_dirs,
+    config_file_index,
     logging_config_filename,
     fail_on_parse_error,
     fail_on_missing_files,
     context,
+    executor,
 ):
     logging_config = {}
-    _handle_available_files_in_directories(
-        base_config=logging_config,
-        file_basenames=[logging_config_filename],
+
+    with trace(context.get("_tracer"), "phase", "logging") as trace_span:
+        logging_config_files = _handle_available_files_in_directories(
+            base_config=logging_config,
+            file_basenames=[logging_config_filename],
+            configuration_dirs=configuration_dirs,
+            config_file_index=config_file_index,
+            fail_on_parse_error=fail_on_parse_error,
+            fail_on_missing_files=fail_on_missing_files,
+            context=context,
+            executor=executor,
+            lazy=False,
+        )
+
+        trace_span.add_files(logging_config_files)
+
+        # Configurations compiled into a bundle keep their deferred values, logging is configured when it's loaded
+        if context.get("_keep_deferred_values"):
+            return logging_config
+
+        if "_deferred_tags" in context:
+            logging_config = resolve_deferred_values(logging_config)
+
+        _apply_logging_config(logging_config)
+
+    return logging_config
+
+
+def _apply_logging_config(logging_config):
+    if not apply_logging_config(logging_config):
+        _LOGGER.debug("Logging config is unchanged, not reconfiguring logging")
+        return
+
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(f"Configured logging with config: {json.dumps(logging_config)}")
+
+
+def _build_configuration(
+    configuration_dirs,
+    logging_config_filename,
+    defaults_basename,
+    active_profiles,
+    fail_on_parse_error,
+    fail_on_missing_files,
+    context,
+    executor,
+    lazy,
+    streaming,
+):
+    tracer = context.get("_tracer")
+
+    with trace(tracer, "phase", "discovery"):
+        config_file_index = _index_configuration_dirs(configuration_dirs)
+
+    logging_config = _configure_logging(
         configuration_dirs=configuration_dirs,
+        config_file_index=config_file_index,
+        logging_config_filename=logging_config_filename,
         fail_on_parse_error=fail_on_parse_error,
         fail_on_missing_files=fail_on_missing_files,
         context=context,
+        executor=executor,
     )
 
-    logging.config.dictConfig(logging_config)
-    _LOGGER.debug(f"Configured logging with config: {json.dumps(logging_config)}")
+    base_config = [] if lazy else {}
+
+    _LOGGER.info("Configuring Application using files in config directories [{}]".format(", ".join(configuration_dirs)))
+    _LOGGER.info("Active profiles: [{}]".format(", ".join(active_profiles)))
+
+    if streaming and not lazy and not context.get("_merge_strategies"):
+        _stream_defaults_and_profiles_files(
+            base_config=base_config,
+            defaults_basename=defaults_basename,
+            active_profiles=active_profiles,
+            configuration_dirs=configuration_dirs,
+            config_file_index=config_file_index,
+            fail_on_parse_error=fail_on_parse_error,
+            fail_on_missing_files=fail_on_missing_files,
+            context=context,
+        )
+    else:
+        with trace(tracer, "phase", "defaults") as trace_span:
+            defaults_files = _handle_available_defaults_files(
+                base_config=base_config,
+                configuration_dirs=configuration_dirs,
+                config_file_index=config_file_index,
+                defaults_basename=defaults_basename,
+                fail_on_parse_error=fail_on_parse_error,
+                fail_on_missing_files=fail_on_missing_files,
+                context=context,
+                executor=executor,
+                lazy=lazy,
+            )
+
+            trace_span.add_files(defaults_files)
+
+        with trace(tracer, "phase", "profiles") as trace_span:
+            profiles_files = _handle_active_profiles_files(
+                base_config=base_config,
+                configuration_dirs=configuration_dirs,
+                config_file_index=config_file_index,
+                active_profiles=active_profiles,
+                fail_on_parse_error=fail_on_parse_error,
+                fail_on_missing_files=fail_on_missing_files,
+                context=context,
+                executor=executor,
+                lazy=lazy,
+            )
+
+            trace_span.add_files(profiles_files)
+
+    keep_deferred_values = context.get("_keep_deferred_values", False)
+
+    if lazy:
+        base_config = LazyMergedView(base_config, context.get("_merge_strategies"))
+    elif "_deferred_tags" in context and not keep_deferred_values:
+        base_config = resolve_deferred_values(base_config)
+
+    if not lazy and not keep_deferred_values and _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(f"Constructed config: {json.dumps(base_config)}")
+
+    return logging_config, base_config
 
 
 def configure(
@@ -154,7 +464,19 @@ def configure(
     active_profiles=None,
     fail_on_parse_error=True,
     fail_on_missing_files=False,
-    context={},
+    context=None,
+    snapshot_cache=None,
+    tracer=None,
+    parse_workers=None,
+    dependency_manifest=None,
+    include_cache=None,
+    lazy=False,
+    lazy_tags=False,
+    frozen=False,
+    merge_strategies=None,
+    memory_report=None,
+    intern=False,
+    streaming=False,
 ):
     """
     :param configuration_dirs: The directories from which configuration files will be pulled, either a single string, or
@@ -171,47 +493,161 @@ def configure(
                             where extension is one of the allowed file types
     :param fail_on_parse_error: If False suppress any exceptions thrown while processing a file. Defaults to True
     :param fail_on_missing_files: If True, raise an exception if an expected file is not found. Defaults to False
-    :param context: Allows the caller to provide a dictionary context which custom tags can read values from when parsing
-
-    :return: The configuration dictionary pulled from the configuration files specified under configuration_dir
+    :param context: Allows the caller to provide a dictionary context which custom tags can read values from when
+                    parsing. It is never modified
+    :param snapshot_cache: An optional SnapshotCache. If a snapshot of the configuration for these arguments exists and
+                           none of the files, directories or environment variables it was built from have changed, it
+                           is returned without parsing anything. Otherwise the configuration is built and stored
+    :param tracer: An optional ConfigurationTracer, which is passed a TraceEvent with the wall time and number of bytes
+                   processed for each phase, parsed file, merge and yaml tag invocation
+    :param parse_workers: If set to a number greater than 1, the files found in each phase are parsed concurrently on a
+                          pool of this many threads, and then merged in the usual order
+    :param dependency_manifest: An optional DependencyManifest, which is filled with every file, configuration
+                                directory, environment variable and context key read while building the configuration,
+                                and whether it depends on the current time
+    :param include_cache: The IncludeCache used for files included by !Include* tags. If None, a new cache is used
+                          for this call, so files included from many config files are only parsed once. Pass an
+                          instance to share it across calls
+    :param lazy: If True, return a read-only LazyMergedView over the parsed config files instead of merging them up
+                 front. Each key's value is merged the first time it's accessed, which saves time and memory when only
+                 part of a large configuration is read
+    :param lazy_tags: If True, the !IncludeYaml, !IncludeJson, !IncludeText and !Timestamp tags, and any tag taking
+                      one of their results as an argument, are only evaluated if their value ends up in the merged
+                      configuration. Values overridden by a later file are never evaluated. Combined with lazy, tags
+                      are evaluated when the key holding them is first accessed. Errors raised by deferred tags are
+                      raised as a FileParsingException regardless of fail_on_parse_error
+    :param frozen: If True, return the configuration as an immutable, hashable FrozenDict, with lists turned into
+                   tuples. It can be shared between threads without copying, and modified copies made with its set,
+                   delete and set_in methods share all unchanged subtrees. A lazy configuration is fully merged when
+                   it is frozen
+    :param merge_strategies: An optional dict of path -> strategy, changing how the values at a path are merged. A path
+                             is a dot separated string of keys, or a tuple of keys. The strategies are "replace", where
+                             a dict replaces the dict before it instead of being merged with it, "append", where lists
+                             are concatenated, and "unique", where only the items not already in the list are appended
+    :param memory_report: An optional MemoryReport, which is filled with the bytes allocated while parsing each file
+                          and the retained size of each top level key of the configuration. tracemalloc is started
+                          while configure runs, if it isn't already tracing, which slows parsing down considerably.
+                          Measuring a lazy configuration resolves every key of it
+    :param intern: If True, the keys and short string values of every parsed file are interned, so each distinct
+                   string is held once by the configuration and the include cache. Combined with frozen, identical
+                   subtrees of the configuration are also the same object
+    :param streaming: If True, the defaults and profile files are merged from the last to the first straight into the
+                      configuration, and yaml files are merged from the parser's events, so values which a later file
+                      overrides are never constructed and no file is held in memory as a whole. Json files, and yaml
+                      files using merge keys, are still parsed in full. The files are parsed one at a time, so
+                      parse_workers only applies to the logging config files. Ignored when lazy or merge_strategies
+                      is set
+
+    :return: The configuration dictionary pulled from the configuration files specified under configuration_dir, a
+             LazyMergedView over them if lazy is set, or a FrozenDict if frozen is set
     """
     configuration_dirs = _get_configuration_dirs(configuration_dirs)
+    active_profiles = _get_active_profiles(active_profiles)
+    merge_strategies = normalize_merge_strategies(merge_strategies)
+    context = context if context is not None else {}
+
+    if snapshot_cache is not None:
+        snapshot_key = snapshot_cache.get_key(
+            configuration_dirs=configuration_dirs,
+            logging_config_filename=logging_config_filename,
+            defaults_basename=defaults_basename,
+            active_profiles=active_profiles,
+            fail_on_parse_error=fail_on_parse_error,
+            fail_on_missing_files=fail_on_missing_files,
+            context=context,
+            lazy=lazy,
+            lazy_tags=lazy_tags,
+            merge_strategies=[[list(path), strategy] for path, strategy in (merge_strategies or {}).items()],
+        )
 
-    _configure_logging(
-        configuration_dirs=configuration_dirs,
-        logging_config_filename=logging_config_filename,
-        fail_on_parse_error=fail_on_parse_error,
-        fail_on_missing_files=fail_on_missing_files,
-        context=context,
-    )
+        snapshot = snapshot_cache.load(snapshot_key)
+        if snapshot is not None:
+            _apply_logging_config(snapshot.logging_config)
+            _LOGGER.info("Loaded configuration from snapshot {}".format(snapshot_key))
 
-    active_profiles = (
-        active_profiles or
-        (os.environ.get("JCONFIGURE_ACTIVE_PROFILES").split(",") if "JCONFIGURE_ACTIVE_PROFILES" in os.environ else [])
-    )
+            if dependency_manifest is not None:
+                dependency_manifest.update(snapshot.manifest)
 
-    base_config = {}
+            config = snapshot.config
 
-    _LOGGER.info("Configuring Application using files in config directories [{}]".format(", ".join(configuration_dirs)))
-    _LOGGER.info("Active profiles: [{}]".format(", ".join(active_profiles)))
+            # Unpickling doesn't deduplicate strings, so the snapshot is interned again
+            interner = Interner() if intern else None
 
-    _handle_available_defaults_files(
-        base_config=base_config,
-        configuration_dirs=configuration_dirs,
-        defaults_basename=defaults_basename,
-        fail_on_parse_error=fail_on_parse_error,
-        fail_on_missing_files=fail_on_missing_files,
-        context=context,
-    )
+            if frozen:
+                config = interner.freeze(config) if interner is not None else freeze(config)
+            else:
+                config = interner.intern(config) if interner is not None else config
+                config = LazyMergedView([config]) if lazy else config
 
-    _handle_active_profiles_files(
-        base_config=base_config,
-        configuration_dirs=configuration_dirs,
-        active_profiles=active_profiles,
-        fail_on_parse_error=fail_on_parse_error,
-        fail_on_missing_files=fail_on_missing_files,
-        context=context,
-    )
+            if memory_report is not None:
+                memory_report.record_configuration(config)
+
+            return config
+
+    manifest = dependency_manifest
+    if manifest is None and snapshot_cache is not None:
+        manifest = DependencyManifest()
+
+    if manifest is not None:
+        for directory in configuration_dirs:
+            manifest.record_directory(directory)
+
+        context = {**context, "_dependency_manifest": manifest}
+
+    if tracer is not None:
+        context = {**context, "_tracer": tracer}
+
+    if lazy_tags:
+        context = {**context, "_deferred_tags": LAZY_TAGS}
+
+    if merge_strategies:
+        context = {**context, "_merge_strategies": merge_strategies}
+
+    if memory_report is not None:
+        context = {**context, "_memory_report": memory_report}
+
+    interner = Interner() if intern else None
+    if interner is not None:
+        context = {**context, "_interner": interner}
+
+    context = {**context, "_include_cache": include_cache if include_cache is not None else IncludeCache()}
+    context = {**context, "_non_plain_tags": set()}
+    executor = ThreadPoolExecutor(max_workers=parse_workers) if parse_workers and parse_workers > 1 else None
+
+    try:
+        with tracing_memory(enabled=memory_report is not None):
+            logging_config, base_config = _build_configuration(
+                configuration_dirs=configuration_dirs,
+                logging_config_filename=logging_config_filename,
+                defaults_basename=defaults_basename,
+                active_profiles=active_profiles,
+                fail_on_parse_error=fail_on_parse_error,
+                fail_on_missing_files=fail_on_missing_files,
+                context=context,
+                executor=executor,
+                lazy=lazy,
+                streaming=streaming,
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if snapshot_cache is not None:
+        # Snapshots hold the fully merged configuration, so every deferred value is resolved before storing it
+        snapshot_config = base_config.to_dict() if lazy else base_config
+        snapshot_cache.store(snapshot_key, Snapshot(config=snapshot_config, logging_config=logging_config, manifest=manifest))
+
+    if frozen:
+        base_config = interner.freeze(base_config) if interner is not None else freeze(base_config)
+
+    if memory_report is not None:
+        memory_report.record_configuration(base_config)
 
-    _LOGGER.debug(f"Constructed config: {json.dumps(base_config)}")
     return base_config
+
+
+from .aio import configure_async, watch_configuration_async
+from .bundle import DYNAMIC_TAGS, compile_bundle, load_bundle
+from .daemon import ConfigurationClient, ConfigurationDaemon, query_configuration
+from .process_cache import get_configuration, invalidate_configuration
+from .reload import ReloadableConfiguration
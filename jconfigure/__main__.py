@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Usage:
+    python -m jconfigure compile <bundle> [configure options]
+    python -m jconfigure daemon <socket> [--watch-interval SECONDS] [configure options]
+    python -m jconfigure query [<dotted path>] [--socket SOCKET] [configure options]
+
+compile writes the configuration to a bundle, which jconfigure.load_bundle loads without parsing any config files.
+daemon keeps the configuration in memory and answers queries for it over a Unix domain socket, and query prints the
+value at a dotted path as json, from the daemon if one is listening and otherwise by running configure.
+
+The configure options are --config-dir, --profile, --logging-config-filename, --defaults-basename,
+--fail-on-missing-files and --context KEY=VALUE. The configuration directories and active profiles default to the
+JCONFIGURE_CONFIG_DIRECTORIES and JCONFIGURE_ACTIVE_PROFILES environment variables, the same as for configure.
+"""
+import argparse
+import json
+import logging
+
+from . import compile_bundle
+from .daemon import ConfigurationDaemon, query_configuration
+
+
+def _add_configure_arguments(parser):
+    parser.add_argument("--config-dir", dest="configuration_dirs", action="append")
+    parser.add_argument("--profile", dest="active_profiles", action="append")
+    parser.add_argument("--logging-config-filename", default="logging")
+    parser.add_argument("--defaults-basename", default="defaults")
+    parser.add_argument("--fail-on-missing-files", action="store_true")
+    parser.add_argument("--context", action="append", default=[], help="A context value, as KEY=VALUE")
+
+
+def _parse_context(parser, context_args):
+    context = {}
+
+    for arg in context_args:
+        key, separator, value = arg.partition("=")
+        if not separator:
+            parser.error("Context values must be passed as KEY=VALUE, got {}".format(arg))
+
+        context[key] = value
+
+    return context
+
+
+def _get_configure_kwargs(parser, args):
+    return {
+        "configuration_dirs": args.configuration_dirs,
+        "logging_config_filename": args.logging_config_filename,
+        "defaults_basename": args.defaults_basename,
+        "active_profiles": args.active_profiles,
+        "fail_on_missing_files": args.fail_on_missing_files,
+        "context": _parse_context(parser, args.context),
+    }
+
+
+def _compile(parser, args):
+    logging.basicConfig(level=logging.INFO)
+    print(compile_bundle(args.bundle, **_get_configure_kwargs(parser, args)))
+
+
+def _daemon(parser, args):
+    logging.basicConfig(level=logging.INFO)
+    daemon = ConfigurationDaemon(args.socket, watch_interval=args.watch_interval, **_get_configure_kwargs(parser, args))
+
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def _query(parser, args):
+    try:
+        value = query_configuration(args.path, socket_path=args.socket, **_get_configure_kwargs(parser, args))
+    except KeyError:
+        parser.exit(1, "No value at {}\n".format(args.path))
+
+    print(json.dumps(value, indent=2, default=str))
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="python -m jconfigure", description="jconfigure command line tools")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    compile_parser = subparsers.add_parser("compile", help="Compile the configuration into a bundle")
+    compile_parser.add_argument("bundle", help="The bundle file to write")
+    _add_configure_arguments(compile_parser)
+    compile_parser.set_defaults(run=_compile)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Serve the configuration over a Unix domain socket")
+    daemon_parser.add_argument("socket", help="The path of the socket to listen on")
+    daemon_parser.add_argument("--watch-interval", type=float, default=1.0)
+    _add_configure_arguments(daemon_parser)
+    daemon_parser.set_defaults(run=_daemon)
+
+    query_parser = subparsers.add_parser("query", help="Print the value at a dotted path of the configuration")
+    query_parser.add_argument("path", nargs="?", help="A dot separated path of keys, the whole configuration if unset")
+    query_parser.add_argument("--socket", help="The daemon's socket, defaults to $JCONFIGURE_DAEMON_SOCKET")
+    _add_configure_arguments(query_parser)
+    query_parser.set_defaults(run=_query)
+
+    args = parser.parse_args(args)
+    args.run(parser, args)
+
+
+if __name__ == "__main__":
+    main()
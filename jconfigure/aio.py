@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+import asyncio
+import functools
+import inspect
+import logging
+
+from . import configure
+from .dependencies import DependencyManifest
+
+_LOGGER = logging.getLogger(__name__)
+_DEFAULT_PARSE_WORKERS = 4
+_CONFIGURE_SIGNATURE = inspect.signature(configure)
+
+
+async def configure_async(*args, executor=None, **configure_kwargs):
+    """
+    Coroutine version of configure, taking the same arguments and returning the same configuration. File discovery,
+    reading and parsing all happen on a worker thread of the event loop, so the loop is never blocked, and the files
+    found in each phase are parsed concurrently on a pool of parse_workers threads, 4 unless it is passed.
+
+    :param executor: The executor configure is run on, defaults to the event loop's default executor
+    :param configure_kwargs: Any arguments accepted by configure
+    """
+    loop = asyncio.get_running_loop()
+    arguments = _CONFIGURE_SIGNATURE.bind(*args, **configure_kwargs)
+    arguments.arguments.setdefault("parse_workers", _DEFAULT_PARSE_WORKERS)
+
+    return await loop.run_in_executor(executor, functools.partial(configure, *arguments.args, **arguments.kwargs))
+
+
+async def watch_configuration_async(interval, executor=None, **configure_kwargs):
+    """
+    Async generator which yields the configuration once it has been built, and then again every time it changes. Every
+    interval seconds the files, directories and environment variables the configuration was built from are checked on
+    a worker thread, and the configuration is only rebuilt when one of them has changed. Errors while rebuilding are
+    logged and the previous configuration is kept.
+
+    :param interval: The number of seconds to wait between checks
+    :param executor: The executor checks and rebuilds are run on, defaults to the event loop's default executor
+    :param configure_kwargs: Any arguments accepted by configure_async
+    """
+    loop = asyncio.get_running_loop()
+    manifest = DependencyManifest()
+    config = await configure_async(dependency_manifest=manifest, executor=executor, **configure_kwargs)
+    yield config
+
+    while True:
+        await asyncio.sleep(interval)
+
+        if not await loop.run_in_executor(executor, manifest.is_stale):
+            continue
+
+        _LOGGER.info("Configuration inputs changed, rebuilding configuration")
+        new_manifest = DependencyManifest()
+
+        try:
+            new_config = await configure_async(dependency_manifest=new_manifest, executor=executor, **configure_kwargs)
+        except Exception:
+            _LOGGER.exception("Failed to rebuild configuration, keeping the previous configuration")
+            continue
+
+        manifest = new_manifest
+
+        if new_config != config:
+            config = new_config
+            yield config
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+import hashlib
+import io
+import logging
+import os
+import pickle
+import struct
+import tempfile
+
+from . import (
+    _apply_logging_config,
+    _build_configuration,
+    _get_active_profiles,
+    _get_configuration_dirs,
+)
+from .deferred import DeferredValue
+from .frozen import freeze
+from .include_cache import IncludeCache
+from .merge import normalize_merge_strategies
+from .yaml_tags import ContextValue, EnvVar, Timestamp
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"JCFGBDL1"
+# magic, sha256 of the payload
+_HEADER = struct.Struct("<8s32s")
+
+# Tags which are evaluated when a bundle is loaded rather than when it's compiled, as their values depend on where and
+# when the configuration is loaded
+DYNAMIC_TAGS = frozenset([EnvVar, ContextValue, Timestamp])
+
+
+class _BundlePickler(pickle.Pickler):
+    def persistent_id(self, obj):
+        if type(obj) is not DeferredValue:
+            return None
+
+        # A dynamic tag that had to be merged with a dict was evaluated while compiling
+        if obj.resolved:
+            return "value", obj.resolve()
+
+        return "deferred", obj.tag_class, obj.context.get("_parsing_filename"), obj.args, obj.kwargs
+
+
+class _BundleUnpickler(pickle.Unpickler):
+    def __init__(self, file, context):
+        super().__init__(file)
+        self._context = context
+        self._contexts_by_filename = {}
+
+    def persistent_load(self, pid):
+        if pid[0] == "value":
+            return pid[1]
+
+        _, tag_class, filename, args, kwargs = pid
+        context = self._contexts_by_filename.get(filename)
+
+        if context is None:
+            context = self._contexts_by_filename[filename] = {**self._context, "_parsing_filename": filename}
+
+        # Records are loaded after their arguments, so any deferred arguments have already been evaluated
+        return DeferredValue(tag_class, context, args, kwargs).resolve()
+
+
+def compile_bundle(
+    path,
+    configuration_dirs=None,
+    logging_config_filename="logging",
+    defaults_basename="defaults",
+    active_profiles=None,
+    fail_on_parse_error=True,
+    fail_on_missing_files=False,
+    context=None,
+    merge_strategies=None,
+    dynamic_tags=DYNAMIC_TAGS,
+):
+    """
+    Builds the configuration the same way as configure, taking the same arguments, and writes it to a bundle file
+    which load_bundle loads without parsing any config files. The tags in dynamic_tags, and the tags taking their
+    results as arguments, are stored as records of the tag and its arguments, and evaluated when the bundle is loaded.
+    Dynamic tags whose value has to be merged with a dict are evaluated when compiling.
+
+    The bundle is a small header holding the sha256 hash of its contents, followed by the pickled configurations. It is
+    written next to path and renamed over it, so a bundle is never partially written.
+
+    :param dynamic_tags: The tag classes evaluated when the bundle is loaded
+    :return: The hex sha256 hash of the bundle's contents
+    """
+    context = {
+        **(context or {}),
+        "_deferred_tags": frozenset(dynamic_tags),
+        "_keep_deferred_values": True,
+        "_include_cache": IncludeCache(),
+    }
+
+    merge_strategies = normalize_merge_strategies(merge_strategies)
+    if merge_strategies:
+        context["_merge_strategies"] = merge_strategies
+
+    logging_config, config = _build_configuration(
+        configuration_dirs=_get_configuration_dirs(configuration_dirs),
+        logging_config_filename=logging_config_filename,
+        defaults_basename=defaults_basename,
+        active_profiles=_get_active_profiles(active_profiles),
+        fail_on_parse_error=fail_on_parse_error,
+        fail_on_missing_files=fail_on_missing_files,
+        context=context,
+        executor=None,
+        lazy=False,
+        streaming=False,
+    )
+
+    payload = io.BytesIO()
+    _BundlePickler(payload, protocol=pickle.HIGHEST_PROTOCOL).dump({"config": config, "logging_config": logging_config})
+    payload = payload.getvalue()
+    digest = hashlib.sha256(payload).digest()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".jconfigure-bundle-")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, digest))
+            f.write(payload)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    _LOGGER.info("Compiled configuration bundle {} ({} bytes, sha256 {})".format(path, len(payload), digest.hex()))
+    return digest.hex()
+
+
+def load_bundle(path, context=None, frozen=False):
+    """
+    Loads a bundle written by compile_bundle, evaluating its dynamic tags, configures logging with its logging config,
+    and returns the configuration, the same as configure would. Bundles are unpickled, so only load bundles from a
+    trusted source, such as those built into the same image.
+
+    :param context: The context dynamic tags like !ContextValue read values from
+    :param frozen: If True, return the configuration as a FrozenDict
+    :return: The configuration
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise ValueError("{} isn't a configuration bundle".format(path))
+
+    magic, digest = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC:
+        raise ValueError("{} isn't a configuration bundle".format(path))
+
+    with memoryview(data) as view, view[_HEADER.size:] as payload:
+        if hashlib.sha256(payload).digest() != digest:
+            raise ValueError("{} is corrupt, its contents don't match its hash".format(path))
+
+    stream = io.BytesIO(data)
+    stream.seek(_HEADER.size)
+    bundle = _BundleUnpickler(stream, context or {}).load()
+
+    if bundle["logging_config"]:
+        _apply_logging_config(bundle["logging_config"])
+
+    config = bundle["config"]
+    return freeze(config) if frozen else config
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from collections import namedtuple
+
+_LOGGER = logging.getLogger(__name__)
+
+Snapshot = namedtuple("Snapshot", ["config", "logging_config", "manifest"])
+
+
+class SnapshotCache:
+    """
+    Persists the final merged configuration produced by configure() in a directory on disk, so that later processes
+    can skip parsing entirely. A snapshot is keyed on the arguments passed to configure() and is only used while
+    every file, configuration directory and environment variable recorded in its DependencyManifest is unchanged.
+    Snapshots are stored with pickle, so the cache directory must only be writable by trusted users.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def get_key(**configure_arguments):
+        serialized_arguments = json.dumps(configure_arguments, sort_keys=True, default=repr)
+        return hashlib.sha256(serialized_arguments.encode("utf-8")).hexdigest()
+
+    def _get_snapshot_filename(self, key):
+        return os.path.join(self.cache_dir, "{}.pickle".format(key))
+
+    def load(self, key):
+        snapshot_filename = self._get_snapshot_filename(key)
+
+        try:
+            with open(snapshot_filename, "rb") as snapshot_file:
+                snapshot = pickle.load(snapshot_file)
+        except FileNotFoundError:
+            _LOGGER.debug("No configuration snapshot found at {}".format(snapshot_filename))
+            return None
+        except Exception:
+            _LOGGER.warning("Failed to read configuration snapshot {}, ignoring it".format(snapshot_filename))
+            return None
+
+        if snapshot.manifest.is_stale():
+            _LOGGER.debug("Configuration snapshot {} is stale".format(snapshot_filename))
+            return None
+
+        return snapshot
+
+    def store(self, key, snapshot):
+        if snapshot.manifest.time_dependent:
+            _LOGGER.debug("Configuration depends on the current time, not storing a snapshot")
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temp_filename = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as snapshot_file:
+                pickle.dump(snapshot, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_filename, self._get_snapshot_filename(key))
+        except Exception:
+            os.unlink(temp_filename)
+            raise
@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import threading
+
+from . import configure
+from .exceptions import DaemonQueryException
+from .reload import ReloadableConfiguration
+
+_LOGGER = logging.getLogger(__name__)
+
+# Every request and response is a frame of a big endian 4 byte length, followed by that many bytes of utf-8 json
+_FRAME_HEADER = struct.Struct(">I")
+_MAX_REQUEST_SIZE = 64 * 1024
+
+SOCKET_PATH_ENV_VAR = "JCONFIGURE_DAEMON_SOCKET"
+
+
+def _read_frame(file, max_size=None):
+    """
+    :return: The body of the next frame read from file, or None if the connection was closed before a new frame
+    """
+    header = file.read(_FRAME_HEADER.size)
+    if len(header) == 0:
+        return None
+
+    if len(header) < _FRAME_HEADER.size:
+        raise ConnectionError("Connection closed in the middle of a frame")
+
+    (size,) = _FRAME_HEADER.unpack(header)
+    if max_size is not None and size > max_size:
+        raise ValueError("Frame of {} bytes is larger than the limit of {}".format(size, max_size))
+
+    body = file.read(size)
+    if len(body) < size:
+        raise ConnectionError("Connection closed in the middle of a frame")
+
+    return body
+
+
+def _frame(message):
+    body = json.dumps(message, default=str).encode()
+    return _FRAME_HEADER.pack(len(body)) + body
+
+
+def get_path(config, path):
+    """
+    :param path: A dot separated string of keys, where keys made of digits index into lists. None or "" for the whole
+                 configuration
+    :return: The value at path in config
+    """
+    value = config
+
+    for key in path.split(".") if path else []:
+        if type(value) in (list, tuple) and key.isdigit():
+            try:
+                value = value[int(key)]
+            except IndexError:
+                raise KeyError(path) from None
+        elif hasattr(value, "keys") and key in value:
+            value = value[key]
+        else:
+            raise KeyError(path)
+
+    return value
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Clients may send any number of requests over a connection, each is answered before the next is read
+        while True:
+            try:
+                request = _read_frame(self.rfile, _MAX_REQUEST_SIZE)
+            except (ConnectionError, ValueError) as e:
+                _LOGGER.debug("Closing configuration daemon connection: {}".format(e))
+                return
+
+            if request is None:
+                return
+
+            self.wfile.write(self.server.configuration_daemon.handle_request(request))
+
+
+class _DaemonServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, configuration_daemon):
+        self.configuration_daemon = configuration_daemon
+        super().__init__(socket_path, _RequestHandler)
+
+
+class ConfigurationDaemon:
+    """
+    Keeps a ReloadableConfiguration parsed in memory, watching its files for changes, and answers queries for the whole
+    configuration or the value at a dotted path over a Unix domain socket. Short lived processes query it with
+    query_configuration instead of parsing the config files themselves.
+
+    Values are sent as json, so tuples are received as lists, keys as strings, and values json can't represent, such
+    as dates, as their str().
+    """
+    def __init__(self, socket_path, configuration=None, watch_interval=1.0, **configure_kwargs):
+        """
+        :param socket_path: The path of the Unix domain socket to listen on
+        :param configuration: The ReloadableConfiguration to serve. If None, one is created from configure_kwargs,
+                              which are the same as the arguments of ReloadableConfiguration
+        :param watch_interval: How often files are checked for changes when inotify isn't available, or None to not
+                               watch them at all
+        """
+        self.socket_path = socket_path
+        self.configuration = configuration if configuration is not None else ReloadableConfiguration(**configure_kwargs)
+        self.watch_interval = watch_interval
+
+        self._encoded_config = (None, None)
+        self._server = None
+        self._thread = None
+
+    def _encode_config(self):
+        # The whole configuration is encoded once each time it changes, rather than for each request
+        config = self.configuration.config
+        encoded_for, encoded = self._encoded_config
+
+        if encoded_for is not config:
+            encoded = _frame({"value": config})
+            self._encoded_config = (config, encoded)
+
+        return encoded
+
+    def handle_request(self, request):
+        """
+        :param request: The body of a request frame, a json object whose "path" is the dotted path to look up, or null
+                        for the whole configuration
+        :return: The response frame, a json object holding either the "value", or an "error" and its "message"
+        """
+        try:
+            path = json.loads(request.decode()).get("path")
+
+            if not path:
+                return self._encode_config()
+
+            return _frame({"value": get_path(self.configuration.config, path)})
+        except KeyError:
+            return _frame({"error": "KeyError", "message": path})
+        except Exception as e:
+            _LOGGER.exception("Failed to answer configuration daemon request")
+            return _frame({"error": type(e).__name__, "message": str(e)})
+
+    def _remove_stale_socket(self):
+        try:
+            if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                raise OSError("{} exists and isn't a socket".format(self.socket_path))
+        except FileNotFoundError:
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            try:
+                s.connect(self.socket_path)
+            except ConnectionRefusedError:
+                _LOGGER.info("Removing stale configuration daemon socket {}".format(self.socket_path))
+                os.unlink(self.socket_path)
+                return
+
+        raise OSError("A configuration daemon is already listening on {}".format(self.socket_path))
+
+    def _bind(self):
+        self._remove_stale_socket()
+        self._server = _DaemonServer(self.socket_path, self)
+
+        if self.watch_interval is not None:
+            self.configuration.start_watching(self.watch_interval)
+
+        _LOGGER.info("Configuration daemon listening on {}".format(self.socket_path))
+
+    def serve_forever(self):
+        """
+        Listens on the socket and answers queries until stop is called from another thread
+        """
+        self._bind()
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._close()
+
+    def start(self):
+        """
+        Listens on the socket and answers queries on a daemon thread, until stop is called
+        """
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, name="jconfigure-daemon", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._close()
+
+    def _close(self):
+        if self._server is None:
+            return
+
+        self._server.server_close()
+        self._server = None
+        self.configuration.stop_watching()
+
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+class ConfigurationClient:
+    """
+    A connection to a ConfigurationDaemon, which can be used for any number of queries
+    """
+    def __init__(self, socket_path, timeout=1.0):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(socket_path)
+        except BaseException:
+            self._socket.close()
+            raise
+
+        self._file = self._socket.makefile("rb")
+
+    def get(self, path=None):
+        """
+        :param path: A dot separated string of keys, or None for the whole configuration
+        :return: The value at path
+        :raises KeyError: If there is no value at path
+        """
+        self._socket.sendall(_frame({"path": path}))
+
+        response = _read_frame(self._file)
+        if response is None:
+            raise ConnectionError("The configuration daemon closed the connection")
+
+        response = json.loads(response.decode())
+
+        if response.get("error") == "KeyError":
+            raise KeyError(path)
+
+        if "error" in response:
+            raise DaemonQueryException(response["error"], response["message"])
+
+        return response["value"]
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+def query_configuration(path=None, socket_path=None, timeout=1.0, **configure_kwargs):
+    """
+    Looks up the value at path from the ConfigurationDaemon listening on socket_path. If no daemon is listening, or it
+    doesn't answer within timeout seconds, the configuration is built in process with configure instead
+
+    :param path: A dot separated string of keys, or None for the whole configuration
+    :param socket_path: The daemon's socket, defaults to the JCONFIGURE_DAEMON_SOCKET environment variable. If neither
+                        is set, configure is always used
+    :param configure_kwargs: The arguments to configure with if the daemon isn't available
+    :return: The value at path
+    :raises KeyError: If there is no value at path
+    """
+    socket_path = socket_path or os.environ.get(SOCKET_PATH_ENV_VAR)
+
+    if socket_path:
+        try:
+            with ConfigurationClient(socket_path, timeout) as client:
+                return client.get(path)
+        except OSError as e:
+            _LOGGER.debug("Configuration daemon at {} isn't available, running configure: {}".format(socket_path, e))
+
+    return get_path(configure(**configure_kwargs), path)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+import copy
+
+from .exceptions import FileParsingException
+
+_UNRESOLVED = object()
+
+
+class DeferredValue:
+    """
+    Placeholder for the result of a yaml tag whose evaluation has been deferred. The tag's arguments are constructed
+    when the file is parsed, but the tag itself is only evaluated the first time resolve() is called, and the result is
+    cached. Placeholders which are overridden by a later file while merging are discarded without ever being evaluated.
+    Tags are deferred when their class is in the "_deferred_tags" context key, or when any of their arguments is itself
+    a DeferredValue.
+    """
+    __slots__ = ("tag_class", "context", "args", "kwargs", "_value")
+
+    def __init__(self, tag_class, context, args, kwargs):
+        self.tag_class = tag_class
+        self.context = context
+        self.args = args
+        self.kwargs = kwargs
+        self._value = _UNRESOLVED
+
+    @property
+    def may_be_mapping(self):
+        """
+        Whether the tag could evaluate to a dict, in which case it has to be evaluated to be merged correctly
+        """
+        return self.tag_class.deferred_result_may_be_mapping
+
+    @property
+    def resolved(self):
+        return self._value is not _UNRESOLVED
+
+    def resolve(self):
+        """
+        Evaluates the tag, if it hasn't already been. Any deferred values inside of the result, for instance tags in a
+        file included with !IncludeYaml, are left unresolved. Errors are raised as a FileParsingException for the file
+        the tag was in, the same as if the tag had been evaluated while parsing
+        """
+        if self._value is _UNRESOLVED:
+            try:
+                self._value = self.tag_class.map_node_data(
+                    self.context,
+                    *resolve_deferred_values(self.args),
+                    **resolve_deferred_values(self.kwargs),
+                )
+            except FileParsingException:
+                raise
+            except Exception as e:
+                raise FileParsingException(self.context.get("_parsing_filename")) from e
+
+        return self._value
+
+    def __deepcopy__(self, memo):
+        if self.resolved:
+            return copy.deepcopy(self._value, memo)
+
+        # The context holds caches and locks, so it's shared rather than copied
+        return DeferredValue(self.tag_class, self.context, copy.deepcopy(self.args, memo), copy.deepcopy(self.kwargs, memo))
+
+    def __repr__(self):
+        return "DeferredValue({}, args={!r}, kwargs={!r})".format(self.tag_class.yaml_tag, self.args, self.kwargs)
+
+
+def contains_deferred_values(value):
+    if type(value) is DeferredValue:
+        return True
+
+    if type(value) is dict:
+        return any(contains_deferred_values(v) for v in value.values())
+
+    if type(value) in (list, tuple):
+        return any(contains_deferred_values(v) for v in value)
+
+    return False
+
+
+def update_deferred_contexts(value, context_updates):
+    """
+    Updates the context of every unresolved DeferredValue in value, and in their arguments, with context_updates, for
+    instance to record what they read in another DependencyManifest than the one they were parsed with. The
+    DeferredValues are replaced rather than modified, as they may be shared, for instance by the IncludeCache
+
+    :return: value with every unresolved DeferredValue replaced
+    """
+    if type(value) is DeferredValue:
+        # Copying a resolved value copies its result, which may hold unresolved values of its own
+        if value.resolved:
+            return update_deferred_contexts(copy.deepcopy(value), context_updates)
+
+        return DeferredValue(
+            value.tag_class,
+            {**value.context, **context_updates},
+            update_deferred_contexts(copy.deepcopy(value.args), context_updates),
+            update_deferred_contexts(copy.deepcopy(value.kwargs), context_updates),
+        )
+
+    if type(value) is dict:
+        for k, v in value.items():
+            if type(v) in (DeferredValue, dict, list, tuple):
+                value[k] = update_deferred_contexts(v, context_updates)
+
+    elif type(value) is list:
+        for i, v in enumerate(value):
+            if type(v) in (DeferredValue, dict, list, tuple):
+                value[i] = update_deferred_contexts(v, context_updates)
+
+    elif type(value) is tuple:
+        value = tuple(update_deferred_contexts(v, context_updates) for v in value)
+
+    return value
+
+
+def resolve_deferred_values(value):
+    """
+    Resolves every DeferredValue in value, replacing them in place inside of dicts and lists
+
+    :return: value with every DeferredValue resolved
+    """
+    while type(value) is DeferredValue:
+        value = value.resolve()
+
+    if type(value) is dict:
+        for k, v in value.items():
+            if type(v) in (DeferredValue, dict, list, tuple):
+                value[k] = resolve_deferred_values(v)
+
+    elif type(value) is list:
+        for i, v in enumerate(value):
+            if type(v) in (DeferredValue, dict, list, tuple):
+                value[i] = resolve_deferred_values(v)
+
+    elif type(value) is tuple:
+        value = tuple(resolve_deferred_values(v) for v in value)
+
+    return value
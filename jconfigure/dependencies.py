@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+import hashlib
+import os
+from collections import namedtuple
+
+from .parsers import SUPPORTED_FILE_EXTENSIONS
+
+
+FileFingerprint = namedtuple("FileFingerprint", ["mtime_ns", "size", "sha256"])
+
+
+def fingerprint_file(filename):
+    try:
+        stat = os.stat(filename)
+        with open(filename, "rb") as file_handle:
+            digest = hashlib.sha256(file_handle.read()).hexdigest()
+    except OSError:
+        return None
+
+    return FileFingerprint(mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=digest)
+
+
+def _file_changed(filename, fingerprint):
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return fingerprint is not None
+
+    if fingerprint is None:
+        return True
+
+    if stat.st_mtime_ns == fingerprint.mtime_ns and stat.st_size == fingerprint.size:
+        return False
+
+    # The file was touched, only treat it as changed if its contents actually differ
+    current = fingerprint_file(filename)
+    return current is None or current.sha256 != fingerprint.sha256
+
+
+def _hash_value(value):
+    return None if value is None else hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _hash_context_value(context, key):
+    # Context values can be anything, they are compared by their repr. A key that isn't set hashes to None
+    return _hash_value(repr(context[key])) if key in context else None
+
+
+def _list_config_files_in_directory(directory):
+    try:
+        return tuple(sorted(
+            entry.name for entry in os.scandir(directory)
+            if os.path.splitext(entry.name)[1] in SUPPORTED_FILE_EXTENSIONS
+        ))
+    except OSError:
+        return None
+
+
+class DependencyManifest:
+    """
+    Records every input that was consumed while building a configuration: the files that were parsed or included, the
+    contents of the configuration directories, the environment variables and context keys that were read and whether
+    any tag made the result depend on the current time. Tags find the manifest under the "_dependency_manifest" context
+    key. Only fingerprints of the inputs are kept: the mtime, size and sha256 of files and sha256 hashes of values.
+    """
+    def __init__(self):
+        self.files = {}
+        self.directories = {}
+        self.env_vars = {}
+        self.context_keys = {}
+        self.time_dependent = False
+
+    def __setstate__(self, state):
+        # Manifests pickled in snapshots by earlier versions didn't record context keys
+        self.__dict__.update({"context_keys": {}, **state})
+
+    def record_file(self, filename):
+        filename = os.path.abspath(filename)
+
+        if filename not in self.files:
+            self.files[filename] = fingerprint_file(filename)
+
+    def record_directory(self, directory):
+        directory = os.path.abspath(directory)
+
+        if directory not in self.directories:
+            self.directories[directory] = _list_config_files_in_directory(directory)
+
+    def record_env_var(self, name):
+        if name not in self.env_vars:
+            self.env_vars[name] = _hash_value(os.environ.get(name))
+
+    def record_context_key(self, key, context):
+        if key not in self.context_keys:
+            self.context_keys[key] = _hash_context_value(context, key)
+
+    def record_time_dependency(self):
+        self.time_dependent = True
+
+    def update(self, other):
+        for filename, fingerprint in other.files.items():
+            self.files.setdefault(filename, fingerprint)
+
+        for directory, listing in other.directories.items():
+            self.directories.setdefault(directory, listing)
+
+        for name, value_hash in other.env_vars.items():
+            self.env_vars.setdefault(name, value_hash)
+
+        for key, value_hash in other.context_keys.items():
+            self.context_keys.setdefault(key, value_hash)
+
+        self.time_dependent = self.time_dependent or other.time_dependent
+
+    def is_stale(self, context=None):
+        """
+        :param context: The context the configuration would be built with now. If None, the context keys that were read
+                        are assumed to be unchanged, as when the context is part of the cache key
+        :return: True if any recorded input has changed since it was recorded. Files are compared by mtime and size
+                 first, and only hashed when those differ
+        """
+        if self.time_dependent:
+            return True
+
+        for name, value_hash in self.env_vars.items():
+            if _hash_value(os.environ.get(name)) != value_hash:
+                return True
+
+        if context is not None:
+            for key, value_hash in self.context_keys.items():
+                if _hash_context_value(context, key) != value_hash:
+                    return True
+
+        for directory, listing in self.directories.items():
+            if _list_config_files_in_directory(directory) != listing:
+                return True
+
+        return any(_file_changed(filename, fingerprint) for filename, fingerprint in self.files.items())
+
+    def to_dict(self):
+        """
+        :return: The manifest as a dict of json serializable values, which from_dict turns back into a manifest
+        """
+        return {
+            "files": {f: list(fingerprint) if fingerprint is not None else None for f, fingerprint in self.files.items()},
+            "directories": {d: list(listing) if listing is not None else None for d, listing in self.directories.items()},
+            "env_vars": dict(self.env_vars),
+            "context_keys": dict(self.context_keys),
+            "time_dependent": self.time_dependent,
+        }
+
+    @classmethod
+    def from_dict(cls, manifest_dict):
+        manifest = cls()
+        manifest.files = {
+            f: FileFingerprint(*fingerprint) if fingerprint is not None else None
+            for f, fingerprint in manifest_dict.get("files", {}).items()
+        }
+        manifest.directories = {
+            d: tuple(listing) if listing is not None else None
+            for d, listing in manifest_dict.get("directories", {}).items()
+        }
+        manifest.env_vars = dict(manifest_dict.get("env_vars", {}))
+        manifest.context_keys = dict(manifest_dict.get("context_keys", {}))
+        manifest.time_dependent = manifest_dict.get("time_dependent", False)
+        return manifest
@@ -10,6 +10,12 @@ class FileParsingException(Exception):
         super().__init__("Exception thrown while processing {}".format(filename))
 
 
+# An AttributeError, as merging a config file whose root isn't a mapping raised one before it was checked for
+class ConfigurationRootException(AttributeError):
+    def __init__(self, root):
+        super().__init__("The root of a configuration must be a mapping, not {}".format(type(root).__name__))
+
+
 class TagConstructionException(Exception):
     def __init__(self, tag_name, filename, message):
         super().__init__("Error constructing {tag} tag in file {filename}. {message}".format(
@@ -24,3 +30,17 @@ class TagConstructionException(Exception):
 class UnsupportedNodeTypeException(Exception):
     def __init__(self, tag_parser_type, node_type):
         super().__init__("Yaml Tag Parser {} cannot parse nodes of type {}!".format(tag_parser_type, node_type))
+
+
+class MemoryBudgetExceededException(Exception):
+    def __init__(self, violations):
+        super().__init__("Memory budget exceeded: {}".format("; ".join(violations)))
+
+        self.violations = violations
+
+
+class DaemonQueryException(Exception):
+    def __init__(self, error, message):
+        super().__init__("Configuration daemon failed to answer query, {}: {}".format(error, message))
+
+        self.error = error
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+from collections.abc import Mapping
+
+_MISSING = object()
+
+
+class FrozenDict(Mapping):
+    """
+    An immutable, hashable mapping, used for the nodes of a frozen configuration. Because nothing beneath a FrozenDict
+    can change, copying one returns the same object, and the "modified" copies returned by set, delete and set_in only
+    copy the dicts along the changed path, sharing every other subtree with the original. Frozen configurations can
+    be shared between threads without any copying or locking.
+    """
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data=()):
+        self._data = {k: freeze(v) for k, v in dict(data).items()}
+        self._hash = None
+
+    @classmethod
+    def _from_frozen_dict(cls, data):
+        # Builds a FrozenDict around a dict whose values are already frozen, without copying it
+        frozen_dict = cls.__new__(cls)
+        frozen_dict._data = data
+        frozen_dict._hash = None
+        return frozen_dict
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, FrozenDict):
+            return self is other or self._data == other._data
+
+        return isinstance(other, Mapping) and self._data == dict(other.items())
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+
+        return self._hash
+
+    def __repr__(self):
+        return "FrozenDict({!r})".format(self._data)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return FrozenDict, (self._data,)
+
+    def set(self, key, value):
+        """
+        :return: A copy of this FrozenDict with key set to the frozen value
+        """
+        data = dict(self._data)
+        data[key] = freeze(value)
+        return FrozenDict._from_frozen_dict(data)
+
+    def delete(self, key):
+        """
+        :return: A copy of this FrozenDict without key
+        """
+        data = dict(self._data)
+        del data[key]
+        return FrozenDict._from_frozen_dict(data)
+
+    def set_in(self, path, value):
+        """
+        Sets a value beneath nested FrozenDicts, creating missing ones along the way
+
+        :param path: A sequence of keys, the last of which is set to value
+        :return: A copy of this FrozenDict with the value set, sharing every subtree that isn't on the path
+        """
+        if len(path) == 0:
+            raise ValueError("path must contain at least one key")
+
+        if len(path) == 1:
+            return self.set(path[0], value)
+
+        child = self._data.get(path[0], _MISSING)
+        if not isinstance(child, FrozenDict):
+            child = FrozenDict()
+
+        return self.set(path[0], child.set_in(path[1:], value))
+
+    def thaw(self):
+        """
+        :return: A mutable copy of the configuration made of plain dicts and lists
+        """
+        return thaw(self)
+
+
+def freeze(value):
+    """
+    :return: An immutable copy of value, where dicts and other mappings become FrozenDicts, lists and tuples become
+             tuples and sets become frozensets. Values which are already frozen are returned as they are
+    """
+    value_type = type(value)
+
+    if value_type is FrozenDict:
+        return value
+
+    if value_type is dict or isinstance(value, Mapping):
+        return FrozenDict._from_frozen_dict({k: freeze(v) for k, v in value.items()})
+
+    if value_type is list or value_type is tuple:
+        return tuple(freeze(v) for v in value)
+
+    if value_type is set:
+        return frozenset(value)
+
+    return value
+
+
+def thaw(value):
+    """
+    :return: A mutable copy of a frozen value, where FrozenDicts become dicts and tuples become lists
+    """
+    if type(value) is FrozenDict:
+        return {k: thaw(v) for k, v in value.items()}
+
+    if type(value) is tuple:
+        return [thaw(v) for v in value]
+
+    if type(value) is frozenset:
+        return set(value)
+
+    return value
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+import copy
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from .deferred import contains_deferred_values, update_deferred_contexts
+from .dependencies import DependencyManifest
+from .yaml_tags import get_user_context
+
+_IncludeCacheEntry = namedtuple("_IncludeCacheEntry", ["value", "manifest", "num_bytes"])
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _copy_value(value):
+    return value if type(value) in _IMMUTABLE_TYPES else copy.deepcopy(value)
+
+
+class IncludeCache:
+    """
+    A bounded LRU cache of the results of !IncludeYaml, !IncludeJson and !IncludeText tags. Entries are keyed on the
+    tag, the resolved path of the included file and its mtime and size, the tags which are deferred, and for !IncludeYaml
+    on the context. An entry is only reused while the files and environment variables read while including it are
+    unchanged, and included files that use !Timestamp are never reused. Cached values are copied on the way out, so callers may mutate them.
+
+    configure() creates a new cache for each call by default, pass an instance as include_cache to share one across
+    calls for the lifetime of the process.
+    """
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        """
+        :param max_entries: The maximum number of included files kept in the cache
+        :param max_bytes: The maximum total size of the included files kept in the cache
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._num_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def num_bytes(self):
+        return self._num_bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None or entry.manifest.is_stale():
+            return None
+
+        return entry
+
+    def _insert(self, key, entry):
+        if entry.num_bytes > self.max_bytes or self.max_entries < 1:
+            return False
+
+        with self._lock:
+            previous_entry = self._entries.pop(key, None)
+            if previous_entry is not None:
+                self._num_bytes -= previous_entry.num_bytes
+
+            self._entries[key] = entry
+            self._num_bytes += entry.num_bytes
+
+            while len(self._entries) > self.max_entries or self._num_bytes > self.max_bytes:
+                _, evicted_entry = self._entries.popitem(last=False)
+                self._num_bytes -= evicted_entry.num_bytes
+
+        return True
+
+    def get(self, tag_class, full_file_path, context):
+        """
+        Returns the result of including full_file_path with tag_class, reading it with tag_class.read_included_file if
+        it isn't cached. Raises IOError if the file doesn't exist
+        """
+        stat = os.stat(full_file_path)
+        key = (
+            tag_class.yaml_tag,
+            os.path.abspath(full_file_path),
+            stat.st_mtime_ns,
+            stat.st_size,
+            json.dumps(get_user_context(context), sort_keys=True, default=repr) if tag_class.include_depends_on_context else None,
+            # Included files are parsed with the tags in it deferred or evaluated, depending on the caller
+            frozenset(context.get("_deferred_tags") or ()),
+        )
+
+        parent_manifest = context.get("_dependency_manifest")
+        entry = self._lookup(key)
+
+        if entry is None:
+            self.misses += 1
+            manifest = DependencyManifest()
+            value = tag_class.read_included_file({**context, "_dependency_manifest": manifest}, full_file_path)
+            entry = _IncludeCacheEntry(value=value, manifest=manifest, num_bytes=stat.st_size)
+            inserted = self._insert(key, entry)
+        else:
+            self.hits += 1
+            inserted = True
+
+        value = _copy_value(entry.value) if inserted else entry.value
+
+        if parent_manifest is not None:
+            parent_manifest.update(entry.manifest)
+
+            # Tags deferred inside of the included file are evaluated after this, and have to record what they read in
+            # the caller's manifest, rather than in the entry's, which was already merged into it
+            if contains_deferred_values(value):
+                value = update_deferred_contexts(value, {"_dependency_manifest": parent_manifest})
+
+        return value
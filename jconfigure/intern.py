@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+import sys
+from collections.abc import Mapping
+
+from .frozen import FrozenDict
+
+DEFAULT_MAX_STRING_LENGTH = 64
+
+# Values of these types are only equal to values of the same type if they are the same value. Floats aren't, as
+# -0.0 == 0.0, and neither are datetimes, which are equal at the same instant in different time zones
+_EXACT_SCALAR_TYPES = frozenset([str, int, bool, type(None), bytes])
+
+
+def _scalar_key(value):
+    value_type = type(value)
+
+    if value_type in _EXACT_SCALAR_TYPES:
+        return value_type, value
+
+    if value_type is float:
+        return float, repr(value)
+
+    # Any other value is only shared with itself
+    return value_type, id(value)
+
+
+class Interner:
+    """
+    Deduplicates the strings of parsed config files, so that the many copies of the same keys and short values which
+    the defaults and profile files repeat are held once. Mapping keys are interned with sys.intern, and string values
+    up to max_string_length characters long in a table held by the Interner.
+
+    Frozen configurations can also share whole subtrees: freeze returns the same FrozenDict or tuple for every
+    identical subtree. Mutable configurations never share containers, as modifying one copy would modify all of them.
+    """
+    def __init__(self, max_string_length=DEFAULT_MAX_STRING_LENGTH):
+        self.max_string_length = max_string_length
+        self._strings = {}
+        self._subtrees = {}
+
+    def intern_string(self, value):
+        if len(value) > self.max_string_length:
+            return value
+
+        return self._strings.setdefault(value, value)
+
+    def intern(self, value):
+        """
+        Interns the keys and short string values of value, which is modified in place. Dicts and lists are kept, so
+        objects shared between several places, for instance by yaml anchors, stay shared
+
+        :return: value, or the interned string if value is a string
+        """
+        if type(value) is str:
+            return self.intern_string(value)
+
+        if type(value) is not dict and type(value) is not list:
+            return value
+
+        seen = set()
+        stack = [value]
+
+        while stack:
+            obj = stack.pop()
+
+            if id(obj) in seen:
+                continue
+
+            seen.add(id(obj))
+
+            if type(obj) is dict:
+                items = list(obj.items())
+                obj.clear()
+
+                for k, v in items:
+                    if type(v) is str:
+                        v = self.intern_string(v)
+                    elif type(v) is dict or type(v) is list:
+                        stack.append(v)
+
+                    obj[sys.intern(k) if type(k) is str else k] = v
+            else:
+                for i, v in enumerate(obj):
+                    if type(v) is str:
+                        obj[i] = self.intern_string(v)
+                    elif type(v) is dict or type(v) is list:
+                        stack.append(v)
+
+        return value
+
+    def _share(self, key, frozen_value):
+        return self._subtrees.setdefault(key, frozen_value), key
+
+    def _freeze(self, value):
+        """
+        :return: The frozen value, and a key identifying its contents. Keys include the type of every scalar and mapping
+                 key, so that subtrees which are only equal because 1 == 1.0 == True are not shared, and floats by
+                 their repr, so that 0.0 and -0.0 are not
+        """
+        value_type = type(value)
+
+        if value_type is str:
+            value = self.intern_string(value)
+            return value, (str, value)
+
+        if value_type is dict or isinstance(value, Mapping):
+            children = [(sys.intern(k) if type(k) is str else k, *self._freeze(v)) for k, v in value.items()]
+            return self._share(
+                (FrozenDict, tuple((_scalar_key(k), child_key) for k, _, child_key in children)),
+                FrozenDict._from_frozen_dict({k: frozen_child for k, frozen_child, _ in children}),
+            )
+
+        if value_type is list or value_type is tuple:
+            children = [self._freeze(v) for v in value]
+            return self._share(
+                (tuple, tuple(child_key for _, child_key in children)),
+                tuple(frozen_child for frozen_child, _ in children),
+            )
+
+        if value_type is set or value_type is frozenset:
+            frozen_value = frozenset(value)
+            return self._share((frozenset, frozenset(_scalar_key(v) for v in frozen_value)), frozen_value)
+
+        return value, _scalar_key(value)
+
+    def freeze(self, value):
+        """
+        Freezes value like frozen.freeze, interning strings and returning the same object for identical subtrees
+
+        :return: The frozen value
+        """
+        frozen_value, _ = self._freeze(value)
+        return frozen_value
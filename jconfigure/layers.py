@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+from .merge import copy_containers, merge_configurations
+
+_MISSING = object()
+
+
+def _fold_values(values):
+    """
+    Merges the values a key has in each layer the same way merge_configuration_from_dict_root would: the last non-dict
+    value wins, unless it is followed by dicts, which are merged on top of each other
+    """
+    start = 0
+
+    for i in range(len(values) - 1, -1, -1):
+        if type(values[i]) is not dict:
+            if i == len(values) - 1:
+                return copy_containers(values[i])
+
+            start = i + 1
+            break
+
+    merged = {}
+    for value in values[start:]:
+        merge_configurations(merged, value)
+
+    return merged
+
+
+def _values_differ(old_value, new_value):
+    return old_value is not new_value and (type(old_value) is dict or old_value != new_value)
+
+
+def _remerge(merged, layer_configs, index, old_config, new_config):
+    """
+    Updates the keys of merged touched by replacing old_config with new_config at position index of layer_configs.
+    layer_configs already contains new_config. Only dicts along the changed paths are copied, so the returned dict
+    shares every unchanged subtree with merged, and merged itself is never modified
+
+    :return: merged if nothing changed, otherwise the updated copy
+    """
+    updated = None
+
+    for key in [*old_config, *(k for k in new_config if k not in old_config)]:
+        old_value = old_config.get(key, _MISSING)
+        new_value = new_config.get(key, _MISSING)
+
+        if not _values_differ(old_value, new_value):
+            continue
+
+        key_layers = [c[key] for c in layer_configs[:index] if key in c]
+        key_index = len(key_layers)
+        key_layers.extend(c[key] for c in layer_configs[index:] if key in c)
+
+        if type(old_value) is dict and type(new_value) is dict:
+            last_non_dict = max((i for i, v in enumerate(key_layers) if type(v) is not dict), default=-1)
+            if key_index < last_non_dict:
+                continue
+
+            merged_value = _remerge(
+                merged[key],
+                key_layers[last_non_dict + 1:],
+                key_index - last_non_dict - 1,
+                old_value,
+                new_value,
+            )
+        elif len(key_layers) == 0:
+            merged_value = _MISSING
+        else:
+            merged_value = _fold_values(key_layers)
+
+        current_value = merged.get(key, _MISSING)
+        if merged_value is current_value or (merged_value is not _MISSING and current_value == merged_value):
+            continue
+
+        if updated is None:
+            updated = dict(merged)
+
+        if merged_value is _MISSING:
+            del updated[key]
+        else:
+            updated[key] = merged_value
+
+    return merged if updated is None else updated
+
+
+class LayeredConfiguration:
+    """
+    Keeps each parsed config file as a separate layer, in the order they are merged, along with the merged result.
+    Replacing, adding or removing a layer only re-merges the keys that layer touches, and the subtrees beneath them it
+    changes. The merged configuration is never modified in place: every change produces a new merged dict that shares
+    all unchanged subtrees with the previous one, so the shared subtrees must not be modified by callers.
+    """
+    def __init__(self, layers=()):
+        """
+        :param layers: An iterable of (name, config) pairs, in the order they are merged
+        """
+        self._layers = []
+        self.merged = {}
+
+        for name, config in layers:
+            self._layers.append((name, config or {}))
+            merge_configurations(self.merged, config or {})
+
+    @property
+    def names(self):
+        return [name for name, _ in self._layers]
+
+    def get_layer(self, name):
+        for layer_name, config in self._layers:
+            if layer_name == name:
+                return config
+
+        raise KeyError(name)
+
+    def _replace_at(self, index, config):
+        name, old_config = self._layers[index]
+        self._layers[index] = (name, config)
+        self.merged = _remerge(self.merged, [c for _, c in self._layers], index, old_config, config)
+
+    def set_layer(self, name, config):
+        """
+        Replaces the config of every layer called name, or adds a new last layer if there is no such layer
+
+        :return: True if the merged configuration changed
+        """
+        previous_merged = self.merged
+        indexes = [i for i, (layer_name, _) in enumerate(self._layers) if layer_name == name]
+
+        if len(indexes) == 0:
+            return self.insert_layer(len(self._layers), name, config)
+
+        for index in indexes:
+            self._replace_at(index, config or {})
+
+        return self.merged is not previous_merged
+
+    def insert_layer(self, index, name, config):
+        """
+        Inserts a new layer at position index
+
+        :return: True if the merged configuration changed
+        """
+        previous_merged = self.merged
+        self._layers.insert(index, (name, {}))
+        self._replace_at(index, config or {})
+
+        return self.merged is not previous_merged
+
+    def remove_layer(self, name):
+        """
+        Removes every layer called name
+
+        :return: True if the merged configuration changed
+        """
+        previous_merged = self.merged
+
+        while name in self.names:
+            index = self.names.index(name)
+            self._replace_at(index, {})
+            del self._layers[index]
+
+        return self.merged is not previous_merged
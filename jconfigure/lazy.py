@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+import copy
+from collections.abc import Mapping
+
+from .deferred import DeferredValue, resolve_deferred_values
+from .merge import REPLACE, merge_lists
+
+
+class LazyMergedView(Mapping):
+    """
+    A read-only Mapping over the parsed config files, in the order they would be merged. Nothing is merged up front:
+    the winning value of a key is worked out the first time it is accessed, with the same override semantics as
+    merge_configuration_from_dict_root, and memoized. Keys whose winning value is a dict resolve to another
+    LazyMergedView over the dicts being merged. Use to_dict() to build the fully merged plain dict.
+    """
+    __slots__ = ("_layers", "_resolved", "_keys", "_strategies", "_path")
+
+    def __init__(self, layers, strategies=None, path=()):
+        """
+        :param layers: The dicts to merge, in order
+        :param strategies: Merge strategies keyed by tuples of keys, as returned by normalize_merge_strategies
+        :param path: The keys leading to this view from the root of the configuration
+        """
+        self._layers = [layer for layer in layers if layer]
+        self._resolved = {}
+        self._keys = None
+        self._strategies = strategies
+        self._path = path
+
+    def _merge_lists(self, values, strategy):
+        """
+        Merges the trailing run of lists in values with a list strategy, resolving deferred values which might be lists
+        """
+        lists = []
+
+        for i in range(len(values) - 1, -1, -1):
+            value = values[i].resolve() if type(values[i]) is DeferredValue else values[i]
+            if type(value) is not list:
+                break
+
+            lists.append(value)
+
+        merged = lists.pop()
+        while lists:
+            merged = merge_lists(merged, lists.pop(), strategy)
+
+        return resolve_deferred_values(merged)
+
+    def _resolve(self, key):
+        values = [layer[key] for layer in self._layers if key in layer]
+
+        if len(values) == 0:
+            raise KeyError(key)
+
+        path = self._path + (key,) if self._strategies else ()
+        strategy = self._strategies.get(path) if self._strategies else None
+
+        if strategy == REPLACE:
+            values = values[-1:]
+
+        elif strategy is not None:
+            if type(values[-1]) is DeferredValue:
+                values[-1] = values[-1].resolve()
+
+            if type(values[-1]) is list:
+                return self._merge_lists(values, strategy)
+
+        dict_values = []
+
+        for i in range(len(values) - 1, -1, -1):
+            # Deferred values are resolved only when they win, or when they could be a dict merged with a later one
+            if type(values[i]) is DeferredValue and (len(dict_values) == 0 or values[i].may_be_mapping):
+                values[i] = values[i].resolve()
+
+            if type(values[i]) is not dict:
+                break
+
+            dict_values.append(values[i])
+
+        if len(dict_values) == 0:
+            return resolve_deferred_values(values[-1])
+
+        dict_values.reverse()
+        return LazyMergedView(dict_values, self._strategies, path)
+
+    def __getitem__(self, key):
+        try:
+            return self._resolved[key]
+        except KeyError:
+            value = self._resolved[key] = self._resolve(key)
+            return value
+
+    def __contains__(self, key):
+        return key in self._resolved or any(key in layer for layer in self._layers)
+
+    def _get_keys(self):
+        if self._keys is None:
+            self._keys = list(dict.fromkeys(key for layer in self._layers for key in layer))
+
+        return self._keys
+
+    def __iter__(self):
+        return iter(self._get_keys())
+
+    def __len__(self):
+        return len(self._get_keys())
+
+    def __repr__(self):
+        return "LazyMergedView({!r})".format(self._layers)
+
+    def to_dict(self):
+        """
+        :return: The fully merged configuration as a plain dict, which shares nothing with the parsed files
+        """
+        return {
+            key: value.to_dict() if type(value) is LazyMergedView else copy.deepcopy(value)
+            for key, value in self.items()
+        }
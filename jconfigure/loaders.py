@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+import inspect
+import itertools
+
+from yaml.nodes import MappingNode, SequenceNode
+
+
+def _tracking_pending_construction(constructor):
+    # PyYAML constructs mappings and sequences with generators, which yield the empty object and fill it in once
+    # the rest of the document is constructed. Each one is recorded until then, so it can be finished early
+    def construct(loader, node):
+        generator = constructor(loader, node)
+        data = next(generator)
+        loader.pending_constructions[node] = generator
+        yield data
+
+        if loader.pending_constructions.pop(node, None) is not None:
+            yield from generator
+
+    construct.tracks_pending_construction = True
+    return construct
+
+
+class ContextPassingLoader:
+    """
+    Mixed into jconfigure's loader classes, ahead of a PyYAML loader class. The loader is constructed with the context
+    that tags are evaluated with, and keeps track of the mappings and sequences which PyYAML hasn't finished
+    constructing yet, so construct_pending can finish the ones a tag refers to through an alias
+    """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        for tag, constructor in list(cls.yaml_constructors.items()):
+            if inspect.isgeneratorfunction(constructor) and not getattr(constructor, "tracks_pending_construction", False):
+                cls.add_constructor(tag, _tracking_pending_construction(constructor))
+
+    def __init__(self, stream, context):
+        super().__init__(stream)
+        self.context = context
+        self.pending_constructions = {}
+
+    def construct_pending(self, node):
+        """
+        Finishes constructing every mapping and sequence under node which was constructed, but not yet filled in,
+        including the ones node refers to through aliases. Everything else is left to be constructed in document order
+        """
+        if not self.pending_constructions:
+            return
+
+        nodes = [node]
+        visited = set()
+
+        while nodes:
+            node = nodes.pop()
+            if node in visited:
+                continue
+
+            visited.add(node)
+
+            generator = self.pending_constructions.pop(node, None)
+            if generator is not None:
+                deep_construct = self.deep_construct
+                self.deep_construct = True
+
+                try:
+                    for _ in generator:
+                        pass
+                finally:
+                    self.deep_construct = deep_construct
+
+            if isinstance(node, SequenceNode):
+                nodes.extend(node.value)
+            elif isinstance(node, MappingNode):
+                nodes.extend(itertools.chain.from_iterable(node.value))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+import copy
+import logging
+import logging.config
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+# The sections of a logging config which can be applied one logger or handler at a time. A change to any other key,
+# like version or disable_existing_loggers, or to a formatter or filter, reconfigures logging from scratch
+_INCREMENTAL_SECTIONS = {"handlers", "loggers", "root"}
+
+_lock = threading.Lock()
+_applied_logging_config = None
+
+
+class _FullReconfigurationRequired(Exception):
+    pass
+
+
+def _changed_names(previous, current):
+    return {name for name in previous.keys() | current.keys() if previous.get(name) != current.get(name)}
+
+
+def _get_existing_handlers(names):
+    handlers = {}
+
+    for name in names:
+        # Handlers created by dictConfig are registered by name, and kept alive by the loggers they are attached to
+        handler = logging._handlers.get(name)
+        if handler is None:
+            raise _FullReconfigurationRequired("handler {} no longer exists".format(name))
+
+        handlers[name] = handler
+
+    return handlers
+
+
+def _configure_handlers(configurator, names):
+    # Handlers can refer to other handlers, like a MemoryHandler to its target, so they are configured in as many
+    # passes as it takes for the handlers they refer to to be configured
+    handlers_config = configurator.config["handlers"]
+    remaining = sorted(names)
+
+    while remaining:
+        deferred = []
+
+        for name in remaining:
+            try:
+                handler = configurator.configure_handler(handlers_config[name])
+            except Exception as e:
+                if "target not configured yet" not in str(e.__cause__):
+                    raise
+
+                deferred.append(name)
+                continue
+
+            handler.name = name
+            handlers_config[name] = handler
+
+        if len(deferred) == len(remaining):
+            raise _FullReconfigurationRequired("handlers {} can't be configured".format(", ".join(deferred)))
+
+        remaining = deferred
+
+
+def _loggers_with_handler(handler):
+    loggers = [logging.getLogger()]
+    loggers.extend(l for l in logging.Logger.manager.loggerDict.values() if isinstance(l, logging.Logger))
+    return [l for l in loggers if handler in l.handlers]
+
+
+def _handle_existing_loggers(logger_names, disable_existing):
+    # The same as dictConfig does with the loggers which aren't in the config: the children of configured loggers are
+    # reset to log through their parents, and the others are disabled, or enabled if disable_existing isn't set
+    child_prefixes = tuple(name + "." for name in logger_names)
+
+    for name, logger in list(logging.Logger.manager.loggerDict.items()):
+        if name in logger_names:
+            continue
+
+        if name.startswith(child_prefixes):
+            if not isinstance(logger, logging.PlaceHolder):
+                logger.setLevel(logging.NOTSET)
+                logger.handlers = []
+                logger.propagate = True
+        else:
+            logger.disabled = disable_existing
+
+
+def _apply_changes(previous, current):
+    """
+    Replaces the handlers whose config changed, and reconfigures the loggers whose config changed or which use one of
+    those handlers. Existing handlers whose config didn't change are kept, without being closed or reopened
+    """
+    if {k: v for k, v in previous.items() if k not in _INCREMENTAL_SECTIONS} != \
+            {k: v for k, v in current.items() if k not in _INCREMENTAL_SECTIONS}:
+        raise _FullReconfigurationRequired("a setting other than the handlers and loggers changed")
+
+    if current.get("incremental", False):
+        raise _FullReconfigurationRequired("the config is incremental")
+
+    previous_loggers, current_loggers = previous.get("loggers", {}), current.get("loggers", {})
+    if previous_loggers.keys() - current_loggers.keys():
+        raise _FullReconfigurationRequired("loggers were removed")
+
+    previous_handlers, current_handlers = previous.get("handlers", {}), current.get("handlers", {})
+    changed_handlers = _changed_names(previous_handlers, current_handlers)
+    existing_handlers = _get_existing_handlers(previous_handlers.keys())
+
+    configurator = logging.config.DictConfigurator(copy.deepcopy(current))
+    config = configurator.config
+
+    with logging._lock:
+        for section, configure in [("formatters", configurator.configure_formatter), ("filters", configurator.configure_filter)]:
+            for name in config.get(section, {}):
+                config[section][name] = configure(config[section][name])
+
+        for name in current_handlers.keys() - changed_handlers:
+            config["handlers"][name] = existing_handlers[name]
+
+        _configure_handlers(configurator, changed_handlers & current_handlers.keys())
+
+        for name, logger_config in current_loggers.items():
+            if logger_config != previous_loggers.get(name) or changed_handlers & set(logger_config.get("handlers", [])):
+                configurator.configure_logger(name, config["loggers"][name])
+            else:
+                logging.getLogger(name).disabled = False
+
+        # Loggers created since the last config was applied are disabled, as dictConfig would, so the state of logging
+        # doesn't depend on whether a config was applied incrementally or not
+        _handle_existing_loggers(current_loggers.keys(), current.get("disable_existing_loggers", True))
+
+        root_config = current.get("root")
+        if root_config is not None and (
+            root_config != previous.get("root") or changed_handlers & set(root_config.get("handlers", []))
+        ):
+            configurator.configure_root(config["root"])
+
+        for name in changed_handlers & existing_handlers.keys():
+            old_handler = existing_handlers[name]
+
+            for logger in _loggers_with_handler(old_handler):
+                logger.removeHandler(old_handler)
+
+            old_handler.close()
+
+            # Closing a handler unregisters its name, which now belongs to the handler replacing it
+            if name in current_handlers:
+                config["handlers"][name].name = name
+
+    _LOGGER.debug("Reconfigured logging handlers [{}]".format(", ".join(sorted(changed_handlers))))
+
+
+def apply_logging_config(logging_config):
+    """
+    Configures logging with logging_config, doing as little as possible. Nothing is done if it is the same as the
+    config that was last applied. Otherwise only the handlers whose config changed are replaced, and only the loggers
+    whose config changed, or which use one of those handlers, are reconfigured, so the files and sockets of the other
+    handlers stay open. Existing loggers which aren't in the config are disabled when disable_existing_loggers is set,
+    and the children of configured loggers are reset, the same as with dictConfig. Changes to anything other than the
+    handlers and loggers, like the formatters or disable_existing_loggers, or loggers being removed, reconfigure logging
+    from scratch with dictConfig
+
+    :return: True if logging was reconfigured
+    """
+    global _applied_logging_config
+
+    with _lock:
+        if logging_config == _applied_logging_config:
+            return False
+
+        applied_logging_config = copy.deepcopy(logging_config)
+
+        if _applied_logging_config is None:
+            logging.config.dictConfig(logging_config)
+        else:
+            try:
+                _apply_changes(_applied_logging_config, logging_config)
+            except _FullReconfigurationRequired as e:
+                _LOGGER.debug("Reconfiguring logging from scratch, {}".format(e))
+                logging.config.dictConfig(logging_config)
+            except Exception:
+                _LOGGER.debug("Failed to reconfigure logging incrementally, reconfiguring from scratch", exc_info=True)
+                logging.config.dictConfig(logging_config)
+
+        _applied_logging_config = applied_logging_config
+        return True
+
+
+def reset_applied_logging_config():
+    """
+    Forgets the logging config that was last applied, so the next one is applied with dictConfig, for instance after
+    logging was configured by something other than jconfigure
+    """
+    global _applied_logging_config
+
+    with _lock:
+        _applied_logging_config = None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+import sys
+import threading
+import tracemalloc
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+from .exceptions import MemoryBudgetExceededException
+
+
+def deep_getsizeof(value, seen=None):
+    """
+    Walks value iteratively and sums sys.getsizeof of every object reachable through dicts, Mappings, lists, tuples and
+    sets, counting objects which are referenced more than once a single time
+
+    :param seen: A set of ids of objects which are not counted, it is updated with the ids of every object counted
+    """
+    seen = set() if seen is None else seen
+    stack = [value]
+    size = 0
+
+    while stack:
+        obj = stack.pop()
+
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if type(obj) is dict or isinstance(obj, Mapping):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif type(obj) in (list, tuple, set, frozenset):
+            stack.extend(obj)
+
+    return size
+
+
+class MemoryReport:
+    """
+    Collects memory accounting for a configure() call, when passed as its memory_report argument:
+
+    * file_allocations: The bytes allocated and still held after parsing each config file, as measured by tracemalloc.
+      This includes the files it includes with !Include* tags
+    * include_allocations: The same, for each file included with an !Include* tag and not served from the include cache
+    * subtree_sizes: The retained size of each top level key of the resulting configuration, measured with
+      deep_getsizeof. Objects shared between subtrees are counted in each of them
+    * total_size: The retained size of the whole configuration, counting every object once
+
+    tracemalloc is started for the duration of configure() if it isn't already tracing. It measures allocations across
+    all threads, so when files are parsed concurrently with parse_workers, the allocations of files parsed at the same
+    time are mixed together.
+    """
+    def __init__(self):
+        self.file_allocations = {}
+        self.include_allocations = {}
+        self.subtree_sizes = {}
+        self.total_size = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, kind, name):
+        """
+        Adds the bytes allocated and still held by the end of the wrapped block to the allocations of name
+
+        :param kind: Either "file" or "include"
+        """
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        start, _ = tracemalloc.get_traced_memory()
+
+        try:
+            yield
+        finally:
+            allocated, _ = tracemalloc.get_traced_memory()
+            allocations = self.file_allocations if kind == "file" else self.include_allocations
+
+            with self._lock:
+                # Objects freed during the block can outweigh those allocated, which is counted as nothing held
+                allocations[name] = allocations.get(name, 0) + max(allocated - start, 0)
+
+    def record_configuration(self, config):
+        """
+        Records the retained size of config, and of each of its top level keys
+        """
+        self.subtree_sizes = {key: deep_getsizeof(value) for key, value in config.items()}
+        self.total_size = deep_getsizeof(config)
+
+    def check_budget(self, max_total_size=None, max_subtree_size=None, max_file_allocation=None):
+        """
+        Raises a MemoryBudgetExceededException listing every limit that was exceeded. Limits that are None aren't
+        checked
+        """
+        violations = []
+
+        if max_total_size is not None and self.total_size > max_total_size:
+            violations.append("configuration retains {} bytes, over the budget of {}".format(
+                self.total_size,
+                max_total_size,
+            ))
+
+        if max_subtree_size is not None:
+            violations.extend(
+                "subtree {} retains {} bytes, over the budget of {}".format(key, size, max_subtree_size)
+                for key, size in self.subtree_sizes.items() if size > max_subtree_size
+            )
+
+        if max_file_allocation is not None:
+            violations.extend(
+                "parsing {} allocated {} bytes, over the budget of {}".format(filename, size, max_file_allocation)
+                for filename, size in self.file_allocations.items() if size > max_file_allocation
+            )
+
+        if violations:
+            raise MemoryBudgetExceededException(violations)
+
+
+@contextmanager
+def tracing_memory(enabled=True):
+    """
+    Starts tracemalloc for the wrapped block if enabled, unless it is already tracing
+    """
+    if not enabled or tracemalloc.is_tracing():
+        yield
+        return
+
+    tracemalloc.start()
+
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
+
+
+@contextmanager
+def measure_memory(memory_report, kind, name):
+    """
+    Measures the wrapped block with memory_report, or does nothing if memory_report is None
+    """
+    if memory_report is None:
+        yield
+        return
+
+    with memory_report.measure(kind, name):
+        yield
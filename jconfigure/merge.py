@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+import copy
+from collections.abc import Mapping
+
+from .deferred import DeferredValue
+from .exceptions import ConfigurationRootException
+
+# Merge strategies which can be set for a path in the configuration
+REPLACE = "replace"  # The override replaces the value, even when both are dicts
+APPEND = "append"  # Lists are concatenated, other values are replaced
+UNIQUE = "unique"  # Items of the override list which aren't in the base list are appended to it
+
+MERGE_STRATEGIES = (REPLACE, APPEND, UNIQUE)
+
+_MISSING = object()
+
+MAX_RECURSION_DEPTH = 32
+
+# Values of these types always replace the base value, without having to check whether they're a Mapping
+_REPLACING_TYPES = frozenset([str, int, float, bool, type(None), list])
+
+
+def _is_mapping(value):
+    return type(value) is dict or (type(value) is not list and isinstance(value, Mapping))
+
+
+def _may_be_mapping(value):
+    return _is_mapping(value) or (type(value) is DeferredValue and value.may_be_mapping)
+
+
+def normalize_merge_strategies(strategies):
+    """
+    :param strategies: A mapping of path -> strategy, where a path is either a tuple of keys, or a string of keys
+                       separated by dots
+    :return: The strategies keyed by tuples of keys
+    """
+    if not strategies:
+        return None
+
+    normalized = {}
+
+    for path, strategy in strategies.items():
+        if strategy not in MERGE_STRATEGIES:
+            raise ValueError("Unknown merge strategy {} for path {}, must be one of {}".format(
+                strategy,
+                path,
+                ", ".join(MERGE_STRATEGIES),
+            ))
+
+        normalized[tuple(path.split(".")) if type(path) is str else tuple(path)] = strategy
+
+    return normalized
+
+
+def copy_containers(value):
+    """
+    Copies the dicts, Mappings, lists and sets in value, iteratively so arbitrarily deep values can be copied. Mappings
+    are copied into dicts. Every other value is treated as immutable and shared with the copy, except for
+    DeferredValues, which are deep copied
+    """
+    if type(value) is DeferredValue:
+        return copy.deepcopy(value)
+
+    if type(value) is set:
+        return set(value)
+
+    if not _is_mapping(value) and type(value) is not list:
+        return value
+
+    copied = {} if _is_mapping(value) else []
+    stack = [(value, copied)]
+
+    while stack:
+        source, target = stack.pop()
+
+        if type(target) is dict:
+            for k, v in source.items():
+                if type(v) is list or _is_mapping(v):
+                    target[k] = child = {} if _is_mapping(v) else []
+                    stack.append((v, child))
+                elif type(v) is DeferredValue:
+                    target[k] = copy.deepcopy(v)
+                elif type(v) is set:
+                    target[k] = set(v)
+                else:
+                    target[k] = v
+        else:
+            for v in source:
+                if type(v) is list or _is_mapping(v):
+                    child = {} if _is_mapping(v) else []
+                    target.append(child)
+                    stack.append((v, child))
+                elif type(v) is DeferredValue:
+                    target.append(copy.deepcopy(v))
+                elif type(v) is set:
+                    target.append(set(v))
+                else:
+                    target.append(v)
+
+    return copied
+
+
+def merge_lists(base_list, override_list, strategy):
+    """
+    :return: The list resulting from merging override_list into base_list with an APPEND or UNIQUE strategy
+    """
+    if strategy == APPEND:
+        return base_list + override_list
+
+    merged = list(base_list)
+
+    for item in override_list:
+        if item not in merged:
+            merged.append(item)
+
+    return merged
+
+
+def _merge_value(base, k, v, strategy):
+    """
+    Merges a single value, which is either a Mapping, a DeferredValue or has a strategy, into base
+
+    :return: A (base dict, override mapping) pair which still has to be merged, or None
+    """
+    base_value = base.get(k, _MISSING)
+
+    if strategy == REPLACE:
+        base[k] = v
+        return None
+
+    if strategy is not None and base_value is not _MISSING:
+        # Deferred values might be lists, so they are resolved to apply the strategy
+        if type(base_value) is DeferredValue:
+            base_value = base[k] = base_value.resolve()
+
+        if type(v) is DeferredValue:
+            v = v.resolve()
+
+        if type(v) is list and type(base_value) is list:
+            base[k] = merge_lists(base_value, v, strategy)
+            return None
+
+    if type(v) is DeferredValue and v.may_be_mapping and _may_be_mapping(base_value):
+        v = v.resolve()
+
+    if type(base_value) is DeferredValue and base_value.may_be_mapping and _is_mapping(v):
+        base_value = base[k] = base_value.resolve()
+
+    if _is_mapping(v) and _is_mapping(base_value):
+        if type(base_value) is not dict:
+            base_value = base[k] = dict(base_value)
+
+        return base_value, v
+
+    base[k] = v
+    return None
+
+
+def _merge_dicts(base, over, stack, depth):
+    # Nested dicts are merged by recursing, which is the fastest way on CPython, until MAX_RECURSION_DEPTH is reached,
+    # then they are pushed onto the stack instead, so configurations can be nested arbitrarily deeply
+    if not base:
+        base.update(over)
+        return
+
+    get = base.get
+
+    for k, v in over.items():
+        value_type = type(v)
+
+        if value_type is dict:
+            base_value = get(k)
+
+            if type(base_value) is dict:
+                if depth < MAX_RECURSION_DEPTH:
+                    _merge_dicts(base_value, v, stack, depth + 1)
+                else:
+                    stack.append((base_value, v))
+
+                continue
+
+        elif value_type in _REPLACING_TYPES:
+            base[k] = v
+            continue
+
+        to_merge = _merge_value(base, k, v, None)
+        if to_merge is not None:
+            stack.append(to_merge)
+
+
+def _merge_plain_dicts(base, over, stack, depth):
+    # The same as _merge_dicts, for values which are only dicts, lists and plain values, which can skip checking for
+    # DeferredValues and other Mappings
+    for k, v in over.items():
+        if type(v) is dict and type(base.get(k)) is dict:
+            if depth < MAX_RECURSION_DEPTH:
+                _merge_plain_dicts(base[k], v, stack, depth + 1)
+            else:
+                stack.append((base[k], v))
+        else:
+            base[k] = v
+
+
+def _merge(base_config, overrides, merge_dicts):
+    stack = [(base_config, overrides)]
+
+    while stack:
+        base, over = stack.pop()
+        merge_dicts(base, over, stack, 0)
+
+
+def _merge_with_strategies(base_config, overrides, strategies):
+    stack = [(base_config, overrides, ())]
+
+    while stack:
+        base, over, path = stack.pop()
+
+        for k, v in over.items():
+            key_path = path + (k,)
+            to_merge = _merge_value(base, k, v, strategies.get(key_path))
+
+            if to_merge is not None:
+                stack.append((*to_merge, key_path))
+
+
+def merge_configurations(base_config, overrides, strategies=None, copy_overrides=True, plain=False):
+    """
+    Merges overrides into base_config in place. Values in overrides replace those in base_config, except where both
+    are dicts (or other Mappings), which are merged key by key. Nesting deeper than MAX_RECURSION_DEPTH is merged with
+    an explicit stack instead of recursion, so there is no limit on how deeply configurations are nested.
+
+    DeferredValues are only resolved when they might be a dict which has to be merged with another dict, or when a
+    list strategy applies to them.
+
+    :param strategies: An optional mapping of path -> strategy. A path is a tuple of keys or a dot separated string
+                       of keys, and the strategy one of REPLACE, APPEND or UNIQUE
+    :param copy_overrides: If True, the dicts and lists of overrides are copied before merging, so modifying the
+                           merged configuration never modifies overrides. Pass False when overrides is discarded
+                           after merging, to avoid the copies
+    :param plain: If True, the caller guarantees that base_config and overrides only hold dicts, lists and plain values,
+                  and no DeferredValues or other Mappings, so they are merged without checking for them
+    :return: base_config
+    :raises ConfigurationRootException: If overrides isn't a Mapping, for instance the contents of an empty yaml file
+    """
+    if not _is_mapping(overrides):
+        raise ConfigurationRootException(overrides)
+
+    if type(strategies) is not dict or not all(type(path) is tuple for path in strategies):
+        strategies = normalize_merge_strategies(strategies)
+
+    if copy_overrides:
+        overrides = copy_containers(overrides)
+
+    if strategies:
+        _merge_with_strategies(base_config, overrides, strategies)
+    elif plain and not base_config:
+        # Nothing to merge into, which is the case for the first file of every configuration
+        base_config.update(overrides)
+    elif plain:
+        _merge(base_config, overrides, _merge_plain_dicts)
+    else:
+        _merge(base_config, overrides, _merge_dicts)
+
+    return base_config
@@ -14,6 +14,11 @@ class JsonConfigFileParser:
         with open(filename) as json_file:
             return json.load(json_file)
 
+    @staticmethod
+    def stream_merge(filename, context, streaming_merge):
+        # The json module can't parse incrementally, so json files are parsed in full and then merged
+        streaming_merge.merge_earlier(JsonConfigFileParser.parse(filename, context))
+
 
 class YamlConfigFileParser:
     FILE_EXTENSIONS = [".yaml", ".yml"]
@@ -21,10 +26,12 @@ class YamlConfigFileParser:
     @staticmethod
     def parse(filename, context):
         with open(filename) as yaml_file:
-            return yaml.load(
-                yaml_file,
-                Loader=lambda stream: ContextPassingYamlLoader(stream, {**context, "_parsing_filename": filename}),
-            )
+            return load_yaml_with_context(yaml_file, {**context, "_parsing_filename": filename})
+
+    @staticmethod
+    def stream_merge(filename, context, streaming_merge):
+        with open(filename) as yaml_file:
+            streaming_merge.merge_earlier_yaml(yaml_file, {**context, "_parsing_filename": filename})
 
 
 AVAILABLE_FILE_PARSERS = [
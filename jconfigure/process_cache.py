@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+import inspect
+import json
+import os
+import threading
+
+from . import _get_active_profiles, _get_configuration_dirs, configure
+
+
+class _Entry:
+    __slots__ = ("ready", "config", "exception", "keyed_objects")
+
+    def __init__(self, keyed_objects=()):
+        self.ready = threading.Event()
+        self.config = None
+        self.exception = None
+        # Objects which are part of the key by their id, kept alive so that no other object gets the same id
+        self.keyed_objects = keyed_objects
+
+
+_CONFIGURE_SIGNATURE = inspect.signature(configure)
+
+# Arguments which collect information or cache intermediate results, but don't change the configuration that is built
+_UNKEYED_ARGUMENTS = frozenset(["snapshot_cache", "tracer", "dependency_manifest", "include_cache", "memory_report"])
+
+
+def _get_key(configure_kwargs):
+    """
+    Defaults are filled in, so passing an argument's default is the same as leaving it out, and the directories and
+    profiles are resolved, so the key changes with the environment variables they are read from. Values json can't
+    represent are keyed by their repr, or by their id if their repr is the default one, which holds their address
+
+    :return: The key, and the objects which are part of it by their id
+    """
+    arguments = _CONFIGURE_SIGNATURE.bind(**configure_kwargs)
+    arguments.apply_defaults()
+
+    effective_kwargs = {
+        **{k: v for k, v in arguments.arguments.items() if k not in _UNKEYED_ARGUMENTS},
+        "configuration_dirs": _get_configuration_dirs(arguments.arguments["configuration_dirs"]),
+        "active_profiles": _get_active_profiles(arguments.arguments["active_profiles"]),
+    }
+    keyed_objects = []
+
+    def key_object(value):
+        if type(value).__repr__ is not object.__repr__:
+            return {"type": type(value).__qualname__, "repr": repr(value)}
+
+        keyed_objects.append(value)
+        return {"type": type(value).__qualname__, "id": id(value)}
+
+    return json.dumps(effective_kwargs, sort_keys=True, default=key_object), keyed_objects
+
+
+class _ConfigurationCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, configure_kwargs):
+        key, keyed_objects = _get_key(configure_kwargs)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            building = entry is None
+
+            if building:
+                entry = self._entries[key] = _Entry(keyed_objects)
+
+        if not building:
+            entry.ready.wait()
+
+            if entry.exception is not None:
+                raise entry.exception
+
+            return entry.config
+
+        try:
+            entry.config = configure(**configure_kwargs)
+        except BaseException as e:
+            # Failures aren't cached, the next call tries again
+            entry.exception = e
+
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+
+            raise
+        finally:
+            entry.ready.set()
+
+        return entry.config
+
+    def invalidate(self, configure_kwargs):
+        with self._lock:
+            if configure_kwargs:
+                key, _ = _get_key(configure_kwargs)
+                self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+
+    def reset_after_fork(self):
+        # The lock may have been held by another thread at the time of the fork, and configurations which were being
+        # built by other threads never will be in the child, so only the finished configurations are kept
+        self._lock = threading.Lock()
+        self._entries = {key: entry for key, entry in self._entries.items() if entry.ready.is_set()}
+
+
+_CACHE = _ConfigurationCache()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_CACHE.reset_after_fork)
+
+
+def get_configuration(**configure_kwargs):
+    """
+    Returns the configuration built by configure with these arguments, building it only the first time it is requested
+    by the process. Threads requesting a configuration which is still being built wait for it, rather than building it
+    again. Configurations are cached by the effective configuration directories and active profiles, so changes to the
+    JCONFIGURE_CONFIG_DIRECTORIES and JCONFIGURE_ACTIVE_PROFILES environment variables build a new configuration.
+
+    Every caller shares the same configuration, so it must not be modified, pass frozen=True to get one which can't be.
+    Arguments that collect information or cache intermediate results, like dependency_manifest, memory_report or
+    include_cache, aren't part of the key, and are only used by the call which builds the configuration. Other objects,
+    like those in the context, are part of the key by their repr, or by their identity if they don't define a repr, in
+    which case the cached configuration keeps them alive. Configurations stay cached in processes forked after they
+    were built.
+
+    :param configure_kwargs: The arguments of configure
+    :return: The configuration
+    """
+    return _CACHE.get(configure_kwargs)
+
+
+def invalidate_configuration(**configure_kwargs):
+    """
+    Removes the configuration built with these arguments from the cache of get_configuration, so the next call builds
+    it again. Removes every cached configuration if called without arguments
+    """
+    _CACHE.invalidate(configure_kwargs)
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+import logging
+import os
+import threading
+from collections import namedtuple
+
+from . import (
+    _apply_logging_config,
+    _check_missing_basenames,
+    _find_config_files,
+    _get_active_profiles,
+    _get_configuration_dirs,
+    _index_configuration_dirs,
+    _parse_file_handle_exceptions,
+)
+from .dependencies import DependencyManifest
+from .include_cache import IncludeCache
+from .layers import LayeredConfiguration
+from .watch import create_watcher
+
+_LOGGER = logging.getLogger(__name__)
+
+_ParsedConfigFile = namedtuple("_ParsedConfigFile", ["filename", "config", "manifest"])
+
+
+class ReloadableConfiguration:
+    """
+    A configuration that can be kept up to date while the application runs. Every config file is parsed separately
+    into a layer of a LayeredConfiguration, and the files, included files and environment variables each of them read
+    are recorded. check() re-parses only the config files whose inputs changed, re-merges just the keys they touch and
+    notifies subscribers if the configuration changed. New or removed config files in the configuration directories
+    cause a full reload.
+
+    Each change produces a new configuration dict which shares unchanged subtrees with the previous one, so the
+    configuration must not be modified by callers.
+
+    The arguments are the same as those of configure
+    """
+    def __init__(
+        self,
+        configuration_dirs=None,
+        logging_config_filename="logging",
+        defaults_basename="defaults",
+        active_profiles=None,
+        fail_on_parse_error=True,
+        fail_on_missing_files=False,
+        context=None,
+        include_cache=None,
+    ):
+        self.configuration_dirs = _get_configuration_dirs(configuration_dirs)
+        self.logging_config_filename = logging_config_filename
+        self.defaults_basename = defaults_basename
+        self.active_profiles = _get_active_profiles(active_profiles)
+        self.fail_on_parse_error = fail_on_parse_error
+        self.fail_on_missing_files = fail_on_missing_files
+        self.context = context if context is not None else {}
+        self.include_cache = include_cache if include_cache is not None else IncludeCache()
+
+        self._layers = LayeredConfiguration()
+        self._logging_layers = LayeredConfiguration()
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self._watch_thread = None
+        self._stop_watching = threading.Event()
+
+        self.reload()
+
+    @property
+    def config(self):
+        return self._layers.merged
+
+    @property
+    def logging_config(self):
+        return self._logging_layers.merged
+
+    @property
+    def layers(self):
+        return self._layers
+
+    @property
+    def files(self):
+        """
+        :return: Every file the configuration was built from, including files pulled in by !Include* tags
+        """
+        with self._lock:
+            return {f for parsed_file in self._parsed_files.values() for f in parsed_file.manifest.files}
+
+    def subscribe(self, callback):
+        """
+        Registers callback to be called with the new configuration every time it changes
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def _parse_file(self, filename):
+        manifest = DependencyManifest()
+        context = {**self.context, "_dependency_manifest": manifest, "_include_cache": self.include_cache}
+        config = _parse_file_handle_exceptions(filename, self.fail_on_parse_error, context)
+
+        return _ParsedConfigFile(filename=filename, config=config, manifest=manifest)
+
+    def _notify(self):
+        for callback in list(self._subscribers):
+            callback(self.config)
+
+    def _build_layers(self, filenames):
+        return LayeredConfiguration((f, self._parsed_files[f].config) for f in filenames)
+
+    def reload(self):
+        """
+        Discovers and parses every config file again
+
+        :return: True if the configuration changed
+        """
+        with self._lock:
+            self._directory_manifest = DependencyManifest()
+            for directory in self.configuration_dirs:
+                self._directory_manifest.record_directory(directory)
+
+            config_file_index = _index_configuration_dirs(self.configuration_dirs)
+            logging_files, missing_logging_basenames = _find_config_files(
+                config_file_index,
+                [self.logging_config_filename],
+                self.configuration_dirs,
+            )
+            config_files, missing_basenames = _find_config_files(
+                config_file_index,
+                [self.defaults_basename, *self.active_profiles],
+                self.configuration_dirs,
+            )
+
+            self._parsed_files = {f: self._parse_file(f) for f in [*logging_files, *config_files]}
+            _check_missing_basenames(missing_logging_basenames + missing_basenames, self.fail_on_missing_files)
+
+            self._logging_files = logging_files
+            self._config_files = config_files
+
+            previous_config = self.config
+            self._logging_layers = self._build_layers(logging_files)
+            _apply_logging_config(self.logging_config)
+            self._layers = self._build_layers(config_files)
+
+            if self.config == previous_config:
+                return False
+
+            self._notify()
+            return True
+
+    def check(self):
+        """
+        Checks whether any input of the configuration changed, which only requires a stat of each file when nothing
+        did. Re-parses the config files that are affected by a change and re-merges the configuration
+
+        :return: True if the configuration changed
+        """
+        with self._lock:
+            if self._directory_manifest.is_stale():
+                _LOGGER.info("Config files were added or removed, reloading configuration")
+                return self.reload()
+
+            stale_files = [f for f, parsed_file in self._parsed_files.items() if parsed_file.manifest.is_stale()]
+            if len(stale_files) == 0:
+                return False
+
+            _LOGGER.info("Config files [{}] changed, reloading them".format(", ".join(stale_files)))
+
+            config_changed = False
+
+            for f in stale_files:
+                self._parsed_files[f] = self._parse_file(f)
+
+                if f in self._logging_files and self._logging_layers.set_layer(f, self._parsed_files[f].config):
+                    _apply_logging_config(self.logging_config)
+
+                if f in self._config_files:
+                    config_changed = self._layers.set_layer(f, self._parsed_files[f].config) or config_changed
+
+            if config_changed:
+                self._notify()
+
+            return config_changed
+
+    def set_active_profiles(self, active_profiles):
+        """
+        Changes the active profiles, only parsing config files that weren't already parsed and only re-merging the
+        keys touched by profiles that were added or removed
+
+        :return: True if the configuration changed
+        """
+        with self._lock:
+            config_file_index = _index_configuration_dirs(self.configuration_dirs)
+            config_files, missing_basenames = _find_config_files(
+                config_file_index,
+                [self.defaults_basename, *active_profiles],
+                self.configuration_dirs,
+            )
+
+            for f in config_files:
+                if f not in self._parsed_files:
+                    self._parsed_files[f] = self._parse_file(f)
+
+            _check_missing_basenames(missing_basenames, self.fail_on_missing_files)
+            self.active_profiles = active_profiles
+
+            kept_files = [f for f in self._config_files if f in config_files]
+            previous_config = self.config
+
+            if kept_files != [f for f in config_files if f in self._config_files] or len(set(config_files)) != len(config_files):
+                # The order of the remaining files changed, or a file is merged more than once, rebuild all layers
+                self._layers = self._build_layers(config_files)
+            else:
+                for f in set(self._config_files) - set(config_files):
+                    self._layers.remove_layer(f)
+
+                for index, f in enumerate(config_files):
+                    if f not in self._config_files:
+                        self._layers.insert_layer(index, f, self._parsed_files[f].config)
+
+            self._config_files = config_files
+            self._parsed_files = {f: self._parsed_files[f] for f in [*self._logging_files, *config_files]}
+
+            if self.config is previous_config or self.config == previous_config:
+                return False
+
+            self._notify()
+            return True
+
+    def _get_watched_directories(self):
+        return sorted({os.path.dirname(f) for f in self.files} | {os.path.abspath(d) for d in self.configuration_dirs})
+
+    def _watch(self, watcher, watched_directories, interval):
+        try:
+            while not self._stop_watching.is_set():
+                if not watcher.wait(interval):
+                    continue
+
+                try:
+                    self.check()
+                except Exception:
+                    _LOGGER.exception("Failed to reload configuration, keeping the previous configuration")
+
+                if self._get_watched_directories() != watched_directories:
+                    watcher.close()
+                    watched_directories = self._get_watched_directories()
+                    watcher = create_watcher(watched_directories)
+        finally:
+            watcher.close()
+
+    def start_watching(self, interval=1.0):
+        """
+        Starts a daemon thread which calls check whenever a file in one of the directories the configuration was built
+        from changes. Uses inotify where it is available, otherwise polls every interval seconds. Changes to
+        environment variables are only noticed by an explicit call to check
+        """
+        if self._watch_thread is not None:
+            return
+
+        # Create the watcher before returning, so changes made right after this call are not missed
+        watched_directories = self._get_watched_directories()
+        watcher = create_watcher(watched_directories)
+
+        self._stop_watching.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch,
+            args=(watcher, watched_directories, interval),
+            name="jconfigure-watcher",
+            daemon=True,
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        if self._watch_thread is None:
+            return
+
+        self._stop_watching.set()
+        self._watch_thread.join()
+        self._watch_thread = None
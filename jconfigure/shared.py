@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+import logging
+import mmap
+import os
+import pickle
+import stat
+import struct
+import tempfile
+
+from .frozen import freeze
+
+_LOGGER = logging.getLogger(__name__)
+
+_MAGIC = b"JCFGSHM1"
+# magic, generation, payload length
+_HEADER = struct.Struct("<8sQQ")
+
+
+def _read_header(buffer, file_size):
+    if len(buffer) < _HEADER.size:
+        return None
+
+    magic, generation, payload_length = _HEADER.unpack_from(buffer, 0)
+    if magic != _MAGIC or _HEADER.size + payload_length > file_size:
+        return None
+
+    return generation, payload_length
+
+
+def _read_generation(path):
+    try:
+        with open(path, "rb") as f:
+            header = _read_header(f.read(_HEADER.size), os.fstat(f.fileno()).st_size)
+    except OSError:
+        return 0
+
+    return header[0] if header is not None else 0
+
+
+def publish_configuration(path, config, mode=0o644):
+    """
+    Publishes a merged configuration to a file which other processes can map into memory with SharedConfiguration,
+    instead of each of them parsing the config files. The file holds a small header with a generation number, which
+    is one more than that of the configuration previously published to path, followed by the pickled configuration.
+
+    The new file is written next to path and renamed over it, so readers never see a partially written file. Put path
+    on a tmpfs such as /dev/shm to keep the configuration in memory. Only one process should publish to a path at a
+    time.
+
+    The configuration is stored with pickle, and readers only load files owned by the user they expect to publish it,
+    which nobody else can write to. Readers still execute whatever the publishing user writes to path.
+
+    :param config: The configuration to publish, a dict, FrozenDict or LazyMergedView
+    :param mode: The permissions of the published file. Readable by every user by default, so that processes running as
+                 other users can read it, which also lets every user read any secrets in the configuration. Pass 0o640
+                 or 0o600 to restrict it. Readers refuse files that are writable by the group or by other users
+    :return: The generation number of the published configuration
+    :raises ValueError: If mode makes the file writable by the group or by other users
+    """
+    if mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise ValueError("The published configuration must only be writable by its owner, not mode {:o}".format(mode))
+
+    if hasattr(config, "to_dict"):
+        config = config.to_dict()
+
+    payload = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+    generation = _read_generation(path) + 1
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".jconfigure-shared-")
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp creates the file readable only by its owner, which the rename would keep
+            os.fchmod(f.fileno(), mode)
+            f.write(_HEADER.pack(_MAGIC, generation, len(payload)))
+            f.write(payload)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    _LOGGER.info("Published generation {} of the configuration to {} ({} bytes)".format(generation, path, len(payload)))
+    return generation
+
+
+class SharedConfiguration:
+    """
+    Reads a configuration published with publish_configuration. The file is memory mapped, so processes on the same
+    host share its pages, and the configuration is unpickled rather than parsed from the config files. The unpickled
+    configuration is kept until a newer generation is published.
+
+    Unpickling runs code from the file, so it is only loaded if it is owned by the publishing user and writable by
+    nobody else. Anyone who can publish as that user, or write to the file, can run code in every reader.
+    """
+    def __init__(self, path, frozen=False, owner=None):
+        """
+        :param path: The path the configuration is published to
+        :param frozen: If True, the configuration is returned as a FrozenDict
+        :param owner: The uid of the user which publishes the configuration, defaults to the effective uid of this
+                      process
+        """
+        self.path = path
+        self.frozen = frozen
+        self.owner = os.geteuid() if owner is None else owner
+        self.generation = None
+        self._file_id = None
+        self._config = None
+
+    def _get_file_id(self):
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_dev, stat.st_mtime_ns, stat.st_size
+
+    def has_new_generation(self):
+        """
+        :return: True if a configuration other than the one last loaded has been published, which only requires a stat
+                 of the file
+        """
+        try:
+            return self._get_file_id() != self._file_id
+        except FileNotFoundError:
+            return False
+
+    def _check_trusted(self, file_stat):
+        # Checked on the open file, so it can't be replaced between the check and reading it
+        if file_stat.st_uid != self.owner:
+            raise PermissionError("{} is owned by uid {}, not by the publishing user {}, refusing to load it".format(
+                self.path,
+                file_stat.st_uid,
+                self.owner,
+            ))
+
+        if file_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError("{} is writable by other users, refusing to load it".format(self.path))
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            file_id = os.fstat(f.fileno())
+            self._check_trusted(file_id)
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                header = _read_header(buffer, len(buffer))
+                if header is None:
+                    raise ValueError("{} doesn't contain a published configuration".format(self.path))
+
+                generation, payload_length = header
+
+                # Unpickle straight from the mapped pages, the views have to be released before the map is closed
+                with memoryview(buffer) as view, view[_HEADER.size:_HEADER.size + payload_length] as payload:
+                    config = pickle.loads(payload)
+
+        self._file_id = file_id.st_ino, file_id.st_dev, file_id.st_mtime_ns, file_id.st_size
+        self.generation = generation
+        self._config = freeze(config) if self.frozen else config
+
+    @property
+    def config(self):
+        """
+        :return: The most recently published configuration
+        """
+        if self._config is None or self.has_new_generation():
+            self._load()
+
+        return self._config
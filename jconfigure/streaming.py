@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+import sys
+from contextlib import contextmanager
+
+from yaml.composer import Composer, ComposerError
+from yaml.events import (
+    AliasEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+)
+
+from .deferred import DeferredValue
+from .exceptions import ConfigurationRootException
+from .merge import _is_mapping, _may_be_mapping, copy_containers
+from .yaml_tags import ContextPassingCYamlLoader, ContextPassingYamlLoader, load_yaml_with_context
+
+# Tags of mappings which are constructed as plain dicts. Custom tags on a mapping construct other values
+_MAPPING_TAGS = (None, "!", "tag:yaml.org,2002:map")
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+if ContextPassingCYamlLoader is not None:
+    class StreamingCYamlLoader(ContextPassingCYamlLoader, Composer):
+        """
+        ContextPassingCYamlLoader with the pure python Composer mixed in. libyaml only composes whole documents, the
+        Composer composes single nodes from the events libyaml parses
+        """
+        def __init__(self, stream, context):
+            super().__init__(stream, context)
+            self.anchors = {}
+
+    STREAMING_YAML_LOADER = StreamingCYamlLoader
+else:
+    StreamingCYamlLoader = None
+    STREAMING_YAML_LOADER = ContextPassingYamlLoader
+
+
+class _FallBackToFullParse(Exception):
+    """
+    Raised for yaml which can't be merged event by event, merge keys and duplicate keys, which override values that
+    were already merged
+    """
+
+
+def _is_plain_mapping(event):
+    return type(event) is MappingStartEvent and event.anchor is None and event.tag in _MAPPING_TAGS
+
+
+def _is_plain_non_mapping(event):
+    # Untagged scalars are resolved to strings, numbers, bools, nulls and timestamps, and untagged sequences to lists
+    return type(event) in (ScalarEvent, SequenceStartEvent) and event.anchor is None and event.tag in (None, "!")
+
+
+def _may_construct_mapping(loader, event):
+    if _is_plain_non_mapping(event):
+        return False
+
+    # Tags which can't produce a dict, like !IncludeText, are skipped without being evaluated
+    constructor = loader.yaml_constructors.get(getattr(event, "tag", None))
+    return getattr(getattr(constructor, "__self__", None), "deferred_result_may_be_mapping", True)
+
+
+def _skip_node(loader):
+    """
+    Consumes the events of the next node without constructing it. Anchored nodes inside of it are composed, so that
+    aliases to them later in the document still work
+    """
+    depth = 0
+
+    while True:
+        event = loader.peek_event()
+
+        if type(event) is not AliasEvent and getattr(event, "anchor", None) is not None:
+            loader.compose_node(None, None)
+        else:
+            loader.get_event()
+
+            if type(event) in (MappingStartEvent, SequenceStartEvent):
+                depth += 1
+            elif type(event) in (MappingEndEvent, SequenceEndEvent):
+                depth -= 1
+
+        if depth == 0:
+            return
+
+
+def _unshare_aliased(loader, value):
+    # Aliases construct the same object as their anchor. Once the document has an anchor, the constructed dicts and
+    # lists are copied, so an earlier file merging into one of them doesn't change the others, as in an eager merge
+    return copy_containers(value) if loader.anchors else value
+
+
+def _construct_node(loader):
+    return _unshare_aliased(loader, loader.construct_object(loader.compose_node(None, None), deep=True))
+
+
+class StreamingMerge:
+    """
+    Merges config files into base_config from the last file to the first, so a value is only constructed if no later
+    file overrides it. A key that is already in base_config holds the value of a later file: an earlier value is only
+    merged into it if both are dicts, and is otherwise skipped. A dict which a file in between replaced with a value
+    that isn't a dict is closed, so that files before that one can't merge into it either.
+
+    Yaml files are merged from the parser's events, so skipped values are never constructed, and only the parts of a
+    file that end up in base_config are built. Files in other formats are parsed in full, and then merged the same way.
+    """
+    def __init__(self, base_config, interner=None):
+        """
+        :param interner: An optional Interner, which interns every key and value merged into base_config
+        """
+        self.base_config = base_config
+        self.interner = interner
+        self._closed = set()
+        self._undo_log = []
+
+    @contextmanager
+    def merging_file(self):
+        """
+        Wraps the merge of a single file. If it raises, every value it merged is removed again, leaving base_config as
+        it was before the file
+        """
+        try:
+            yield
+        except Exception:
+            self._rollback(0)
+            raise
+        finally:
+            self._undo_log.clear()
+
+    def _rollback(self, mark):
+        while len(self._undo_log) > mark:
+            entry = self._undo_log.pop()
+
+            if type(entry) is tuple:
+                target, key = entry
+                del target[key]
+            else:
+                self._closed.discard(entry)
+
+    def _set(self, target, key, value):
+        if self.interner is not None:
+            key = sys.intern(key) if type(key) is str else key
+            value = self.interner.intern(value)
+
+        target[key] = value
+        self._undo_log.append((target, key))
+
+    def _close(self, value):
+        self._closed.add(id(value))
+        self._undo_log.append(id(value))
+
+    def _target_mapping(self, target, key, earlier_may_be_mapping):
+        """
+        :return: The dict at target[key] which an earlier value is merged into, or None if the earlier value is
+                 overridden
+        """
+        current = target[key]
+
+        if id(current) in self._closed or not _may_be_mapping(current):
+            return None
+
+        if not earlier_may_be_mapping:
+            # The earlier value replaces the dict, as do all of the values before it
+            self._close(current)
+            return None
+
+        if type(current) is DeferredValue:
+            current = target[key] = current.resolve()
+
+            if not _is_mapping(current):
+                return None
+
+        if type(current) is not dict:
+            current = target[key] = dict(current)
+
+        return current
+
+    def _merge_value(self, target, key, value, stack):
+        if key not in target:
+            self._set(target, key, value)
+            return
+
+        current = self._target_mapping(target, key, _may_be_mapping(value))
+        if current is None:
+            return
+
+        if type(value) is DeferredValue:
+            value = value.resolve()
+
+        if _is_mapping(value):
+            stack.append((current, value))
+        else:
+            self._close(current)
+
+    def _merge_mappings(self, stack):
+        while stack:
+            target, source = stack.pop()
+
+            for k, v in source.items():
+                self._merge_value(target, k, v, stack)
+
+    def merge_earlier(self, overrides):
+        """
+        Merges the parsed contents of a file which comes before all of the files merged so far
+
+        :raises ConfigurationRootException: If overrides isn't a Mapping
+        """
+        if not _is_mapping(overrides):
+            raise ConfigurationRootException(overrides)
+
+        self._merge_mappings([(self.base_config, overrides)])
+
+    def _stream_mapping(self, loader):
+        loader.get_event()
+        frames = [(self.base_config, set())]
+
+        while frames:
+            target, keys = frames[-1]
+
+            if loader.check_event(MappingEndEvent):
+                loader.get_event()
+                frames.pop()
+                continue
+
+            key_node = loader.compose_node(None, None)
+            if key_node.tag == _MERGE_TAG:
+                raise _FallBackToFullParse()
+
+            key = loader.construct_object(key_node, deep=True)
+            if key in keys:
+                raise _FallBackToFullParse()
+
+            keys.add(key)
+            event = loader.peek_event()
+
+            if key not in target:
+                self._set(target, key, _construct_node(loader))
+                continue
+
+            current = target[key]
+
+            if id(current) in self._closed or not _may_be_mapping(current):
+                _skip_node(loader)
+            elif _is_plain_mapping(event):
+                current = self._target_mapping(target, key, True)
+
+                if current is None:
+                    _skip_node(loader)
+                else:
+                    loader.get_event()
+                    frames.append((current, set()))
+            elif not _may_construct_mapping(loader, event):
+                self._target_mapping(target, key, False)
+                _skip_node(loader)
+            else:
+                # Values which might be dicts, like aliases and !IncludeYaml tags, are constructed to find out
+                stack = []
+                self._merge_value(target, key, _construct_node(loader), stack)
+                self._merge_mappings(stack)
+
+    def merge_earlier_yaml(self, stream, context):
+        """
+        Merges a yaml file which comes before all of the files merged so far, from the parser's events. Documents using
+        merge keys or duplicate keys are parsed in full instead
+        """
+        mark = len(self._undo_log)
+        loader = STREAMING_YAML_LOADER(stream, context)
+
+        try:
+            loader.get_event()
+
+            # An empty document is None, which can't be merged, the same as in merge_configurations
+            if not loader.check_event(DocumentStartEvent):
+                raise ConfigurationRootException(None)
+
+            loader.get_event()
+
+            if _is_plain_mapping(loader.peek_event()):
+                self._stream_mapping(loader)
+            else:
+                self.merge_earlier(_construct_node(loader))
+
+            loader.get_event()
+
+            if not loader.check_event(StreamEndEvent):
+                event = loader.get_event()
+                raise ComposerError(
+                    "expected a single document in the stream",
+                    None,
+                    "but found another document",
+                    event.start_mark,
+                )
+        except _FallBackToFullParse:
+            self._rollback(mark)
+            stream.seek(0)
+            self.merge_earlier(copy_containers(load_yaml_with_context(stream, context)))
+        finally:
+            loader.dispose()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+import threading
+
+from .loaders import ContextPassingLoader
+
+
+class TagRegistry:
+    """
+    A set of yaml tags, and the loader classes which construct them. Tags are only added to the loader classes bound to
+    the registry, never to PyYAML's own loaders, so loading yaml with yaml.load or yaml.safe_load is unaffected by
+    jconfigure, and registering a custom tag only affects the loaders it was registered for
+    """
+    def __init__(self, tag_classes=()):
+        self._lock = threading.RLock()
+        self._tag_classes = {}
+        self._loader_classes = []
+        self._loaders_by_base = {}
+
+        for tag_class in tag_classes:
+            self.register(tag_class)
+
+    @property
+    def tag_classes(self):
+        """
+        :return: A dict of each registered yaml tag, like "!EnvVar", to its tag class
+        """
+        with self._lock:
+            return dict(self._tag_classes)
+
+    def register(self, tag_class):
+        """
+        Adds tag_class to the registry, and to every loader class bound to it. A tag class registered for a yaml tag
+        which is already registered replaces the earlier one. Returns tag_class, so it can be used as a class decorator
+
+        :param tag_class: A subclass of ArgListAcceptingYamlTag, or any class with a yaml_tag and a from_yaml
+        """
+        with self._lock:
+            self._tag_classes[tag_class.yaml_tag] = tag_class
+
+            for loader_class in self._loader_classes:
+                loader_class.add_constructor(tag_class.yaml_tag, tag_class.from_yaml)
+
+        return tag_class
+
+    def bind(self, loader_class):
+        """
+        Adds every tag in the registry, and every tag registered later, to loader_class. PyYAML copies the constructors
+        into loader_class the first time one is added, so the classes it inherits from are unaffected. Returns
+        loader_class, so it can be used as a class decorator
+        """
+        with self._lock:
+            for yaml_tag, tag_class in self._tag_classes.items():
+                loader_class.add_constructor(yaml_tag, tag_class.from_yaml)
+
+            self._loader_classes.append(loader_class)
+
+        return loader_class
+
+    def loader_for(self, base):
+        """
+        :param base: A PyYAML loader class, like yaml.SafeLoader or yaml.CLoader
+        :return: A subclass of base bound to this registry, which is constructed with a stream and a context, like
+                 ContextPassingYamlLoader. The same class is returned for every call with the same base
+        """
+        with self._lock:
+            loader_class = self._loaders_by_base.get(base)
+
+            if loader_class is None:
+                loader_class = type("ContextPassing{}".format(base.__name__), (ContextPassingLoader, base), {})
+                self._loaders_by_base[base] = self.bind(loader_class)
+
+            return loader_class
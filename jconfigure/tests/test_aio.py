@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+import asyncio
+import os
+import tempfile
+import unittest
+
+from .. import configure, configure_async, watch_configuration_async
+from ..frozen import FrozenDict
+from .test_utils import get_full_test_file_path
+
+
+class TestConfigureAsync(unittest.TestCase):
+    def test_configure_async_matches_configure(self):
+        configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+        active_profiles = ["prod", "overrides", "tagged"]
+
+        self.assertEqual(
+            asyncio.run(configure_async(configuration_dirs=configuration_dirs, active_profiles=active_profiles)),
+            configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles),
+        )
+
+    def test_configure_arguments_forwarded(self):
+        configuration_dirs = [get_full_test_file_path("configure/app")]
+        config = asyncio.run(configure_async(configuration_dirs, active_profiles=["prod"], frozen=True, streaming=True))
+
+        self.assertIsInstance(config, FrozenDict)
+        self.assertEqual(config, configure(configuration_dirs, active_profiles=["prod"], frozen=True))
+
+        with self.assertRaises(TypeError):
+            asyncio.run(configure_async(configuration_dirs, unknown_argument=True))
+
+    def test_watch_yields_on_change(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            with open(os.path.join(config_dir, "logging.yaml"), "w") as f:
+                f.write("version: 1\ndisable_existing_loggers: false\n")
+
+            defaults_filename = os.path.join(config_dir, "defaults.yaml")
+            with open(defaults_filename, "w") as f:
+                f.write("cat: echo\n")
+
+            async def watch():
+                configs = []
+                watcher = watch_configuration_async(0.01, configuration_dirs=config_dir)
+                configs.append(await watcher.__anext__())
+
+                with open(defaults_filename, "w") as f:
+                    f.write("cat: jingles\n")
+
+                configs.append(await asyncio.wait_for(watcher.__anext__(), timeout=5))
+                await watcher.aclose()
+                return configs
+
+            self.assertEqual(asyncio.run(watch()), [{"cat": "echo"}, {"cat": "jingles"}])
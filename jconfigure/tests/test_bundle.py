@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from .. import compile_bundle, configure, load_bundle
+from ..__main__ import main
+from ..frozen import FrozenDict
+from .test_utils import get_full_test_file_path
+
+
+class TestBundle(unittest.TestCase):
+    def setUp(self):
+        self.configuration_dirs = [get_full_test_file_path("configure/bundle")]
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bundle_path = os.path.join(self.temp_dir.name, "config.bundle")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def compile(self, **kwargs):
+        return compile_bundle(self.bundle_path, configuration_dirs=self.configuration_dirs, active_profiles=["prod"], **kwargs)
+
+    def test_same_as_configure(self):
+        self.compile()
+
+        self.assertEqual(
+            load_bundle(self.bundle_path, context={"region": "eu"}),
+            configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod"], context={"region": "eu"}),
+        )
+
+    def test_dynamic_tags_evaluated_on_load(self):
+        with mock.patch.dict(os.environ, {"JCONFIGURE_BUNDLE_TEST": "compiled"}):
+            self.compile(context={"region": "compiled"})
+
+        with mock.patch.dict(os.environ, {"JCONFIGURE_BUNDLE_TEST": "loaded"}):
+            config = load_bundle(self.bundle_path, context={"region": "us"})
+
+        self.assertEqual(config["env"], "loaded")
+        self.assertEqual(config["greeting"], "hello from loaded")
+        self.assertEqual(config["region"], "us")
+        self.assertEqual(config["date"], "2019-01-23")
+        self.assertEqual(config["included"], {"jingles": "cat", "oscar": ["dog", "sleepy"]})
+        self.assertEqual(config["db"], {"host": "prod-db", "port": 5432})
+
+    def test_frozen(self):
+        self.compile()
+        config = load_bundle(self.bundle_path, frozen=True)
+
+        self.assertIsInstance(config, FrozenDict)
+        self.assertEqual(config["region"], "nowhere")
+
+    def test_content_hash(self):
+        digest = self.compile()
+        self.assertEqual(self.compile(), digest)
+
+        with open(self.bundle_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last_byte = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last_byte[0] ^ 0xFF]))
+
+        with self.assertRaises(ValueError):
+            load_bundle(self.bundle_path)
+
+    def test_not_a_bundle(self):
+        with open(self.bundle_path, "wb") as f:
+            f.write(b"not a bundle")
+
+        with self.assertRaises(ValueError):
+            load_bundle(self.bundle_path)
+
+    def test_command_line(self):
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            main(["compile", self.bundle_path, "--config-dir", self.configuration_dirs[0], "--profile", "prod", "--context", "region=cli"])
+
+        self.assertEqual(len(output.getvalue().strip()), 64)
+        self.assertEqual(load_bundle(self.bundle_path)["region"], "nowhere")
+        self.assertEqual(load_bundle(self.bundle_path, context={"region": "eu"})["region"], "eu")
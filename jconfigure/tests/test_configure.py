@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+import unittest
+
+from .. import configure, FileParsingException, _index_configuration_dirs, _find_available_config_files_in_directory, _probe_config_files_in_directory
+from .test_utils import get_full_test_file_path
+
+
+class TestConfigure(unittest.TestCase):
+    def setUp(self):
+        self.configuration_dirs = [
+            get_full_test_file_path("configure/app"),
+            get_full_test_file_path("configure/extra"),
+            get_full_test_file_path("configure/nonexistant"),
+        ]
+
+    def test_configure_merges_in_order(self):
+        actual = configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod", "overrides"])
+        self.assertEqual(actual, {
+            "name": "extra-overrides",
+            "from_yaml": True,
+            "db": {"host": "prod-db", "port": 6432},
+            "order": ["extra-prod"],
+        })
+
+    def test_index_matches_probing(self):
+        config_file_index = _index_configuration_dirs(self.configuration_dirs)
+
+        for directory in self.configuration_dirs:
+            for basename in ["logging", "defaults", "prod", "stage", "overrides", "missing"]:
+                self.assertEqual(
+                    _find_available_config_files_in_directory(config_file_index, directory, basename),
+                    _probe_config_files_in_directory(directory, basename),
+                )
+
+    def test_index_orders_by_supported_extension(self):
+        config_file_index = _index_configuration_dirs(self.configuration_dirs)
+        self.assertEqual(
+            config_file_index[self.configuration_dirs[0]]["defaults"],
+            [get_full_test_file_path("configure/app/defaults.json"), get_full_test_file_path("configure/app/defaults.yaml")],
+        )
+
+    def test_parallel_parsing_matches_sequential(self):
+        expected = configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod", "overrides", "tagged"])
+        actual = configure(
+            configuration_dirs=self.configuration_dirs,
+            active_profiles=["prod", "overrides", "tagged"],
+            parse_workers=4,
+        )
+
+        self.assertEqual(actual, expected)
+
+    def test_parallel_parsing_fails_on_parse_error(self):
+        self.configuration_dirs.append(get_full_test_file_path("configure/broken"))
+
+        with self.assertRaises(FileParsingException):
+            configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod"], parse_workers=4)
+
+        actual = configure(
+            configuration_dirs=self.configuration_dirs,
+            active_profiles=["prod"],
+            fail_on_parse_error=False,
+            parse_workers=4,
+        )
+        self.assertEqual(actual["order"], ["extra-prod"])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+import os
+import socket
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from .. import ConfigurationClient, ConfigurationDaemon, query_configuration
+from ..daemon import get_path
+
+
+def _write_file(filename, contents):
+    with open(filename, "w") as f:
+        f.write(contents)
+
+
+class TestGetPath(unittest.TestCase):
+    def test_get_path(self):
+        config = {"db": {"hosts": ["a", "b"], "port": 5432}}
+
+        self.assertIs(get_path(config, None), config)
+        self.assertEqual(get_path(config, "db.port"), 5432)
+        self.assertEqual(get_path(config, "db.hosts.1"), "b")
+
+        for path in ["db.user", "db.hosts.2", "db.port.x"]:
+            with self.assertRaises(KeyError):
+                get_path(config, path)
+
+
+class TestConfigurationDaemon(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = self.temp_dir.name
+        self.socket_path = os.path.join(self.config_dir, "daemon.sock")
+
+        _write_file(os.path.join(self.config_dir, "logging.yaml"), "version: 1\ndisable_existing_loggers: false\n")
+        _write_file(os.path.join(self.config_dir, "defaults.yaml"), "db: {host: localhost, port: 5432}\n")
+        _write_file(os.path.join(self.config_dir, "prod.yaml"), "db: {host: prod-db}\n")
+
+        self.configure_kwargs = {"configuration_dirs": [self.config_dir], "active_profiles": ["prod"]}
+        self.daemon = ConfigurationDaemon(self.socket_path, watch_interval=0.05, **self.configure_kwargs)
+        self.daemon.start()
+
+    def tearDown(self):
+        self.daemon.stop()
+        self.temp_dir.cleanup()
+
+    def test_queries(self):
+        with ConfigurationClient(self.socket_path) as client:
+            self.assertEqual(client.get(), {"db": {"host": "prod-db", "port": 5432}})
+            self.assertEqual(client.get("db.host"), "prod-db")
+
+            with self.assertRaises(KeyError):
+                client.get("db.user")
+
+            self.assertEqual(client.get("db.port"), 5432)
+
+    def test_query_configuration(self):
+        with patch("jconfigure.daemon.configure") as configure:
+            self.assertEqual(query_configuration("db.host", socket_path=self.socket_path), "prod-db")
+            configure.assert_not_called()
+
+        with patch.dict(os.environ, {"JCONFIGURE_DAEMON_SOCKET": self.socket_path}):
+            self.assertEqual(query_configuration(), {"db": {"host": "prod-db", "port": 5432}})
+
+    def test_reloads_changed_files(self):
+        _write_file(os.path.join(self.config_dir, "prod.yaml"), "db: {host: new-db}\n")
+        deadline = time.monotonic() + 5
+
+        with ConfigurationClient(self.socket_path) as client:
+            while client.get("db.host") != "new-db" and time.monotonic() < deadline:
+                time.sleep(0.02)
+
+            self.assertEqual(client.get("db"), {"host": "new-db", "port": 5432})
+
+    def test_falls_back_to_configure(self):
+        self.daemon.stop()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+        self.assertEqual(query_configuration("db.host", socket_path=self.socket_path, **self.configure_kwargs), "prod-db")
+        self.assertEqual(query_configuration("db.port", **self.configure_kwargs), 5432)
+
+    def test_stale_socket_replaced(self):
+        self.daemon.stop()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.bind(self.socket_path)
+
+        self.daemon.start()
+        self.assertEqual(query_configuration("db.host", socket_path=self.socket_path), "prod-db")
+
+        with self.assertRaises(OSError):
+            ConfigurationDaemon(self.socket_path, configuration=self.daemon.configuration).start()
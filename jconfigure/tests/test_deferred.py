@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+import unittest
+
+from .. import configure
+from ..deferred import DeferredValue, contains_deferred_values, resolve_deferred_values
+from ..exceptions import FileParsingException
+from ..utils import merge_configuration_from_dict_root
+from ..yaml_tags import IncludeText, IncludeYaml
+from .test_utils import get_full_test_file_path
+
+
+class TestDeferredValues(unittest.TestCase):
+    def setUp(self):
+        self.configuration_dirs = [get_full_test_file_path("configure/deferred")]
+        self.context = {"_parsing_filename": get_full_test_file_path("configure/deferred/defaults.yaml")}
+
+    def test_overridden_values_never_evaluated(self):
+        config = configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod"], lazy_tags=True)
+
+        self.assertEqual(config["secret"], "from prod")
+        self.assertEqual(config["included"], {"jingles": "cat", "oscar": "cat"})
+        self.assertEqual(config["joined"], "animals and more")
+        self.assertFalse(contains_deferred_values(config))
+
+    def test_winning_value_errors_raised(self):
+        with self.assertRaises(FileParsingException):
+            configure(configuration_dirs=self.configuration_dirs, lazy_tags=True)
+
+        with self.assertRaises(FileParsingException):
+            configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod"])
+
+    def test_lazy_view_resolves_on_access(self):
+        view = configure(
+            configuration_dirs=self.configuration_dirs,
+            active_profiles=["prod"],
+            lazy=True,
+            lazy_tags=True,
+        )
+
+        self.assertEqual(view["kept"], "animals")
+        self.assertEqual(dict(view["included"]), {"jingles": "cat", "oscar": "cat"})
+        self.assertEqual(view["secret"], "from prod")
+
+    def test_merge_resolves_only_mappings(self):
+        text = DeferredValue(IncludeText, self.context, ["../../includes/missing.txt"], {})
+        included = DeferredValue(IncludeYaml, self.context, ["../../includes/one.yaml"], {})
+
+        base_config = {"text": text, "included": included}
+        merge_configuration_from_dict_root(base_config, {"text": {"a": 1}, "included": {"jingles": "dog"}})
+
+        self.assertFalse(text.resolved)
+        self.assertEqual(base_config["text"], {"a": 1})
+        self.assertEqual(base_config["included"], {"jingles": "dog", "oscar": ["dog", "sleepy"]})
+
+    def test_resolve_nested(self):
+        included = DeferredValue(IncludeYaml, self.context, ["../../includes/one.yaml"], {})
+        config = resolve_deferred_values({"values": [included, {"nested": included}]})
+
+        self.assertEqual(config["values"][0]["jingles"], "cat")
+        self.assertIs(config["values"][1]["nested"], config["values"][0])
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+import json
+import os
+import pickle
+import tempfile
+import unittest
+
+from unittest.mock import patch
+from .. import configure
+from ..dependencies import DependencyManifest
+
+
+def _write_file(filename, contents):
+    with open(filename, "w") as f:
+        f.write(contents)
+
+
+class TestDependencyManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = os.path.join(self.temp_dir.name, "config")
+        self.context = {"cat": "echo", "unused": "value"}
+
+        os.mkdir(self.config_dir)
+        _write_file(os.path.join(self.config_dir, "logging.yaml"), "version: 1\ndisable_existing_loggers: false\n")
+        _write_file(os.path.join(self.config_dir, "defaults.yaml"), "\n".join([
+            "password: !IncludeText password.txt",
+            "user: !EnvVar {name: _TEST_MANIFEST_USER, default: nobody}",
+            "cat: !ContextValue cat",
+            "dog: !ContextValue {key: dog, default: oscar}",
+        ]))
+        _write_file(os.path.join(self.config_dir, "password.txt"), "hunter2")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def configure(self):
+        manifest = DependencyManifest()
+        configure(configuration_dirs=self.config_dir, context=self.context, dependency_manifest=manifest)
+        return manifest
+
+    def test_records_every_input(self):
+        manifest = self.configure()
+
+        self.assertEqual(set(manifest.files), {
+            os.path.join(self.config_dir, filename) for filename in ["logging.yaml", "defaults.yaml", "password.txt"]
+        })
+        self.assertEqual(list(manifest.directories), [self.config_dir])
+        self.assertEqual(list(manifest.env_vars), ["_TEST_MANIFEST_USER"])
+        self.assertEqual(set(manifest.context_keys), {"cat", "dog"})
+        self.assertIsNone(manifest.context_keys["dog"])
+        self.assertFalse(manifest.time_dependent)
+        self.assertFalse(manifest.is_stale(self.context))
+
+    def test_stale_context(self):
+        manifest = self.configure()
+
+        self.assertFalse(manifest.is_stale({**self.context, "unused": "changed"}))
+        self.assertTrue(manifest.is_stale({**self.context, "cat": "jingles"}))
+        self.assertTrue(manifest.is_stale({**self.context, "dog": "oscar"}))
+
+        # Without a context, only files, directories, environment variables and time are checked
+        self.assertFalse(manifest.is_stale())
+
+    def test_stale_inputs(self):
+        manifest = self.configure()
+
+        with patch.dict(os.environ, {"_TEST_MANIFEST_USER": "root"}):
+            self.assertTrue(manifest.is_stale(self.context))
+
+        _write_file(os.path.join(self.config_dir, "password.txt"), "hunter3")
+        self.assertTrue(manifest.is_stale(self.context))
+
+    def test_dict_round_trip(self):
+        manifest = self.configure()
+        manifest.record_time_dependency()
+
+        manifest_dict = json.loads(json.dumps(manifest.to_dict()))
+        loaded = DependencyManifest.from_dict(manifest_dict)
+
+        self.assertEqual(loaded.to_dict(), manifest.to_dict())
+        self.assertEqual(loaded.files, manifest.files)
+        self.assertEqual(loaded.directories, manifest.directories)
+        self.assertTrue(loaded.is_stale())
+
+    def test_unpickle_without_context_keys(self):
+        manifest = self.configure()
+        del manifest.context_keys
+
+        loaded = pickle.loads(pickle.dumps(manifest))
+        self.assertEqual(loaded.context_keys, {})
+        self.assertFalse(loaded.is_stale(self.context))
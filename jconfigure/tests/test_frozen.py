@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+import copy
+import pickle
+import unittest
+
+from .. import configure
+from ..frozen import FrozenDict, freeze, thaw
+from .test_utils import get_full_test_file_path
+
+
+class TestFrozenDict(unittest.TestCase):
+    def setUp(self):
+        self.config = {"db": {"host": "localhost", "ports": [5432, 5433]}, "cache": {"ttl": 1}, "tags": {"a"}}
+        self.frozen = freeze(self.config)
+
+    def test_freeze(self):
+        self.assertIsInstance(self.frozen["db"], FrozenDict)
+        self.assertEqual(self.frozen["db"]["ports"], (5432, 5433))
+        self.assertEqual(self.frozen["tags"], frozenset(["a"]))
+        self.assertEqual(self.frozen, {**self.config, "db": {"host": "localhost", "ports": (5432, 5433)}})
+        self.assertIs(freeze(self.frozen), self.frozen)
+
+    def test_immutable(self):
+        with self.assertRaises(TypeError):
+            self.frozen["db"] = {}
+
+        with self.assertRaises(AttributeError):
+            self.frozen.other = 1
+
+    def test_hashable(self):
+        self.assertEqual(hash(self.frozen), hash(freeze(self.config)))
+        self.assertEqual(len({self.frozen, freeze(self.config)}), 1)
+
+    def test_constructor_freezes_nested_values(self):
+        frozen = FrozenDict(self.config)
+
+        self.assertIsInstance(frozen["db"], FrozenDict)
+        self.assertEqual(frozen["db"]["ports"], (5432, 5433))
+        self.assertEqual(frozen, self.frozen)
+        self.assertEqual(hash(frozen), hash(self.frozen))
+
+        with self.assertRaises(TypeError):
+            frozen["db"]["host"] = "remote"
+
+    def test_copy_is_free(self):
+        self.assertIs(copy.copy(self.frozen), self.frozen)
+        self.assertIs(copy.deepcopy(self.frozen), self.frozen)
+
+    def test_modified_copies_share_subtrees(self):
+        modified = self.frozen.set_in(["db", "host"], "prod-db")
+
+        self.assertEqual(modified["db"]["host"], "prod-db")
+        self.assertEqual(self.frozen["db"]["host"], "localhost")
+        self.assertIs(modified["cache"], self.frozen["cache"])
+        self.assertIs(modified["db"]["ports"], self.frozen["db"]["ports"])
+
+        removed = self.frozen.delete("cache")
+        self.assertNotIn("cache", removed)
+        self.assertIs(removed["db"], self.frozen["db"])
+
+    def test_set_in_creates_missing_dicts(self):
+        self.assertEqual(self.frozen.set_in(["new", "nested"], [1])["new"], {"nested": (1,)})
+
+    def test_thaw(self):
+        self.assertEqual(thaw(self.frozen), self.config)
+
+    def test_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.frozen)), self.frozen)
+
+    def test_configure_frozen(self):
+        configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+        active_profiles = ["prod", "overrides"]
+
+        config = configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles, frozen=True)
+        self.assertIsInstance(config, FrozenDict)
+        self.assertEqual(
+            config.thaw(),
+            configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles),
+        )
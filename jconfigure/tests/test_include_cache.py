@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch
+from .. import configure
+from ..include_cache import IncludeCache
+from ..utils import parse_file
+
+
+def _write_file(filename, contents):
+    with open(filename, "w") as f:
+        f.write(contents)
+
+
+class TestIncludeCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.include_cache = IncludeCache()
+
+        _write_file(self.get_path("shared.yaml"), "user: !EnvVar {name: _TEST_INCLUDE_USER, default: nobody}\nhosts: [a, b]\n")
+        _write_file(self.get_path("blob.json"), '{"hosts": ["c", "d"]}')
+        _write_file(self.get_path("secret.txt"), "hunter2")
+        _write_file(self.get_path("one.yaml"), "shared: !IncludeYaml shared.yaml\nblob: !IncludeJson blob.json\n")
+        _write_file(self.get_path("two.yaml"), "shared: !IncludeYaml shared.yaml\nsecret: !IncludeText secret.txt\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def get_path(self, filename):
+        return os.path.join(self.temp_dir.name, filename)
+
+    def parse(self, filename, context={}):
+        return parse_file(self.get_path(filename), {**context, "_include_cache": self.include_cache})
+
+    def test_shared_include_parsed_once(self):
+        self.parse("one.yaml")
+        self.assertEqual(self.parse("two.yaml"), {"shared": {"user": "nobody", "hosts": ["a", "b"]}, "secret": "hunter2"})
+        self.assertEqual((self.include_cache.hits, self.include_cache.misses), (1, 3))
+
+    def test_results_safe_from_mutation(self):
+        self.parse("one.yaml")["shared"]["hosts"].append("mutated")
+        self.assertEqual(self.parse("one.yaml")["shared"]["hosts"], ["a", "b"])
+
+    def test_context_is_part_of_yaml_key(self):
+        self.parse("one.yaml", {"cat": "echo"})
+        self.parse("one.yaml", {"cat": "jingles"})
+        self.assertEqual(self.include_cache.misses, 3)
+
+    def test_deferred_tags_are_part_of_key(self):
+        # Shared between configure calls with and without lazy_tags, each gets the includes evaluated as it expects
+        _write_file(self.get_path("logging.yaml"), "version: 1\ndisable_existing_loggers: false\n")
+        _write_file(self.get_path("defaults.yaml"), "one: !IncludeYaml two.yaml\n")
+
+        configure_kwargs = {"configuration_dirs": self.temp_dir.name, "include_cache": self.include_cache}
+        expected = {"one": {"shared": {"user": "nobody", "hosts": ["a", "b"]}, "secret": "hunter2"}}
+
+        self.assertEqual(configure(lazy_tags=True, **configure_kwargs), expected)
+        self.assertEqual(configure(**configure_kwargs), expected)
+        self.assertEqual(configure(lazy_tags=True, **configure_kwargs), expected)
+        self.assertEqual((self.include_cache.hits, self.include_cache.misses), (3, 6))
+
+    def test_changed_file_is_reread(self):
+        self.parse("two.yaml")
+        _write_file(self.get_path("secret.txt"), "hunter22")
+        self.assertEqual(self.parse("two.yaml")["secret"], "hunter22")
+
+    def test_changed_env_var_is_reread(self):
+        self.parse("one.yaml")
+
+        with patch.dict("os.environ", {"_TEST_INCLUDE_USER": "root"}):
+            self.assertEqual(self.parse("one.yaml")["shared"]["user"], "root")
+
+    def test_eviction_by_entries(self):
+        self.include_cache = IncludeCache(max_entries=2)
+        self.parse("one.yaml")
+        self.parse("two.yaml")
+        self.assertEqual(len(self.include_cache), 2)
+
+    def test_eviction_by_bytes(self):
+        max_bytes = os.path.getsize(self.get_path("shared.yaml"))
+        self.include_cache = IncludeCache(max_bytes=max_bytes)
+        self.parse("one.yaml")
+        self.assertEqual(len(self.include_cache), 1)
+        self.assertLessEqual(self.include_cache.num_bytes, max_bytes)
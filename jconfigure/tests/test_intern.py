@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+import datetime
+import unittest
+
+from .. import configure
+from ..frozen import FrozenDict
+from ..intern import Interner
+from ..memory import deep_getsizeof
+from .test_utils import get_full_test_file_path
+
+
+def _copy_string(value):
+    # Builds an equal string which isn't the same object
+    return "".join(list(value))
+
+
+class TestInterner(unittest.TestCase):
+    def test_intern_keys_and_short_values(self):
+        interner = Interner(max_string_length=10)
+        first = interner.intern({_copy_string("host"): _copy_string("localhost"), "long": "x" * 20})
+        second = interner.intern({_copy_string("host"): [_copy_string("localhost")], "long": _copy_string("x" * 20)})
+
+        self.assertIs(next(iter(first)), next(iter(second)))
+        self.assertIs(first["host"], second["host"][0])
+        self.assertIsNot(first["long"], second["long"])
+
+    def test_intern_keeps_shared_objects(self):
+        shared = [_copy_string("a")]
+        value = Interner().intern({"one": shared, "two": shared})
+
+        self.assertIs(value["one"], value["two"])
+        self.assertIs(value["one"], shared)
+
+    def test_freeze_shares_identical_subtrees(self):
+        handler = {"class": "logging.StreamHandler", "level": "INFO", "ports": [1, 2]}
+        frozen = Interner().freeze({"console": handler, "stderr": dict(handler), "other": {"level": "DEBUG"}})
+
+        self.assertIsInstance(frozen, FrozenDict)
+        self.assertIs(frozen["console"], frozen["stderr"])
+        self.assertIsNot(frozen["console"], frozen["other"])
+
+    def test_freeze_keeps_types_apart(self):
+        frozen = Interner().freeze({"int": [1], "bool": [True], "float": [1.0]})
+
+        self.assertIs(type(frozen["bool"][0]), bool)
+        self.assertIs(type(frozen["float"][0]), float)
+        self.assertIsNot(frozen["int"], frozen["bool"])
+
+    def test_freeze_keeps_equal_values_apart(self):
+        utc = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+        cet = utc.astimezone(datetime.timezone(datetime.timedelta(hours=1)))
+        frozen = Interner().freeze({
+            "zero": [0.0],
+            "negative_zero": [-0.0],
+            "utc": [utc],
+            "cet": [cet],
+            "int_key": {1: "a"},
+            "bool_key": {True: "a"},
+            "zero_set": {0.0},
+            "negative_zero_set": {-0.0},
+        })
+
+        self.assertEqual(repr(frozen["negative_zero"][0]), "-0.0")
+        self.assertEqual(frozen["cet"][0].utcoffset(), datetime.timedelta(hours=1))
+        self.assertIs(type(next(iter(frozen["bool_key"]))), bool)
+        self.assertEqual(repr(next(iter(frozen["negative_zero_set"]))), "-0.0")
+
+    def test_configure_intern(self):
+        configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+        active_profiles = ["prod", "overrides", "stage"]
+
+        config = configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles)
+        interned = configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles, intern=True)
+        frozen = configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles, intern=True, frozen=True)
+
+        self.assertEqual(interned, config)
+        self.assertEqual(frozen.thaw(), config)
+        self.assertLessEqual(deep_getsizeof(interned), deep_getsizeof(config))
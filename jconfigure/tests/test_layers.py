@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+import copy
+import random
+import unittest
+
+from ..layers import LayeredConfiguration
+from ..utils import merge_configuration_from_dict_root
+
+
+def _full_merge(layers):
+    merged = {}
+    for _, config in layers:
+        merge_configuration_from_dict_root(merged, copy.deepcopy(config))
+
+    return merged
+
+
+def _random_config(rng, depth=3):
+    config = {}
+
+    for key in rng.sample("abcdef", rng.randint(0, 4)):
+        choice = rng.random()
+
+        if depth > 0 and choice < 0.5:
+            config[key] = _random_config(rng, depth - 1)
+        elif choice < 0.7:
+            config[key] = [rng.randint(0, 3)]
+        else:
+            config[key] = rng.randint(0, 3)
+
+    return config
+
+
+class TestLayeredConfiguration(unittest.TestCase):
+    def setUp(self):
+        self.layers = [
+            ("defaults", {"db": {"host": "localhost", "port": 5432}, "hosts": ["a"], "name": "defaults"}),
+            ("prod", {"db": {"host": "prod-db"}, "name": "prod"}),
+            ("overrides", {"db": {"port": 6432}}),
+        ]
+        self.layered = LayeredConfiguration(self.layers)
+
+    def test_initial_merge(self):
+        self.assertEqual(self.layered.merged, _full_merge(self.layers))
+
+    def test_set_layer_shares_unchanged_subtrees(self):
+        previous = self.layered.merged
+        self.assertTrue(self.layered.set_layer("prod", {"db": {"host": "prod-db-2"}, "name": "prod"}))
+
+        self.assertEqual(self.layered.merged["db"], {"host": "prod-db-2", "port": 6432})
+        self.assertIs(self.layered.merged["hosts"], previous["hosts"])
+        self.assertEqual(previous["db"]["host"], "prod-db")
+
+    def test_unchanged_layer_is_noop(self):
+        previous = self.layered.merged
+        self.assertFalse(self.layered.set_layer("prod", {"db": {"host": "prod-db"}, "name": "prod"}))
+        self.assertIs(self.layered.merged, previous)
+
+    def test_overridden_change_is_noop(self):
+        self.assertFalse(self.layered.set_layer("defaults", {**self.layers[0][1], "name": "changed"}))
+
+    def test_remove_and_insert_layer(self):
+        self.layered.remove_layer("prod")
+        self.assertEqual(self.layered.merged, _full_merge([self.layers[0], self.layers[2]]))
+
+        self.layered.insert_layer(1, "prod", self.layers[1][1])
+        self.assertEqual(self.layered.merged, _full_merge(self.layers))
+        self.assertEqual(self.layered.names, ["defaults", "prod", "overrides"])
+
+    def test_layers_never_modified(self):
+        layers_copy = copy.deepcopy(self.layers)
+        self.layered.set_layer("overrides", {"db": {"port": 1, "extra": {"a": 1}}})
+        self.layered.merged["db"]["extra"]["a"] = 2
+        self.assertEqual([(n, c) for n, c in self.layers], layers_copy)
+
+    def test_random_changes_match_full_merge(self):
+        rng = random.Random(1234)
+
+        for _ in range(200):
+            layers = [(str(i), _random_config(rng)) for i in range(rng.randint(1, 5))]
+            layered = LayeredConfiguration(layers)
+
+            for _ in range(5):
+                index = rng.randrange(len(layers))
+                layers[index] = (layers[index][0], _random_config(rng))
+                layered.set_layer(layers[index][0], layers[index][1])
+
+                self.assertEqual(layered.merged, _full_merge(layers))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+import copy
+import os
+import tempfile
+import unittest
+
+from .. import configure
+from ..exceptions import ConfigurationRootException
+from ..lazy import LazyMergedView
+from ..utils import merge_configuration_from_dict_root
+from .test_utils import get_full_test_file_path
+
+
+class TestLazyMergedView(unittest.TestCase):
+    def setUp(self):
+        self.layers = [
+            {"db": {"host": "localhost", "port": 5432}, "hosts": ["a"], "name": "defaults", "cache": {"ttl": 1}},
+            {"db": {"host": "prod-db"}, "name": "prod", "cache": None},
+            {"db": {"port": 6432}, "cache": {"size": 2}},
+        ]
+
+    def test_matches_eager_merge(self):
+        expected = {}
+        for layer in copy.deepcopy(self.layers):
+            merge_configuration_from_dict_root(expected, layer)
+
+        view = LazyMergedView(self.layers)
+        self.assertEqual(view.to_dict(), expected)
+        self.assertEqual(dict(view["db"]), {"host": "prod-db", "port": 6432})
+        self.assertEqual(list(view), ["db", "hosts", "name", "cache"])
+
+    def test_overridden_dicts_are_dropped(self):
+        self.assertEqual(dict(LazyMergedView(self.layers)["cache"]), {"size": 2})
+
+    def test_values_memoized(self):
+        view = LazyMergedView(self.layers)
+        self.assertIs(view["db"], view["db"])
+
+    def test_read_only(self):
+        view = LazyMergedView(self.layers)
+
+        with self.assertRaises(TypeError):
+            view["name"] = "changed"
+
+    def test_missing_key(self):
+        view = LazyMergedView(self.layers)
+        self.assertNotIn("missing", view)
+        self.assertIsNone(view.get("missing"))
+
+    def test_configure_lazy(self):
+        configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+        active_profiles = ["prod", "overrides", "tagged"]
+
+        view = configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles, lazy=True)
+        self.assertIsInstance(view, LazyMergedView)
+        self.assertEqual(
+            view.to_dict(),
+            configure(configuration_dirs=configuration_dirs, active_profiles=active_profiles),
+        )
+
+    def test_configure_lazy_non_mapping_roots(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            for filename, contents in [("logging.yaml", "version: 1\n"), ("defaults.yaml", "a: 1\n")]:
+                with open(os.path.join(config_dir, filename), "w") as f:
+                    f.write(contents)
+
+            for contents in ["", "[1, 2]\n", "cat\n"]:
+                with open(os.path.join(config_dir, "prod.yaml"), "w") as f:
+                    f.write(contents)
+
+                with self.assertRaises(ConfigurationRootException):
+                    configure(configuration_dirs=[config_dir], active_profiles=["prod"], lazy=True)
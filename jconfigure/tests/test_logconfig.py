@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+import logging
+import logging.config
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ..logconfig import apply_logging_config, reset_applied_logging_config
+
+
+class TestApplyLoggingConfig(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        reset_applied_logging_config()
+
+        self.logging_config = {
+            "version": 1,
+            "disable_existing_loggers": False,
+            "formatters": {"plain": {"format": "%(message)s"}},
+            "handlers": {
+                "file": {"class": "logging.FileHandler", "filename": self.get_path("app.log"), "formatter": "plain"},
+                "other": {"class": "logging.FileHandler", "filename": self.get_path("other.log")},
+            },
+            "loggers": {
+                "jconfigure_test.app": {"level": "INFO", "handlers": ["file"], "propagate": False},
+                "jconfigure_test.other": {"level": "INFO", "handlers": ["other"], "propagate": False},
+            },
+        }
+
+        apply_logging_config(self.logging_config)
+
+    def tearDown(self):
+        logging.config.dictConfig({"version": 1, "disable_existing_loggers": False})
+        reset_applied_logging_config()
+        self.temp_dir.cleanup()
+
+    def get_path(self, filename):
+        return os.path.join(self.temp_dir.name, filename)
+
+    def get_handler(self, logger_name):
+        return logging.getLogger(logger_name).handlers[0]
+
+    def test_unchanged_config_skipped(self):
+        handler = self.get_handler("jconfigure_test.app")
+
+        with patch("logging.config.dictConfig") as dict_config:
+            self.assertFalse(apply_logging_config(dict(self.logging_config)))
+            dict_config.assert_not_called()
+
+        self.assertIs(self.get_handler("jconfigure_test.app"), handler)
+
+    def test_only_changed_handlers_replaced(self):
+        app_handler = self.get_handler("jconfigure_test.app")
+        other_handler = self.get_handler("jconfigure_test.other")
+
+        self.logging_config["handlers"]["file"]["filename"] = self.get_path("new.log")
+
+        with patch("logging.config.dictConfig") as dict_config:
+            self.assertTrue(apply_logging_config(self.logging_config))
+            dict_config.assert_not_called()
+
+        new_handler = self.get_handler("jconfigure_test.app")
+        self.assertIsNot(new_handler, app_handler)
+        self.assertEqual(new_handler.baseFilename, self.get_path("new.log"))
+        self.assertEqual(new_handler.name, "file")
+        self.assertIs(logging._handlers["file"], new_handler)
+        self.assertIsNone(app_handler.stream)
+
+        self.assertIs(self.get_handler("jconfigure_test.other"), other_handler)
+        self.assertIsNotNone(other_handler.stream)
+
+        logging.getLogger("jconfigure_test.app").info("hello")
+        new_handler.flush()
+
+        with open(self.get_path("new.log")) as f:
+            self.assertEqual(f.read(), "hello\n")
+
+    def test_logger_changes_keep_handlers(self):
+        handler = self.get_handler("jconfigure_test.app")
+        self.logging_config["loggers"]["jconfigure_test.app"]["level"] = "WARNING"
+        self.logging_config["loggers"]["jconfigure_test.new"] = {"level": "ERROR", "handlers": ["file"]}
+
+        with patch("logging.config.dictConfig") as dict_config:
+            apply_logging_config(self.logging_config)
+            dict_config.assert_not_called()
+
+        self.assertEqual(logging.getLogger("jconfigure_test.app").level, logging.WARNING)
+        self.assertIs(self.get_handler("jconfigure_test.app"), handler)
+        self.assertIs(self.get_handler("jconfigure_test.new"), handler)
+
+    def test_other_changes_reconfigure_everything(self):
+        self.logging_config["formatters"]["plain"]["format"] = "%(levelname)s %(message)s"
+
+        with patch("logging.config.dictConfig") as dict_config:
+            apply_logging_config(self.logging_config)
+            dict_config.assert_called_once_with(self.logging_config)
+
+        del self.logging_config["loggers"]["jconfigure_test.other"]
+
+        with patch("logging.config.dictConfig") as dict_config:
+            apply_logging_config(self.logging_config)
+            dict_config.assert_called_once_with(self.logging_config)
+
+    def test_existing_loggers_handled_like_dict_config(self):
+        def apply_change(level):
+            self.logging_config["loggers"]["jconfigure_test.app"]["level"] = level
+
+            with patch("logging.config.dictConfig") as dict_config:
+                apply_logging_config(self.logging_config)
+                dict_config.assert_not_called()
+
+        third_party = logging.getLogger("jconfigure_test_thirdparty.lib")
+        child = logging.getLogger("jconfigure_test.app.child")
+        child.setLevel(logging.DEBUG)
+        child.propagate = False
+
+        # disable_existing_loggers is False in this config
+        apply_change("WARNING")
+        self.assertFalse(third_party.disabled)
+        self.assertEqual(child.level, logging.NOTSET)
+        self.assertTrue(child.propagate)
+
+        self.logging_config["disable_existing_loggers"] = True
+        apply_logging_config(self.logging_config)
+        self.assertTrue(third_party.disabled)
+
+        third_party.disabled = False
+        apply_change("ERROR")
+        self.assertTrue(third_party.disabled)
+        self.assertFalse(child.disabled)
+        self.assertFalse(logging.getLogger("jconfigure_test.other").disabled)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+import sys
+import tracemalloc
+import unittest
+
+from .. import configure
+from ..exceptions import MemoryBudgetExceededException
+from ..memory import MemoryReport, deep_getsizeof
+from .test_utils import get_full_test_file_path
+
+
+class TestMemoryReport(unittest.TestCase):
+    def setUp(self):
+        self.configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+
+    def test_deep_getsizeof(self):
+        shared = ["x" * 1000]
+        value = {"a": shared, "b": shared}
+
+        self.assertGreater(deep_getsizeof(value), 1000)
+        self.assertLess(deep_getsizeof(value), 2000)
+        self.assertEqual(deep_getsizeof(5), sys.getsizeof(5))
+
+    def test_configure_memory_report(self):
+        report = MemoryReport()
+        config = configure(
+            configuration_dirs=self.configuration_dirs,
+            active_profiles=["prod", "tagged"],
+            memory_report=report,
+        )
+
+        self.assertIn(get_full_test_file_path("configure/app/prod.yaml"), report.file_allocations)
+        self.assertIn(get_full_test_file_path("configure/extra/prod.yaml"), report.file_allocations)
+        self.assertIn(get_full_test_file_path("includes/one.txt"), report.include_allocations)
+        self.assertEqual(set(report.subtree_sizes), set(config))
+        self.assertEqual(report.subtree_sizes["db"], deep_getsizeof(config["db"]))
+        self.assertEqual(report.total_size, deep_getsizeof(config))
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_check_budget(self):
+        report = MemoryReport()
+        configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod"], memory_report=report)
+
+        report.check_budget(max_total_size=10 * 1024 * 1024, max_subtree_size=1024 * 1024)
+
+        with self.assertRaises(MemoryBudgetExceededException) as context:
+            report.check_budget(max_total_size=1, max_subtree_size=1)
+
+        self.assertEqual(len(context.exception.violations), 1 + len(report.subtree_sizes))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+import os
+import random
+import sys
+import tempfile
+import unittest
+from types import MappingProxyType
+
+from .. import configure
+from ..deferred import DeferredValue
+from ..lazy import LazyMergedView
+from ..merge import APPEND, REPLACE, UNIQUE, copy_containers, merge_configurations, normalize_merge_strategies
+from ..yaml_tags import IncludeText
+from .test_utils import get_full_test_file_path
+
+
+def _deep_config(depth, leaf):
+    config = {"leaf": leaf}
+
+    for _ in range(depth):
+        config = {"level": config}
+
+    return config
+
+
+def _random_config(rng, depth=3):
+    config = {}
+
+    for key in rng.sample("abcd", rng.randint(0, 3)):
+        choice = rng.random()
+
+        if depth > 0 and choice < 0.4:
+            config[key] = _random_config(rng, depth - 1)
+        elif choice < 0.8:
+            config[key] = [rng.randint(0, 3) for _ in range(rng.randint(0, 2))]
+        else:
+            config[key] = rng.randint(0, 3)
+
+    return config
+
+
+class TestMergeConfigurations(unittest.TestCase):
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 2
+        merged = merge_configurations(_deep_config(depth, 1), _deep_config(depth, 2))
+
+        for _ in range(depth):
+            merged = merged["level"]
+
+        self.assertEqual(merged, {"leaf": 2})
+
+    def test_plain_merge(self):
+        rng = random.Random(7)
+
+        for _ in range(200):
+            layers = [_random_config(rng) for _ in range(rng.randint(1, 4))]
+            checked, plain = {}, {}
+
+            for layer in layers:
+                merge_configurations(checked, layer)
+                merge_configurations(plain, layer, plain=True)
+
+            self.assertEqual(plain, checked)
+
+        depth = sys.getrecursionlimit() * 2
+        merged = merge_configurations(_deep_config(depth, 1), _deep_config(depth, 2), plain=True)
+
+        for _ in range(depth):
+            merged = merged["level"]
+
+        self.assertEqual(merged, {"leaf": 2})
+
+    def test_mapping_subclasses(self):
+        base_config = {"db": MappingProxyType({"host": "localhost", "port": 5432})}
+        merge_configurations(base_config, MappingProxyType({"db": MappingProxyType({"port": 6432})}))
+
+        self.assertEqual(base_config, {"db": {"host": "localhost", "port": 6432}})
+        self.assertIs(type(base_config["db"]), dict)
+
+    def test_overrides_never_aliased(self):
+        overrides = {"db": {"hosts": ["a"], "options": {"ssl": True}}, "tags": {"x"}}
+        base_config = merge_configurations({}, overrides)
+
+        base_config["db"]["hosts"].append("b")
+        base_config["db"]["options"]["ssl"] = False
+        base_config["tags"].add("y")
+
+        self.assertEqual(overrides, {"db": {"hosts": ["a"], "options": {"ssl": True}}, "tags": {"x"}})
+
+    def test_copy_containers(self):
+        value = {"a": [{"b": 1}], "c": MappingProxyType({"d": 2})}
+        copied = copy_containers(value)
+
+        self.assertEqual(copied, {"a": [{"b": 1}], "c": {"d": 2}})
+        self.assertIsNot(copied["a"][0], value["a"][0])
+
+    def test_strategies(self):
+        base_config = {"hosts": ["a", "b"], "ports": [1, 2], "db": {"host": "localhost", "port": 5432}, "tags": ["x"]}
+        overrides = {"hosts": ["b", "c"], "ports": [2, 3], "db": {"host": "prod-db"}, "tags": ["y"]}
+
+        merge_configurations(base_config, overrides, strategies={"hosts": UNIQUE, "ports": APPEND, "db": REPLACE})
+
+        self.assertEqual(base_config, {"hosts": ["a", "b", "c"], "ports": [1, 2, 2, 3], "db": {"host": "prod-db"}, "tags": ["y"]})
+
+    def test_nested_strategy_paths(self):
+        base_config = {"service": {"hosts": ["a"]}}
+        merge_configurations(base_config, {"service": {"hosts": ["b"]}}, strategies={("service", "hosts"): APPEND})
+
+        self.assertEqual(base_config, {"service": {"hosts": ["a", "b"]}})
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            normalize_merge_strategies({"hosts": "prepend"})
+
+    def test_overridden_deferred_values_not_resolved(self):
+        context = {"_parsing_filename": get_full_test_file_path("configure/deferred/defaults.yaml")}
+        missing = DeferredValue(IncludeText, context, ["../../includes/missing.txt"], {})
+
+        base_config = merge_configurations({"text": missing}, {"text": {"a": 1}}, copy_overrides=False)
+
+        self.assertFalse(missing.resolved)
+        self.assertEqual(base_config, {"text": {"a": 1}})
+
+    def test_lazy_view_matches_eager_merge(self):
+        rng = random.Random(5)
+        strategies = normalize_merge_strategies({"a": APPEND, "b.c": UNIQUE, "d": REPLACE, "b.a": APPEND})
+
+        for _ in range(200):
+            layers = [_random_config(rng) for _ in range(rng.randint(1, 4))]
+
+            expected = {}
+            for layer in layers:
+                merge_configurations(expected, layer, strategies=strategies)
+
+            self.assertEqual(LazyMergedView(layers, strategies).to_dict(), expected)
+
+    def test_configure_merges_tag_mappings(self):
+        # Files are only merged as plain values until a tag which may produce other Mappings is constructed
+        with tempfile.TemporaryDirectory() as config_dir:
+            for filename, contents in [
+                ("logging.yaml", "version: 1\n"),
+                ("defaults.yaml", "db: {host: localhost, port: 5432}\nname: !EnvVar {name: _TEST_NAME, default: app}\n"),
+                ("prod.yaml", "db: !ContextValue db\n"),
+            ]:
+                with open(os.path.join(config_dir, filename), "w") as f:
+                    f.write(contents)
+
+            config = configure(
+                configuration_dirs=[config_dir],
+                active_profiles=["prod"],
+                context={"db": MappingProxyType({"port": 6432})},
+            )
+
+        self.assertEqual(config, {"db": {"host": "localhost", "port": 6432}, "name": "app"})
+
+    def test_configure_merge_strategies(self):
+        configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+        config = configure(
+            configuration_dirs=configuration_dirs,
+            active_profiles=["prod"],
+            merge_strategies={"order": APPEND},
+        )
+        lazy_config = configure(
+            configuration_dirs=configuration_dirs,
+            active_profiles=["prod"],
+            merge_strategies={"order": APPEND},
+            lazy=True,
+        )
+
+        self.assertEqual(config["order"], ["defaults", "app-prod", "extra-prod"])
+        self.assertEqual(lazy_config.to_dict(), config)
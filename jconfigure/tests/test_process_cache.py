@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+import gc
+import os
+import threading
+import time
+import unittest
+import weakref
+from unittest.mock import patch
+
+from .. import configure, get_configuration, invalidate_configuration
+from ..process_cache import _CACHE, _Entry
+from ..tracing import RecordingTracer
+from .test_utils import get_full_test_file_path
+
+
+class TestGetConfiguration(unittest.TestCase):
+    def setUp(self):
+        invalidate_configuration()
+        self.configuration_dirs = [get_full_test_file_path("configure/app")]
+
+        patcher = patch("jconfigure.process_cache.configure", wraps=configure)
+        self.configure = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        invalidate_configuration()
+
+    def test_cached(self):
+        config = get_configuration(configuration_dirs=self.configuration_dirs, active_profiles=["prod"])
+
+        self.assertIs(get_configuration(configuration_dirs=self.configuration_dirs, active_profiles=["prod"]), config)
+        self.assertIs(get_configuration(configuration_dirs=self.configuration_dirs, active_profiles=["prod"], lazy=False), config)
+        self.assertEqual(self.configure.call_count, 1)
+
+        self.assertEqual(get_configuration(configuration_dirs=self.configuration_dirs)["from_yaml"], True)
+        self.assertEqual(self.configure.call_count, 2)
+
+    def test_keyed_on_objects(self):
+        class Thing:
+            pass
+
+        # Arguments which don't change the configuration aren't part of the key
+        config = get_configuration(configuration_dirs=self.configuration_dirs, tracer=RecordingTracer())
+        self.assertIs(get_configuration(configuration_dirs=self.configuration_dirs, tracer=RecordingTracer()), config)
+
+        # Objects without a repr of their own are keyed by identity, and kept alive while their configuration is cached
+        thing = Thing()
+        thing_ref = weakref.ref(thing)
+        config = get_configuration(configuration_dirs=self.configuration_dirs, context={"thing": thing})
+
+        self.assertIs(get_configuration(configuration_dirs=self.configuration_dirs, context={"thing": thing}), config)
+        self.assertIsNot(get_configuration(configuration_dirs=self.configuration_dirs, context={"thing": Thing()}), config)
+        self.assertEqual(self.configure.call_count, 3)
+
+        del thing
+        gc.collect()
+        self.assertIsNotNone(thing_ref())
+
+        # The calls recorded by the mock of configure refer to it too
+        self.configure.reset_mock()
+        invalidate_configuration()
+        gc.collect()
+        self.assertIsNone(thing_ref())
+
+    def test_keyed_on_environment(self):
+        with patch.dict(os.environ, {"JCONFIGURE_CONFIG_DIRECTORIES": self.configuration_dirs[0]}):
+            with patch.dict(os.environ, {"JCONFIGURE_ACTIVE_PROFILES": "prod"}):
+                prod_config = get_configuration()
+
+            with patch.dict(os.environ, {"JCONFIGURE_ACTIVE_PROFILES": "stage"}):
+                stage_config = get_configuration()
+
+            with patch.dict(os.environ, {"JCONFIGURE_ACTIVE_PROFILES": "prod"}):
+                self.assertIs(get_configuration(), prod_config)
+
+        self.assertEqual(prod_config["name"], "app-prod")
+        self.assertEqual(stage_config["name"], "stage")
+        self.assertEqual(self.configure.call_count, 2)
+
+    def test_concurrent_callers_share_one_build(self):
+        started = threading.Event()
+
+        def slow_configure(**kwargs):
+            started.set()
+            time.sleep(0.1)
+            return configure(**kwargs)
+
+        self.configure.side_effect = slow_configure
+        results = []
+
+        def get():
+            results.append(get_configuration(configuration_dirs=self.configuration_dirs))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        threads[0].start()
+        started.wait()
+
+        for thread in threads[1:]:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.configure.call_count, 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_failures_not_cached(self):
+        self.configure.side_effect = ValueError("broken")
+
+        with self.assertRaises(ValueError):
+            get_configuration(configuration_dirs=self.configuration_dirs)
+
+        self.configure.side_effect = None
+        self.assertEqual(get_configuration(configuration_dirs=self.configuration_dirs)["from_yaml"], True)
+
+    def test_invalidate(self):
+        config = get_configuration(configuration_dirs=self.configuration_dirs)
+        other_config = get_configuration(configuration_dirs=self.configuration_dirs, active_profiles=["prod"])
+
+        invalidate_configuration(configuration_dirs=self.configuration_dirs)
+        self.assertIsNot(get_configuration(configuration_dirs=self.configuration_dirs), config)
+        self.assertIs(get_configuration(configuration_dirs=self.configuration_dirs, active_profiles=["prod"]), other_config)
+
+        invalidate_configuration()
+        self.assertIsNot(get_configuration(configuration_dirs=self.configuration_dirs, active_profiles=["prod"]), other_config)
+        self.assertEqual(self.configure.call_count, 4)
+
+    def test_reset_after_fork(self):
+        config = get_configuration(configuration_dirs=self.configuration_dirs)
+        _CACHE._entries["in flight"] = _Entry()
+
+        _CACHE.reset_after_fork()
+
+        self.assertNotIn("in flight", _CACHE._entries)
+        self.assertIs(get_configuration(configuration_dirs=self.configuration_dirs), config)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "Requires os.fork")
+    def test_forked_child(self):
+        config = get_configuration(configuration_dirs=self.configuration_dirs)
+        _CACHE._entries["in flight"] = _Entry()
+
+        pid = os.fork()
+        if pid == 0:
+            # A lingering in flight entry would block the child forever, instead of failing the test
+            ok = "in flight" not in _CACHE._entries and get_configuration(configuration_dirs=self.configuration_dirs) is config
+            os._exit(0 if ok else 1)
+
+        del _CACHE._entries["in flight"]
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import threading
+import unittest
+
+from unittest.mock import patch
+from .. import ReloadableConfiguration
+
+
+def _write_file(filename, contents):
+    with open(filename, "w") as f:
+        f.write(contents)
+
+
+class TestReloadableConfiguration(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = self.temp_dir.name
+
+        _write_file(self.get_path("logging.yaml"), "version: 1\ndisable_existing_loggers: false\n")
+        _write_file(self.get_path("defaults.yaml"), "cat: echo\nsecret: !IncludeText secret.txt\n")
+        _write_file(self.get_path("prod.yaml"), "dog: oscar\n")
+        _write_file(self.get_path("secret.txt"), "hunter2")
+
+        self.reloadable = ReloadableConfiguration(configuration_dirs=self.config_dir, active_profiles=["prod"])
+
+    def tearDown(self):
+        self.reloadable.stop_watching()
+        self.temp_dir.cleanup()
+
+    def get_path(self, filename):
+        return os.path.join(self.config_dir, filename)
+
+    def test_initial_config(self):
+        self.assertEqual(self.reloadable.config, {"cat": "echo", "secret": "hunter2", "dog": "oscar"})
+        self.assertIn(self.get_path("secret.txt"), self.reloadable.files)
+
+    def test_check_without_changes_parses_nothing(self):
+        with patch("jconfigure.reload._parse_file_handle_exceptions") as parse:
+            self.assertFalse(self.reloadable.check())
+            parse.assert_not_called()
+
+    def test_only_affected_files_reparsed(self):
+        _write_file(self.get_path("secret.txt"), "hunter3")
+        notifications = []
+        self.reloadable.subscribe(notifications.append)
+
+        with patch("jconfigure.reload._parse_file_handle_exceptions", return_value={"cat": "jingles"}) as parse:
+            self.assertTrue(self.reloadable.check())
+            self.assertEqual([c[0][0] for c in parse.call_args_list], [self.get_path("defaults.yaml")])
+
+        self.assertEqual(notifications, [{"cat": "jingles", "dog": "oscar"}])
+
+    def test_parsed_files_not_modified_by_merge(self):
+        _write_file(self.get_path("defaults.yaml"), "pets: {cat: echo}\n")
+        _write_file(self.get_path("prod.yaml"), "pets: {dog: oscar}\n")
+        self.reloadable.check()
+        _write_file(self.get_path("prod.yaml"), "pets: {bird: tweety}\n")
+        self.reloadable.check()
+
+        self.assertEqual(self.reloadable.config, {"pets": {"cat": "echo", "bird": "tweety"}})
+
+    def test_set_active_profiles(self):
+        _write_file(self.get_path("stage.yaml"), "dog: max\nbird: tweety\n")
+
+        self.assertTrue(self.reloadable.set_active_profiles(["stage", "prod"]))
+        self.assertEqual(self.reloadable.config, {"cat": "echo", "secret": "hunter2", "dog": "oscar", "bird": "tweety"})
+
+        self.assertTrue(self.reloadable.set_active_profiles(["prod"]))
+        self.assertEqual(self.reloadable.config, {"cat": "echo", "secret": "hunter2", "dog": "oscar"})
+        self.assertNotIn(self.get_path("stage.yaml"), self.reloadable.files)
+
+    def test_previous_config_unchanged_by_reload(self):
+        previous_config = self.reloadable.config
+        _write_file(self.get_path("prod.yaml"), "dog: max\n")
+        self.reloadable.check()
+
+        self.assertEqual(previous_config["dog"], "oscar")
+        self.assertEqual(self.reloadable.config["dog"], "max")
+
+    def test_new_file_triggers_reload(self):
+        _write_file(self.get_path("prod.json"), '{"bird": "tweety"}')
+        self.assertTrue(self.reloadable.check())
+        self.assertEqual(self.reloadable.config["bird"], "tweety")
+
+    def test_watching_notifies_subscribers(self):
+        changed = threading.Event()
+        # The write may be noticed between truncating and writing the file, so wait for the final contents
+        self.reloadable.subscribe(lambda config: config.get("dog") == "max" and changed.set())
+        self.reloadable.start_watching(interval=0.01)
+
+        _write_file(self.get_path("prod.yaml"), "dog: max\n")
+        self.assertTrue(changed.wait(5))
+        self.assertEqual(self.reloadable.config["dog"], "max")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+import multiprocessing
+import os
+import stat
+import tempfile
+import unittest
+
+from .. import configure
+from ..frozen import FrozenDict
+from ..shared import SharedConfiguration, publish_configuration
+from .test_utils import get_full_test_file_path
+
+
+def _read_shared_configuration(path, queue):
+    queue.put(SharedConfiguration(path).config)
+
+
+class TestSharedConfiguration(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "config.shm")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_publish_and_read(self):
+        config = configure(configuration_dirs=[get_full_test_file_path("configure/app")], active_profiles=["prod"])
+
+        self.assertEqual(publish_configuration(self.path, config), 1)
+
+        shared = SharedConfiguration(self.path)
+        self.assertEqual(shared.config, config)
+        self.assertEqual(shared.generation, 1)
+        self.assertEqual(os.listdir(self.temp_dir.name), ["config.shm"])
+
+    def test_new_generation_detected(self):
+        publish_configuration(self.path, {"version": 1})
+        shared = SharedConfiguration(self.path)
+        first_config = shared.config
+
+        self.assertFalse(shared.has_new_generation())
+        self.assertIs(shared.config, first_config)
+
+        self.assertEqual(publish_configuration(self.path, {"version": 2}), 2)
+        self.assertTrue(shared.has_new_generation())
+        self.assertEqual(shared.config, {"version": 2})
+        self.assertEqual(shared.generation, 2)
+
+    def test_file_mode(self):
+        publish_configuration(self.path, {"version": 1})
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+
+        publish_configuration(self.path, {"version": 2}, mode=0o640)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_untrusted_file_refused(self):
+        with self.assertRaises(ValueError):
+            publish_configuration(self.path, {"version": 1}, mode=0o664)
+
+        publish_configuration(self.path, {"version": 1})
+
+        with self.assertRaises(PermissionError):
+            SharedConfiguration(self.path, owner=os.geteuid() + 1).config
+
+        os.chmod(self.path, 0o666)
+
+        with self.assertRaises(PermissionError):
+            SharedConfiguration(self.path).config
+
+    def test_frozen(self):
+        publish_configuration(self.path, {"db": {"ports": [1, 2]}})
+        config = SharedConfiguration(self.path, frozen=True).config
+
+        self.assertIsInstance(config, FrozenDict)
+        self.assertEqual(config["db"]["ports"], (1, 2))
+
+    def test_invalid_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a configuration")
+
+        with self.assertRaises(ValueError):
+            SharedConfiguration(self.path).config
+
+    def test_read_from_other_process(self):
+        publish_configuration(self.path, {"name": "shared"})
+
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_read_shared_configuration, args=(self.path, queue))
+        process.start()
+        process.join()
+
+        self.assertEqual(queue.get(timeout=5), {"name": "shared"})
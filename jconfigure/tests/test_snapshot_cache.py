@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+import os
+import tempfile
+import unittest
+
+from unittest.mock import patch
+from .. import configure
+from ..cache import SnapshotCache
+
+
+def _write_file(filename, contents):
+    with open(filename, "w") as f:
+        f.write(contents)
+
+
+class TestSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_dir = os.path.join(self.temp_dir.name, "config")
+        self.cache = SnapshotCache(os.path.join(self.temp_dir.name, "cache"))
+
+        os.mkdir(self.config_dir)
+        _write_file(os.path.join(self.config_dir, "logging.yaml"), "version: 1\ndisable_existing_loggers: false\n")
+        _write_file(os.path.join(self.config_dir, "defaults.yaml"), "\n".join([
+            "password: !IncludeText password.txt",
+            "user: !EnvVar {name: _TEST_SNAPSHOT_USER, default: nobody}",
+            "cat: !ContextValue cat",
+        ]))
+        _write_file(os.path.join(self.config_dir, "password.txt"), "hunter2")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def configure(self, context={"cat": "echo"}):
+        return configure(configuration_dirs=self.config_dir, context=context, snapshot_cache=self.cache)
+
+    def test_snapshot_hit_skips_parsing(self):
+        expected = {"password": "hunter2", "user": "nobody", "cat": "echo"}
+        self.assertEqual(self.configure(), expected)
+
+        with patch("jconfigure.parse_file") as parse_file:
+            self.assertEqual(self.configure(), expected)
+            parse_file.assert_not_called()
+
+    def test_included_file_change_invalidates(self):
+        self.configure()
+        _write_file(os.path.join(self.config_dir, "password.txt"), "hunter3")
+        self.assertEqual(self.configure()["password"], "hunter3")
+
+    def test_new_config_file_invalidates(self):
+        self.configure()
+        _write_file(os.path.join(self.config_dir, "defaults.json"), '{"extra": "root"}')
+        self.assertEqual(self.configure()["extra"], "root")
+
+    def test_env_var_change_invalidates(self):
+        self.configure()
+
+        with patch.dict("os.environ", {"_TEST_SNAPSHOT_USER": "jingles"}):
+            self.assertEqual(self.configure()["user"], "jingles")
+
+    def test_context_is_part_of_key(self):
+        self.configure()
+        self.assertEqual(self.configure({"cat": "jingles"})["cat"], "jingles")
+
+    def test_time_dependent_config_not_stored(self):
+        _write_file(os.path.join(self.config_dir, "defaults.yaml"), "now: !Timestamp {}")
+        self.configure()
+        self.assertFalse(os.path.isdir(self.cache.cache_dir))
+
+    def test_nested_deferred_include_change_invalidates(self):
+        # With lazy_tags, tags in a file included with !IncludeYaml are only evaluated after the include was read
+        _write_file(os.path.join(self.config_dir, "defaults.yaml"), "pets: !IncludeYaml pets.yaml")
+        _write_file(os.path.join(self.config_dir, "pets.yaml"), "cat: !IncludeText cat.txt")
+        _write_file(os.path.join(self.config_dir, "cat.txt"), "jingles")
+
+        def configure_lazy_tags():
+            return configure(configuration_dirs=self.config_dir, snapshot_cache=self.cache, lazy_tags=True)
+
+        self.assertEqual(configure_lazy_tags(), {"pets": {"cat": "jingles"}})
+        _write_file(os.path.join(self.config_dir, "cat.txt"), "echo")
+        self.assertEqual(configure_lazy_tags(), {"pets": {"cat": "echo"}})
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+import io
+import os
+import tempfile
+import unittest
+
+from .. import configure
+from ..deferred import DeferredValue
+from ..exceptions import ConfigurationRootException, FileParsingException
+from ..intern import Interner
+from ..streaming import StreamingMerge
+from ..yaml_tags import IncludeText
+from .test_utils import get_full_test_file_path
+
+
+class TestStreamingMerge(unittest.TestCase):
+    def setUp(self):
+        self.context = {"_parsing_filename": get_full_test_file_path("configure/deferred/defaults.yaml")}
+
+    def merge(self, *documents, streaming_merge=None):
+        """
+        Merges the yaml documents in order, by streaming them from the last to the first
+        """
+        streaming_merge = streaming_merge or StreamingMerge({})
+
+        for document in reversed(documents):
+            with streaming_merge.merging_file():
+                streaming_merge.merge_earlier_yaml(io.StringIO(document), self.context)
+
+        return streaming_merge.base_config
+
+    def test_later_values_win(self):
+        config = self.merge(
+            "a: 1\nb: {c: 2, d: [1, 2]}\nkept: true\n",
+            "a: 2\nb: {c: 3, e: 4}\n",
+            "b: {d: [3]}\n",
+        )
+
+        self.assertEqual(config, {"a": 2, "b": {"c": 3, "d": [3], "e": 4}, "kept": True})
+
+    def test_replaced_dict_closed(self):
+        self.assertEqual(self.merge("a: {x: 1}\n", "a: 5\n", "a: {y: 2}\n"), {"a": {"y": 2}})
+        self.assertEqual(self.merge("a: {x: 1}\n", "a: [1]\n", "a: {y: {z: 2}}\n"), {"a": {"y": {"z": 2}}})
+        self.assertEqual(self.merge("a: {x: {z: 1}}\n", "a: {x: null}\n", "a: {x: {y: 2}}\n"), {"a": {"x": {"y": 2}}})
+
+    def test_overridden_values_never_constructed(self):
+        config = self.merge(
+            "secret: !IncludeText ../../includes/missing.txt\nnested: {value: !IncludeText ../../includes/missing.txt}\n",
+            "secret: from prod\nnested: {value: 1}\n",
+        )
+
+        self.assertEqual(config, {"secret": "from prod", "nested": {"value": 1}})
+
+    def test_tagged_values_merged(self):
+        config = self.merge(
+            "included: !IncludeYaml ../../includes/one.yaml\n",
+            "included: {oscar: cat}\n",
+        )
+
+        self.assertEqual(config, {"included": {"jingles": "cat", "oscar": "cat"}})
+
+    def test_anchors_in_skipped_values(self):
+        config = self.merge(
+            "a: &shared {x: 1}\nb: *shared\nc: [&item 1, *item]\n",
+            "a: 2\nc: 3\n",
+        )
+
+        self.assertEqual(config, {"a": 2, "b": {"x": 1}, "c": 3})
+
+    def test_merge_keys_fall_back(self):
+        config = self.merge(
+            "base: &base {x: 1, y: 2}\nchild:\n  z: 3\n  <<: *base\n  x: 4\n",
+            "child: {y: 5}\n",
+        )
+
+        self.assertEqual(config, {"base": {"x": 1, "y": 2}, "child": {"x": 4, "y": 5, "z": 3}})
+
+    def test_duplicate_keys_fall_back(self):
+        self.assertEqual(self.merge("a: {x: 1}\na: {y: 2}\n", "b: 1\n"), {"a": {"y": 2}, "b": 1})
+
+    def test_non_mapping_values(self):
+        self.assertEqual(self.merge("{}\n", "a: 1\n"), {"a": 1})
+        self.assertEqual(self.merge("!IncludeYaml ../../includes/one.yaml\n", "oscar: cat\n"), {"jingles": "cat", "oscar": "cat"})
+
+        for document in ["", "---\n", "[1, 2]\n", "cat\n"]:
+            with self.assertRaises(ConfigurationRootException):
+                self.merge("a: 1\n", document)
+
+    def test_failed_file_rolled_back(self):
+        streaming_merge = StreamingMerge({"b": {"c": 1}})
+
+        with self.assertRaises(Exception):
+            self.merge("a: 1\nb: {d: 2}\nc: [\n", streaming_merge=streaming_merge)
+
+        self.assertEqual(streaming_merge.base_config, {"b": {"c": 1}})
+        self.assertEqual(self.merge("b: 2\n", streaming_merge=streaming_merge), {"b": {"c": 1}})
+
+    def test_deferred_values(self):
+        context = {**self.context, "_deferred_tags": frozenset([IncludeText])}
+        streaming_merge = StreamingMerge({})
+
+        for document in ["secret: !IncludeText ../../includes/missing.txt\n", "secret: from prod\n"][::-1]:
+            streaming_merge.merge_earlier_yaml(io.StringIO(document), context)
+
+        self.assertEqual(streaming_merge.base_config, {"secret": "from prod"})
+
+        streaming_merge.merge_earlier(
+            {"kept": DeferredValue(IncludeText, context, ["../../includes/one.txt"], {})}
+        )
+        self.assertEqual(streaming_merge.base_config["kept"].resolve(), "animals")
+
+    def test_aliased_values_not_shared(self):
+        # Earlier files merge into each alias separately, as they do when merging eagerly
+        documents = [
+            "primary: {port: 5432}\nreplica: {port: 5433}\n",
+            "primary: &db {host: prod-db}\nreplica: *db\n",
+        ]
+        expected = {"primary": {"host": "prod-db", "port": 5432}, "replica": {"host": "prod-db", "port": 5433}}
+
+        self.assertEqual(self.merge(*documents), expected)
+        self.assertEqual(self.merge(documents[0], "nested: {a: &db {host: prod-db}, b: [*db]}\n")["nested"], {
+            "a": {"host": "prod-db"},
+            "b": [{"host": "prod-db"}],
+        })
+
+        # Merge keys are merged from the fully parsed document
+        self.assertEqual(self.merge(documents[0], "base: &db {host: prod-db}\nprimary: *db\nreplica: {<<: *db}\n"), {
+            "base": {"host": "prod-db"},
+            **expected,
+        })
+
+    def test_interned(self):
+        streaming_merge = StreamingMerge({}, Interner())
+        config = self.merge("a: {host: localhost}\n", "b: {host: localhost}\n", streaming_merge=streaming_merge)
+
+        self.assertIs(config["a"]["host"], config["b"]["host"])
+
+
+class TestConfigureStreaming(unittest.TestCase):
+    def assert_same_configuration(self, **kwargs):
+        self.assertEqual(configure(streaming=True, **kwargs), configure(**kwargs))
+
+    def test_same_configuration(self):
+        self.assert_same_configuration(
+            configuration_dirs=[get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")],
+            active_profiles=["prod", "overrides", "stage"],
+        )
+        self.assert_same_configuration(
+            configuration_dirs=[get_full_test_file_path("configure/deferred")],
+            active_profiles=["prod"],
+            lazy_tags=True,
+        )
+
+    def test_overridden_errors_never_raised(self):
+        configuration_dirs = [get_full_test_file_path("configure/deferred")]
+
+        with self.assertRaises(FileParsingException):
+            configure(configuration_dirs=configuration_dirs, active_profiles=["prod"])
+
+        config = configure(configuration_dirs=configuration_dirs, active_profiles=["prod"], streaming=True)
+        self.assertEqual(config["secret"], "from prod")
+
+    def test_parse_errors(self):
+        configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/broken")]
+
+        with self.assertRaises(FileParsingException):
+            configure(configuration_dirs=configuration_dirs, active_profiles=["prod"], streaming=True)
+
+        self.assertEqual(
+            configure(configuration_dirs=configuration_dirs, active_profiles=["prod"], streaming=True, fail_on_parse_error=False),
+            configure(configuration_dirs=configuration_dirs, active_profiles=["prod"], fail_on_parse_error=False),
+        )
+
+    def test_aliased_subtrees(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            for filename, contents in [
+                ("logging.yaml", "version: 1\n"),
+                ("defaults.yaml", "primary: {port: 5432}\nreplica: {port: 5433}\n"),
+                ("prod.yaml", "primary: &db {host: prod-db}\nreplica: *db\n"),
+            ]:
+                with open(os.path.join(config_dir, filename), "w") as f:
+                    f.write(contents)
+
+            self.assert_same_configuration(configuration_dirs=[config_dir], active_profiles=["prod"])
+            config = configure(configuration_dirs=[config_dir], active_profiles=["prod"], streaming=True)
+            self.assertEqual(config["replica"]["port"], 5433)
+
+    def test_non_mapping_roots(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            for filename, contents in [("logging.yaml", "version: 1\n"), ("defaults.yaml", "a: 1\n")]:
+                with open(os.path.join(config_dir, filename), "w") as f:
+                    f.write(contents)
+
+            for contents in ["", "null\n", "[1, 2]\n", "cat\n"]:
+                with open(os.path.join(config_dir, "prod.yaml"), "w") as f:
+                    f.write(contents)
+
+                for streaming in [False, True]:
+                    for fail_on_parse_error in [True, False]:
+                        with self.assertRaises(ConfigurationRootException):
+                            configure(
+                                configuration_dirs=[config_dir],
+                                active_profiles=["prod"],
+                                streaming=streaming,
+                                fail_on_parse_error=fail_on_parse_error,
+                            )
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+import unittest
+
+import yaml
+
+from ..exceptions import UnsupportedNodeTypeException
+from ..tag_registry import TagRegistry
+from ..yaml_tags import (
+    TAG_REGISTRY,
+    ArgListAcceptingYamlTag,
+    ContextPassingYamlLoader,
+    ContextValue,
+    load_yaml_with_context,
+)
+
+
+class TestTagRegistry(unittest.TestCase):
+    def setUp(self):
+        self.context = {"_parsing_filename": "test.yaml", "cat": "echo"}
+
+    def test_pyyaml_loaders_unaffected(self):
+        for loader_class in [yaml.Loader, yaml.FullLoader, yaml.SafeLoader]:
+            with self.assertRaises(yaml.constructor.ConstructorError):
+                yaml.load("cat: !ContextValue cat", Loader=loader_class)
+
+    def test_loader_for(self):
+        loader_class = TAG_REGISTRY.loader_for(yaml.SafeLoader)
+
+        self.assertIs(TAG_REGISTRY.loader_for(yaml.SafeLoader), loader_class)
+        self.assertTrue(issubclass(loader_class, yaml.SafeLoader))
+        self.assertEqual(
+            load_yaml_with_context("cat: !ContextValue cat", self.context, loader_class),
+            {"cat": "echo"},
+        )
+
+        # Python objects can't be constructed, as with the SafeLoader itself
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            load_yaml_with_context("cat: !!python/name:os.getcwd", self.context, loader_class)
+
+    def test_custom_registry(self):
+        registry = TagRegistry([ContextValue])
+
+        class Upper(ArgListAcceptingYamlTag, registry=registry):
+            yaml_tag = "!Upper"
+            supported_node_types = yaml.ScalarNode, yaml.MappingNode
+
+            @classmethod
+            def map_node_data(cls, context, value):
+                return value.upper()
+
+        loader_class = registry.loader_for(yaml.SafeLoader)
+        self.assertEqual(
+            load_yaml_with_context("cat: !Upper {value: !ContextValue cat}", self.context, loader_class),
+            {"cat": "ECHO"},
+        )
+        self.assertEqual(
+            load_yaml_with_context("cat: !Upper oscar", self.context, loader_class),
+            {"cat": "OSCAR"},
+        )
+
+        self.assertNotIn("!Upper", TAG_REGISTRY.tag_classes)
+        with self.assertRaises(yaml.constructor.ConstructorError):
+            load_yaml_with_context("cat: !Upper oscar", self.context, ContextPassingYamlLoader)
+
+    def test_register_after_bind(self):
+        registry = TagRegistry()
+        loader_class = registry.loader_for(yaml.SafeLoader)
+
+        @registry.register
+        class Echo(ArgListAcceptingYamlTag, registry=None):
+            yaml_tag = "!Echo"
+
+            @classmethod
+            def map_node_data(cls, context, *args, **kwargs):
+                return list(args) or kwargs
+
+        self.assertEqual(registry.tag_classes, {"!Echo": Echo})
+        self.assertEqual(load_yaml_with_context("!Echo [1, 2]", self.context, loader_class), [1, 2])
+        self.assertEqual(load_yaml_with_context("!Echo {a: 1}", self.context, loader_class), {"a": 1})
+
+    def test_unsupported_node_type(self):
+        with self.assertRaises(UnsupportedNodeTypeException):
+            load_yaml_with_context("cat: !ContextValue [cat]", self.context)
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+import logging
+import os
+import tempfile
+import unittest
+
+from .. import configure
+from ..tracing import RecordingTracer
+from .test_utils import get_full_test_file_path
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        self.configuration_dirs = [get_full_test_file_path("configure/app"), get_full_test_file_path("configure/extra")]
+
+    def test_events_recorded(self):
+        tracer = RecordingTracer()
+        configure(configuration_dirs=self.configuration_dirs, active_profiles=["prod", "tagged"], tracer=tracer)
+
+        self.assertEqual(
+            [e.name for e in tracer.get_events("phase")],
+            ["discovery", "logging", "defaults", "profiles"],
+        )
+        self.assertEqual(
+            [e.filename for e in tracer.get_events("file")],
+            [e.filename for e in tracer.get_events("merge")],
+        )
+        self.assertEqual(len(tracer.get_events("file")), 6)
+        self.assertEqual(sorted(e.name for e in tracer.get_events("tag")), ["!IncludeText", "!StringFormat"])
+        self.assertEqual([e.num_bytes for e in tracer.get_events("include")], [8])
+
+        file_bytes = {e.filename: e.num_bytes for e in tracer.get_events("file")}
+        profiles_phase = tracer.get_events("phase")[-1]
+        self.assertEqual(
+            profiles_phase.num_bytes,
+            sum(b for f, b in file_bytes.items() if f.endswith("prod.yaml") or f.endswith("tagged.yaml")),
+        )
+
+    def test_debug_dump_skipped_when_debug_disabled(self):
+        logger = logging.getLogger("jconfigure")
+        self.addCleanup(logger.setLevel, logger.level)
+        logger.setLevel(logging.INFO)
+
+        # The config can't be dumped to JSON, so configure would fail if it was dumped without debug logging enabled
+        with tempfile.TemporaryDirectory() as config_dir:
+            with open(os.path.join(config_dir, "logging.yaml"), "w") as f:
+                f.write("version: 1\ndisable_existing_loggers: false\n")
+            with open(os.path.join(config_dir, "defaults.yaml"), "w") as f:
+                f.write("cat: !ContextValue cat\n")
+
+            cat = object()
+            self.assertIs(configure(configuration_dirs=config_dir, context={"cat": cat})["cat"], cat)
+
+            with self.assertLogs(logger, level=logging.DEBUG) as logs:
+                configure(configuration_dirs=self.configuration_dirs)
+
+            self.assertTrue(any("Constructed config: " in line for line in logs.output))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+import json
+import unittest
+
+import yaml
+
+from unittest.mock import patch
+from ..yaml_tags import (
+    CONTEXT_PASSING_YAML_LOADERS,
+    ContextPassingYamlLoader,
+    ContextPassingCYamlLoader,
+    load_yaml_with_context,
+)
+from .test_utils import get_full_test_file_path
+
+
+@unittest.skipIf(ContextPassingCYamlLoader is None, "PyYAML was not built with libyaml")
+class TestYamlLoaders(unittest.TestCase):
+    @staticmethod
+    def load(filename, loader_class, context={}):
+        full_filename = get_full_test_file_path(filename)
+
+        with open(full_filename) as yaml_file:
+            return load_yaml_with_context(yaml_file, {**context, "_parsing_filename": full_filename}, loader_class)
+
+    def assert_loaders_agree(self, filename, context={}):
+        self.assertEqual(
+            TestYamlLoaders.load(filename, ContextPassingYamlLoader, context),
+            TestYamlLoaders.load(filename, ContextPassingCYamlLoader, context),
+        )
+
+    @patch.dict("jconfigure.yaml_tags.os.environ", {"_TEST_INCLUDE_DIR": "includes"})
+    def test_include_files(self):
+        self.assert_loaders_agree("successful_include_files.yaml")
+        self.assert_loaders_agree("successful_multi_level_include_files.yaml")
+
+    def test_context(self):
+        self.assert_loaders_agree("context_successful.yaml", {"cat": "echo"})
+        self.assert_loaders_agree("context_include.yaml", {"cat": "echo"})
+
+    def test_string_format_and_chain(self):
+        self.assert_loaders_agree("successful_string_format_list_format_args.yaml")
+        self.assert_loaders_agree("successful_string_format_mapping_format_args.yaml")
+        self.assert_loaders_agree("chain.yaml")
+        self.assert_loaders_agree("test_offset_timestamp_successful.yaml")
+
+
+class TestAliases(unittest.TestCase):
+    def load(self, document):
+        return [
+            load_yaml_with_context(document, {"_parsing_filename": "test.yaml"}, loader_class)
+            for loader_class in CONTEXT_PASSING_YAML_LOADERS
+        ]
+
+    def test_tags_see_filled_in_aliases(self):
+        # Tags are evaluated as soon as they are constructed, while PyYAML fills in the mappings and sequences of the
+        # document one level at a time, so these aliases refer to ones which aren't filled in yet
+        document = "\n".join([
+            "pets: &pets {cats: &cats [jingles, echo], dogs: &dogs {oscar: {mood: sleepy}}}",
+            "json: !JsonString {object: *pets}",
+            "format: !StringFormat {string: \"{oscar[mood]}\", format_args: *dogs}",
+            "nested: {chain: !Chain [*cats, [felix]]}",
+        ])
+
+        for config in self.load(document):
+            self.assertEqual(json.loads(config["json"]), {"cats": ["jingles", "echo"], "dogs": {"oscar": {"mood": "sleepy"}}})
+            self.assertEqual(config["format"], "sleepy")
+            self.assertEqual(config["nested"]["chain"], ["jingles", "echo", "felix"])
+
+    def test_alias_of_anchor_containing_tag(self):
+        document = "\n".join([
+            "k: &k {v: {w: 1}}",
+            "a: {m: &m {t: !JsonString {object: *k}}}",
+            "b: !JsonString {object: *m}",
+        ])
+
+        for config in self.load(document):
+            self.assertEqual(json.loads(config["a"]["m"]["t"]), {"v": {"w": 1}})
+            self.assertEqual(json.loads(config["b"]), {"t": config["a"]["m"]["t"]})
+
+    def test_pyyaml_construction_unaffected(self):
+        # Recursive structures can only be constructed lazily, which jconfigure used to turn off for every loader
+        config = yaml.load("cats: &cats [jingles, *cats]", Loader=yaml.Loader)
+        self.assertIs(config["cats"][1], config["cats"])
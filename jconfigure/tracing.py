@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+import os
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+# kind is one of "phase", "file", "merge", "tag" or "include". num_bytes is the size of the files involved, when known
+TraceEvent = namedtuple("TraceEvent", ["kind", "name", "filename", "duration", "num_bytes"])
+
+
+def _get_file_size(filename):
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
+
+
+class TraceSpan:
+    def __init__(self, num_bytes=None):
+        self.num_bytes = num_bytes
+
+    def add_files(self, filenames):
+        self.num_bytes = (self.num_bytes or 0) + sum(_get_file_size(f) for f in filenames)
+
+
+class _NullTraceSpan:
+    def add_files(self, filenames):
+        pass
+
+
+_NULL_TRACE_SPAN = _NullTraceSpan()
+
+
+class ConfigurationTracer:
+    """
+    Receives a TraceEvent for every phase, file parse, merge and tag invocation while configure() is running. Pass an
+    instance as the tracer argument to configure(), tags find it under the "_tracer" context key. When no tracer is
+    passed none of the timing code runs. Subclasses override record
+    """
+    def record(self, event):
+        pass
+
+    @contextmanager
+    def span(self, kind, name, filename=None, num_bytes=None):
+        trace_span = TraceSpan(num_bytes)
+        start = time.perf_counter()
+
+        try:
+            yield trace_span
+        finally:
+            self.record(TraceEvent(
+                kind=kind,
+                name=name,
+                filename=filename,
+                duration=time.perf_counter() - start,
+                num_bytes=trace_span.num_bytes,
+            ))
+
+
+class RecordingTracer(ConfigurationTracer):
+    """
+    Collects every TraceEvent in a list, for inspection after configure() returns
+    """
+    def __init__(self):
+        self.events = []
+
+    def record(self, event):
+        self.events.append(event)
+
+    def get_events(self, kind):
+        return [e for e in self.events if e.kind == kind]
+
+    def get_total_duration(self, kind):
+        return sum(e.duration for e in self.get_events(kind))
+
+
+@contextmanager
+def trace(tracer, kind, name, filename=None):
+    """
+    Traces the wrapped block with tracer, or does nothing if tracer is None. Yields a span that the sizes of the files
+    processed in the block can be added to
+    """
+    if tracer is None:
+        yield _NULL_TRACE_SPAN
+    else:
+        with tracer.span(kind, name, filename) as trace_span:
+            yield trace_span
@@ -1,15 +1,13 @@
 #!/usr/bin/env python
 import os
-from .exceptions import FileParsingException, FilesNotFoundException
+from .exceptions import ConfigurationRootException, FileParsingException, FilesNotFoundException
+from .merge import merge_configurations
 from .parsers import FILE_EXTENSION_TO_PARSERS
 
 
-def merge_configuration_from_dict_root(base_config, overrides):
-    for k, v in overrides.items():
-        if type(v) is dict and type(base_config.get(k)) is dict:
-            merge_configuration_from_dict_root(base_config[k], v)
-        else:
-            base_config[k] = v
+def merge_configuration_from_dict_root(base_config, overrides, strategies=None, plain=False):
+    # The dicts and lists of overrides end up in base_config, so overrides must not be used after merging
+    merge_configurations(base_config, overrides, strategies=strategies, copy_overrides=False, plain=plain)
 
 
 def get_parser_for_file(filename):
@@ -17,13 +15,37 @@ def get_parser_for_file(filename):
     return FILE_EXTENSION_TO_PARSERS[extension]
 
 
-def parse_file(filename, context):
+def _check_file(filename, context):
+    manifest = context.get("_dependency_manifest")
+    if manifest is not None:
+        manifest.record_file(filename)
+
     if not os.path.isfile(filename):
         raise FilesNotFoundException(f"File {filename} doesn't exist!")
 
+
+def parse_file(filename, context):
+    _check_file(filename, context)
     parser = get_parser_for_file(filename)
 
     try:
         return parser.parse(filename, context)
     except Exception as e:
         raise FileParsingException(filename) from e
+
+
+def stream_merge_file(filename, streaming_merge, context):
+    """
+    Merges filename into the configuration of streaming_merge, as a file which comes before all of the files merged
+    into it so far
+    """
+    _check_file(filename, context)
+    parser = get_parser_for_file(filename)
+
+    try:
+        parser.stream_merge(filename, context, streaming_merge)
+    except ConfigurationRootException:
+        # Raised as is, as when merging the parsed file
+        raise
+    except Exception as e:
+        raise FileParsingException(filename) from e
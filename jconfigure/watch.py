@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Flags from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO |
+    _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+
+
+class PollingWatcher:
+    """
+    Fallback watcher for platforms without inotify, wait simply sleeps and always reports a possible change
+    """
+    def __init__(self, directories):
+        self.directories = directories
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+        return True
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Watches a set of directories with inotify. Directories are watched rather than files, so that files which are
+    replaced by renaming a new file over them, as editors and config management tools do, are still noticed
+    """
+    def __init__(self, directories):
+        self.directories = directories
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        for directory in directories:
+            if self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _IN_WATCH_MASK) < 0:
+                _LOGGER.debug("Failed to watch directory {} with inotify".format(directory))
+
+    def wait(self, timeout):
+        """
+        :return: True if anything changed in one of the watched directories within timeout seconds
+        """
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+
+        if not readable:
+            return False
+
+        # Drain the pending events, callers only need to know that something changed
+        try:
+            while os.read(self._fd, 64 * 1024):
+                pass
+        except BlockingIOError:
+            pass
+
+        return True
+
+    def close(self):
+        os.close(self._fd)
+
+
+def create_watcher(directories):
+    """
+    :return: An InotifyWatcher for the directories if inotify is available, otherwise a PollingWatcher
+    """
+    try:
+        return InotifyWatcher(directories)
+    except (OSError, AttributeError, TypeError):
+        _LOGGER.debug("inotify is not available, falling back to polling")
+        return PollingWatcher(directories)
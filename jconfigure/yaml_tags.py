@@ -3,36 +3,98 @@ import datetime
 import itertools
 import json
 import os
+import time
 import yaml
 
-from yaml import YAMLObject, Loader
-from yaml.constructor import BaseConstructor
+from yaml import Loader
 from yaml.nodes import ScalarNode, SequenceNode, MappingNode
 
+from .deferred import DeferredValue, contains_deferred_values
 from .exceptions import TagConstructionException, UnsupportedNodeTypeException
+from .loaders import ContextPassingLoader
+from .memory import measure_memory
+from .tag_registry import TagRegistry
+from .tracing import TraceEvent
 
+try:
+    from yaml import CLoader
+except ImportError:
+    CLoader = None
 
-# monkey patch construct_object to ensure alias expansion occurs before our custom yaml tags refer to any aliases
-def construct_object_deep(self, node, deep=True):
-    return construct_object_orig(self, node, deep)
 
+# The tags constructed by jconfigure's loaders. Every subclass of ArgListAcceptingYamlTag with a yaml_tag is registered
+# here, unless it is declared with a different registry
+TAG_REGISTRY = TagRegistry()
 
-construct_object_orig = BaseConstructor.construct_object
-BaseConstructor.construct_object = construct_object_deep
 
+@TAG_REGISTRY.bind
+class ContextPassingYamlLoader(ContextPassingLoader, Loader):
+    pass
 
-class ContextPassingYamlLoader(Loader):
-    def __init__(self, stream, context):
-        super().__init__(stream)
-        self.context = context
 
+if CLoader is not None:
+    @TAG_REGISTRY.bind
+    class ContextPassingCYamlLoader(ContextPassingLoader, CLoader):
+        """
+        Same as ContextPassingYamlLoader, but scans and parses using libyaml, which is several times faster than the
+        pure python implementation. Only available if PyYAML was built against libyaml
+        """
 
-class ArgListAcceptingYamlTag(YAMLObject):
+    CONTEXT_PASSING_YAML_LOADERS = [ContextPassingYamlLoader, ContextPassingCYamlLoader]
+else:
+    ContextPassingCYamlLoader = None
+    CONTEXT_PASSING_YAML_LOADERS = [ContextPassingYamlLoader]
+
+# The loader used for parsing config files and includes, the libyaml loader if it's available
+DEFAULT_CONTEXT_PASSING_YAML_LOADER = CONTEXT_PASSING_YAML_LOADERS[-1]
+
+
+# Context keys set by jconfigure itself, rather than passed in by the caller of configure
+INTERNAL_CONTEXT_KEYS = {
+    "_parsing_filename",
+    "_dependency_manifest",
+    "_tracer",
+    "_include_cache",
+    "_deferred_tags",
+    "_merge_strategies",
+    "_memory_report",
+    "_interner",
+    "_keep_deferred_values",
+    "_non_plain_tags",
+}
+
+
+def get_user_context(context):
+    return {k: v for k, v in context.items() if k not in INTERNAL_CONTEXT_KEYS}
+
+
+def load_yaml_with_context(stream, context, loader_class=None):
+    loader_class = loader_class or DEFAULT_CONTEXT_PASSING_YAML_LOADER
+    return yaml.load(stream, Loader=lambda s: loader_class(s, context))
+
+
+class ArgListAcceptingYamlTag:
+    yaml_tag = None
     supported_node_types = ScalarNode, SequenceNode, MappingNode
 
-    @classmethod
-    def __get_handler_for_node_type(cls, parsing_node_type):
-        handler_map = {
+    # Whether the tag could produce a dict. Deferred tags that can't, and tags in files merged by a StreamingMerge,
+    # are never evaluated if they are overridden
+    deferred_result_may_be_mapping = True
+
+    # Whether the tag only produces dicts, lists and plain values, apart from the values of tags nested in it. Tags that
+    # don't, or that are deferred, are recorded in the "_non_plain_tags" context key, and files are merged without
+    # checking for DeferredValues and Mappings other than dicts while none have been
+    result_is_plain = False
+
+    def __init_subclass__(cls, registry=TAG_REGISTRY, **kwargs):
+        """
+        Builds the table of handlers for the node types the tag supports once, rather than for every tag in a file, and
+        registers the tag in registry. Subclasses can be declared with registry=None to not register them anywhere, or
+        with a registry of their own, like class MyTag(ArgListAcceptingYamlTag, registry=my_registry)
+        """
+        super().__init_subclass__(**kwargs)
+
+        cls._node_type_handlers = {
             node_type: handler for node_type, handler in [
                 (ScalarNode, cls.map_scalar_node),
                 (SequenceNode, cls.map_sequence_node),
@@ -40,7 +102,8 @@ class ArgListAcceptingYamlTag(YAMLObject):
             ] if node_type in cls.supported_node_types
         }
 
-        return handler_map.get(parsing_node_type)
+        if registry is not None and cls.__dict__.get("yaml_tag") is not None:
+            registry.register(cls)
 
     @classmethod
     def __get_exception(cls, message, filename):
@@ -53,17 +116,28 @@ class ArgListAcceptingYamlTag(YAMLObject):
     @classmethod
     def map_scalar_node(cls, loader, node):
         loaded_node = loader.construct_scalar(node)
-        return cls.map_node_data(loader.context, loaded_node)
+        return cls.map_arguments(loader.context, [loaded_node], {})
 
     @classmethod
     def map_sequence_node(cls, loader, node):
         loaded_node = loader.construct_sequence(node, deep=True)
-        return cls.map_node_data(loader.context, *loaded_node)
+        return cls.map_arguments(loader.context, loaded_node, {})
 
     @classmethod
     def map_mapping_node(cls, loader, node):
         loaded_node = loader.construct_mapping(node, deep=True)
-        return cls.map_node_data(loader.context, **loaded_node)
+        return cls.map_arguments(loader.context, [], loaded_node)
+
+    @classmethod
+    def map_arguments(cls, context, args, kwargs):
+        deferred_tags = context.get("_deferred_tags")
+
+        if deferred_tags is not None and (
+            cls in deferred_tags or contains_deferred_values(args) or contains_deferred_values(kwargs)
+        ):
+            return DeferredValue(cls, context, args, kwargs)
+
+        return cls.map_node_data(context, *args, **kwargs)
 
     @classmethod
     def map_node_data(cls, context, *args, **kwargs):
@@ -78,16 +152,42 @@ class ArgListAcceptingYamlTag(YAMLObject):
 
     @classmethod
     def from_yaml(cls, loader, node):
-        handler = cls.__get_handler_for_node_type(type(node))
+        handler = cls._node_type_handlers.get(type(node))
 
         if handler is None:
             raise UnsupportedNodeTypeException(cls, type(node))
 
-        return handler(loader, node)
+        # The arguments are constructed deep, but aliases among them may refer to mappings and sequences which PyYAML
+        # has yet to fill in, which are finished first. Loaders bound with TagRegistry.bind may not track them
+        construct_pending = getattr(loader, "construct_pending", None)
+        if construct_pending is not None:
+            construct_pending(node)
+
+        tracer = loader.context.get("_tracer")
+        if tracer is None:
+            result = handler(loader, node)
+        else:
+            start = time.perf_counter()
+            result = handler(loader, node)
+            tracer.record(TraceEvent(
+                kind="tag",
+                name=cls.yaml_tag,
+                filename=loader.context.get("_parsing_filename"),
+                duration=time.perf_counter() - start,
+                num_bytes=None,
+            ))
+
+        non_plain_tags = loader.context.get("_non_plain_tags")
+        if non_plain_tags is not None and (not cls.result_is_plain or type(result) is DeferredValue):
+            non_plain_tags.add(cls.yaml_tag)
+
+        return result
 
 
 class JoinFilePaths(ArgListAcceptingYamlTag):
     yaml_tag = "!JoinFilePaths"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
     supported_node_types = SequenceNode, MappingNode
 
     @classmethod
@@ -109,6 +209,10 @@ class ContextValue(ArgListAcceptingYamlTag):
 
     @classmethod
     def map_node_data(cls, context, key, default=None):
+        manifest = context.get("_dependency_manifest")
+        if manifest is not None:
+            manifest.record_context_key(key, context)
+
         if key not in context and default is None:
             cls.handle_tag_construction_error(
                 message="Context Key '{}' not set, and no default provided!".format(key),
@@ -120,10 +224,15 @@ class ContextValue(ArgListAcceptingYamlTag):
 
 class EnvVar(ArgListAcceptingYamlTag):
     yaml_tag = "!EnvVar"
+    result_is_plain = True
     supported_node_types = ScalarNode, MappingNode
 
     @classmethod
     def map_node_data(cls, context, name, default=None):
+        manifest = context.get("_dependency_manifest")
+        if manifest is not None:
+            manifest.record_env_var(name)
+
         if name not in os.environ and default is None:
             cls.handle_tag_construction_error(
                 message="Environment Variable '{}' not set, and no default provided!".format(name),
@@ -135,6 +244,8 @@ class EnvVar(ArgListAcceptingYamlTag):
 
 class StringFormat(ArgListAcceptingYamlTag):
     yaml_tag = "!StringFormat"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
     supported_node_types = SequenceNode, MappingNode
 
     @classmethod
@@ -171,6 +282,8 @@ class StringFormat(ArgListAcceptingYamlTag):
 
 class Chain(ArgListAcceptingYamlTag):
     yaml_tag = "!Chain"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
     supported_node_types = SequenceNode, MappingNode
 
     @classmethod
@@ -189,18 +302,45 @@ class Chain(ArgListAcceptingYamlTag):
 class RelativeFileIncludingYamlTag(ArgListAcceptingYamlTag):
     supported_node_types = ScalarNode, MappingNode
 
+    # Whether the result of including a file depends on the context, rather than just on the file contents
+    include_depends_on_context = False
+
     @classmethod
     def handle_included_file(cls, context, file_handle):
         raise NotImplementedError()
 
+    @classmethod
+    def read_included_file(cls, context, full_file_path):
+        memory_report = context.get("_memory_report")
+
+        with open(full_file_path) as file_handle, \
+                measure_memory(memory_report, "include", os.path.abspath(full_file_path)):
+            tracer = context.get("_tracer")
+            if tracer is None:
+                value = cls.handle_included_file(context, file_handle)
+            else:
+                with tracer.span("include", cls.yaml_tag, full_file_path, os.fstat(file_handle.fileno()).st_size):
+                    value = cls.handle_included_file(context, file_handle)
+
+        interner = context.get("_interner")
+        return interner.intern(value) if interner is not None else value
+
     @classmethod
     def map_node_data(cls, context, filename):
         current_file_directory = os.path.dirname(context["_parsing_filename"])
         full_file_path = os.path.join(current_file_directory, filename)
 
+        manifest = context.get("_dependency_manifest")
+        if manifest is not None:
+            manifest.record_file(full_file_path)
+
+        include_cache = context.get("_include_cache")
+
         try:
-            with open(full_file_path) as file_handle:
-                return cls.handle_included_file(context, file_handle)
+            if include_cache is None:
+                return cls.read_included_file(context, full_file_path)
+
+            return include_cache.get(cls, full_file_path, context)
 
         except IOError as e:
             cls.handle_tag_construction_error(
@@ -212,6 +352,8 @@ class RelativeFileIncludingYamlTag(ArgListAcceptingYamlTag):
 
 class JsonString(ArgListAcceptingYamlTag):
     yaml_tag = "!JsonString"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
     supported_node_types = MappingNode,
 
     @classmethod
@@ -221,6 +363,8 @@ class JsonString(ArgListAcceptingYamlTag):
 
 class YamlString(ArgListAcceptingYamlTag):
     yaml_tag = "!YamlString"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
     supported_node_types = MappingNode,
 
     @classmethod
@@ -230,6 +374,7 @@ class YamlString(ArgListAcceptingYamlTag):
 
 class IncludeJson(RelativeFileIncludingYamlTag):
     yaml_tag = "!IncludeJson"
+    result_is_plain = True
 
     @classmethod
     def handle_included_file(cls, context, file_handle):
@@ -246,13 +391,13 @@ class IncludeJson(RelativeFileIncludingYamlTag):
 
 class IncludeYaml(RelativeFileIncludingYamlTag):
     yaml_tag = "!IncludeYaml"
+    include_depends_on_context = True
 
     @classmethod
     def handle_included_file(cls, context, file_handle):
         try:
             full_context = {**context, "_parsing_filename": file_handle.name}
-            context_passing_loader = lambda stream: ContextPassingYamlLoader(stream, full_context)
-            return yaml.load(file_handle, Loader=context_passing_loader)
+            return load_yaml_with_context(file_handle, full_context)
         except ValueError as e:
             cls.handle_tag_construction_error(
                 message="Failed to parse relative yaml file {}!".format(file_handle.name),
@@ -263,6 +408,8 @@ class IncludeYaml(RelativeFileIncludingYamlTag):
 
 class IncludeText(RelativeFileIncludingYamlTag):
     yaml_tag = "!IncludeText"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
 
     @classmethod
     def handle_included_file(cls, context, file_handle):
@@ -271,6 +418,8 @@ class IncludeText(RelativeFileIncludingYamlTag):
 
 class Timestamp(ArgListAcceptingYamlTag):
     yaml_tag = "!Timestamp"
+    result_is_plain = True
+    deferred_result_may_be_mapping = False
     supported_node_types = SequenceNode, MappingNode
 
     @classmethod
@@ -293,8 +442,16 @@ class Timestamp(ArgListAcceptingYamlTag):
                 filename=context["_parsing_filename"],
             )
 
+        manifest = context.get("_dependency_manifest")
+        if time is None and manifest is not None:
+            manifest.record_time_dependency()
+
         time = time or datetime.datetime.utcnow()
         time_delta = datetime.timedelta(**delta) if delta is not None else datetime.timedelta()
         replace_args = {"microsecond": 0} if type(time) is datetime.datetime else {}
         time_with_delta = (time + time_delta).replace(**replace_args)
         return time_with_delta.strftime(format) if format is not None else time_with_delta.isoformat()
+
+
+# The tags deferred when configure is called with lazy_tags set, these are the tags that read files or the clock
+LAZY_TAGS = frozenset([IncludeYaml, IncludeJson, IncludeText, Timestamp])
@@ -1,7 +1,8 @@
 #!/usr/bin/env python
 import json
-from jconfigure import configure
+from jconfigure import query_configuration
 
 
 if __name__ == "__main__":
-    print(json.dumps(configure(), indent=2))
+    # Asks the configuration daemon at $JCONFIGURE_DAEMON_SOCKET if one is running, otherwise runs configure
+    print(json.dumps(query_configuration(), indent=2))